@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""D&C Builders — Parquet export for analytics
+
+Writes the proposal history as two Parquet tables that pandas, DuckDB,
+Polars or a spreadsheet's Parquet import can scan in seconds, instead of
+ad-hoc SQL against the production database or reading JSON files one at a
+time:
+
+  proposals.parquet   one row per intake (or client JSON config): client,
+                      city, status, project type, template, size, total,
+                      scope and milestone counts, one material_<kind>
+                      column per price-book kind, one construction_<toggle>
+                      and design_<toggle> boolean column per form toggle,
+                      and render metrics (render_ms, page_count, attempts,
+                      rendered_at, generated_at, sent_at)
+  payments.parquet    one row per milestone: proposal_id, seq, description,
+                      amount, its share of the total and the running share
+
+What a proposal actually said (scope, materials, toggles, payments) comes
+from its stored rendered_config when it has one, else from the form
+columns. A toggle missing from a config is exported as on, which is how the
+templates treat it.
+
+Rows are streamed: intakes come through a server-side cursor CHUNK rows at
+a time and each chunk is written as one Parquet row group, so memory stays
+flat however many years of history are exported. Files are written under a
+temp name and renamed when complete.
+
+    pip3 install pyarrow "psycopg[binary]"
+
+Run:
+    python3 analytics_export.py                              # client_intakes → exports/
+    python3 analytics_export.py --since 2026-01-01 --out /tmp/q1
+    python3 analytics_export.py --files clients/             # JSON configs + batch ledger metrics
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from material_book import load_materials
+from proposal_sections import CACHE_DIR
+
+BASE    = os.path.dirname(os.path.abspath(__file__))
+OUT_DIR = os.path.join(BASE, "exports")
+LEDGER  = os.path.join(CACHE_DIR, "render_ledger.sqlite")
+CHUNK   = 5_000     # rows per fetch and per Parquet row group
+
+# The intake form's toggles (supabase_schema.sql); others are not exported
+CONSTRUCTION_TOGGLES = (
+    "site_prep", "foundation", "framing", "elec_rough", "elec_finish", "plumb_rough",
+    "plumb_finish", "roofing", "insulation", "drywall", "exterior", "siding", "windows",
+    "flooring", "interior_doors", "cabinetry", "bathroom", "hvac", "plans", "wall_removal",
+)
+DESIGN_TOGGLES = ("design", "architectural", "engineering", "mood_boards", "space_planning")
+
+_INTAKES = """
+SELECT id, created_at, first_name || ' & ' || last_name AS client_name, city, zip, status,
+       project_type, stories, area_sf, bedroom_count, bathroom_count, hvac_type,
+       project_total, scope_items, payments, design_toggles, construction_toggles, materials,
+       rendered_config, template, config_hash, rendered_at, generated_at, sent_at,
+       render_ms, page_count, attempts
+FROM client_intakes
+WHERE created_at >= %s
+ORDER BY created_at, id
+"""
+
+
+# ── Tables ──────────────────────────────────────────────────────────────────
+def proposal_schema():
+    import pyarrow as pa
+
+    ts = pa.timestamp("us", tz="UTC")
+    fields = [
+        ("id", pa.string()), ("source", pa.string()), ("created_at", ts),
+        ("client_name", pa.string()), ("city", pa.string()), ("zip", pa.string()),
+        ("status", pa.string()), ("project_type", pa.string()),
+        ("project_types", pa.list_(pa.string())), ("template", pa.string()),
+        ("stories", pa.string()), ("hvac_type", pa.string()), ("area_sf", pa.float64()),
+        ("bedroom_count", pa.float64()), ("bathroom_count", pa.float64()),
+        ("project_total", pa.string()), ("total", pa.float64()),
+        ("scope_item_count", pa.int32()), ("milestone_count", pa.int32()),
+        *((f"material_{kind}", pa.string()) for kind in load_materials().kinds),
+        *((f"construction_{t}", pa.bool_()) for t in CONSTRUCTION_TOGGLES),
+        *((f"design_{t}", pa.bool_()) for t in DESIGN_TOGGLES),
+        ("config_hash", pa.string()), ("render_ms", pa.int32()), ("page_count", pa.int32()),
+        ("attempts", pa.int32()), ("rendered_at", ts), ("generated_at", ts), ("sent_at", ts),
+    ]
+    return pa.schema(fields)
+
+
+def payment_schema():
+    import pyarrow as pa
+
+    return pa.schema([("proposal_id", pa.string()), ("seq", pa.int16()),
+                      ("description", pa.string()), ("amount", pa.float64()),
+                      ("share", pa.float64()), ("cumulative_share", pa.float64())])
+
+
+class TableWriter:
+    """Buffers rows column-wise and writes one row group per CHUNK rows."""
+
+    def __init__(self, path: str, schema, chunk: int = CHUNK):
+        import pyarrow.parquet as pq
+
+        self.path, self.schema, self.chunk = path, schema, chunk
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.writer = pq.ParquetWriter(self.tmp, schema, compression="zstd")
+        self.columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        self.rows = 0
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        self.rows += 1
+        if self.rows % self.chunk == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        import pyarrow as pa
+
+        if any(self.columns.values()):
+            self.writer.write_batch(pa.RecordBatch.from_pydict(self.columns, schema=self.schema))
+            self.columns = {name: [] for name in self.schema.names}
+
+    def close(self, keep: bool = True) -> None:
+        """Finish the file and move it into place (or discard it)."""
+        try:
+            if keep:
+                self.flush()
+            self.writer.close()
+            if keep:
+                os.replace(self.tmp, self.path)
+        finally:
+            if os.path.exists(self.tmp):
+                os.remove(self.tmp)
+
+
+# ── Rows ────────────────────────────────────────────────────────────────────
+def _number(value: Any) -> Optional[float]:
+    try:
+        text = str(value).replace("$", "").replace(",", "").strip()
+        return float(text) if text else None
+    except ValueError:
+        return None
+
+
+def _int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _utc(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def rows_for(key: str, source: str, record: Mapping[str, Any],
+             config: Mapping[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """(proposals row, payments rows) for one intake or config.
+
+    `record` holds the form and metric fields, `config` what the proposal said.
+    """
+    payments = [(str(desc), _number(amount) or 0.0) for desc, amount in config.get("payments") or []]
+    total = _number(config.get("project_total") or record.get("project_total"))
+    if total is None and payments:
+        total = sum(amount for _, amount in payments)
+
+    book = load_materials()
+    materials = book.canonical(config.get("materials") or {})
+    construction = config.get("construction_toggles") or {}
+    design = config.get("design_toggles") or {}
+    row = {
+        "id": key, "source": source, "created_at": _utc(record.get("created_at")),
+        "client_name": config.get("client_name") or record.get("client_name"),
+        "city": record.get("city"), "zip": record.get("zip"), "status": record.get("status"),
+        "project_type": record.get("project_type"),
+        "project_types": list(config.get("project_types") or []),
+        "template": record.get("template") or config.get("template"),
+        "stories": record.get("stories"), "hvac_type": record.get("hvac_type"),
+        "area_sf": _number(config.get("area_sf") or record.get("area_sf")),
+        "bedroom_count": _number(record.get("bedroom_count")),
+        "bathroom_count": _number(record.get("bathroom_count")),
+        "project_total": config.get("project_total") or record.get("project_total"),
+        "total": total,
+        "scope_item_count": len(config.get("scope_items") or []),
+        "milestone_count": len(payments),
+        **{f"material_{kind}": materials.get(kind) or None for kind in book.kinds},
+        **{f"construction_{t}": bool(construction.get(t, True)) for t in CONSTRUCTION_TOGGLES},
+        **{f"design_{t}": bool(design.get(t, True)) for t in DESIGN_TOGGLES},
+        "config_hash": record.get("config_hash"), "render_ms": _int(record.get("render_ms")),
+        "page_count": _int(record.get("page_count")), "attempts": _int(record.get("attempts")),
+        "rendered_at": _utc(record.get("rendered_at")),
+        "generated_at": _utc(record.get("generated_at")), "sent_at": _utc(record.get("sent_at")),
+    }
+    children, running = [], 0.0
+    for seq, (desc, amount) in enumerate(payments, 1):
+        running += amount
+        children.append({"proposal_id": key, "seq": seq, "description": desc, "amount": amount,
+                         "share": amount / total if total else None,
+                         "cumulative_share": running / total if total else None})
+    return row, children
+
+
+def intake_rows(since: str = "1970-01-01", chunk: int = CHUNK) -> Iterator[Tuple[Dict, List[Dict]]]:
+    """Every intake created on or after `since`, through a server-side cursor."""
+    from intake_db import connect
+
+    with connect() as conn, conn.cursor(name="analytics_export") as cur:
+        cur.itersize = chunk
+        cur.execute(_INTAKES, (since,))
+        for record in cur:
+            yield rows_for(str(record["id"]), "intake", record, record["rendered_config"] or record)
+
+
+def config_rows(paths: Sequence[str], ledger: str = LEDGER) -> Iterator[Tuple[Dict, List[Dict]]]:
+    """Client JSON configs, with render metrics from batch_render's ledger."""
+    from proposal_render import pick_template
+
+    conn = None
+    if os.path.exists(ledger):
+        conn = sqlite3.connect(ledger, timeout=30)
+        conn.row_factory = sqlite3.Row
+    try:
+        for path in paths:
+            files = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+            for file in files:
+                file = os.path.abspath(file)
+                with open(file) as f:
+                    config = json.load(f)
+                if not isinstance(config, dict) or "client_name" not in config:
+                    continue  # not a client config
+                job = conn and conn.execute("SELECT * FROM jobs WHERE input_path = ?",
+                                            (file,)).fetchone()
+                done = job and job["status"] == "done"
+                record = {"created_at": os.path.getmtime(file),
+                          "template": pick_template(config),
+                          "status": ("generated" if done else job["status"]) if job else "pending",
+                          "render_ms": job and job["render_ms"], "page_count": job and job["page_count"],
+                          "attempts": job and job["attempts"],
+                          "rendered_at": job["finished_at"] if done else None}
+                yield rows_for(os.path.relpath(file, BASE), "config", record, config)
+    finally:
+        if conn:
+            conn.close()
+
+
+def export(rows: Iterator[Tuple[Dict, List[Dict]]], out_dir: str = OUT_DIR,
+           chunk: int = CHUNK) -> Tuple[int, int]:
+    """Stream rows into out_dir/proposals.parquet and payments.parquet.
+
+    Returns (proposals, payments) written. On error neither file is replaced.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    proposals = TableWriter(os.path.join(out_dir, "proposals.parquet"), proposal_schema(), chunk)
+    payments = TableWriter(os.path.join(out_dir, "payments.parquet"), payment_schema(), chunk)
+    ok = False
+    try:
+        for row, children in rows:
+            proposals.add(row)
+            for child in children:
+                payments.add(child)
+        ok = True
+    finally:
+        proposals.close(keep=ok)
+        payments.close(keep=ok)
+    return proposals.rows, payments.rows
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export intakes and proposals to Parquet.")
+    p.add_argument("--out", metavar="DIR", default=OUT_DIR, help="Output folder (default: exports/)")
+    p.add_argument("--since", metavar="YYYY-MM-DD", default="1970-01-01",
+                   help="Only intakes created on or after this date")
+    p.add_argument("--files", nargs="+", metavar="PATH",
+                   help="Export these client JSON files or folders instead of Supabase")
+    p.add_argument("--ledger", default=LEDGER, help="With --files: batch_render ledger for metrics")
+    p.add_argument("--chunk", type=int, default=CHUNK, help=f"Rows per row group (default {CHUNK})")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        sys.exit("pyarrow not installed. Run: pip3 install pyarrow")
+
+    started = time.perf_counter()
+    rows = (config_rows(args.files, args.ledger) if args.files
+            else intake_rows(args.since, args.chunk))
+    proposals, payments = export(rows, args.out, args.chunk)
+    print(f"{proposals} proposal(s), {payments} payment(s) → {args.out} "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""D&C Builders — batch re-render with a resumable ledger
+
+Renders a directory of client JSON configs (clients/ by default) and
+records every job in a SQLite ledger (.cache/render_ledger.sqlite): its
+input hash, template, output path, status, attempts and timings. Each row
+is committed as the job starts and again as it ends, so a batch killed
+halfway leaves an exact record of what finished.
+
+With --resume, a job is skipped when the ledger says it finished, its
+input hash still matches (the JSON file and the template version) and its
+PDF is still there. Failed jobs, jobs left 'running' by a crash and new or
+edited configs are rendered again. PDFs are written to a temp file and
+renamed into place (proposal_render.write_atomic), so a crash never leaves
+a truncated PDF that looks complete.
+
+Renders run in worker processes (render_worker.py) that are replaced after
+--max-jobs-per-worker renders or once their RSS passes --max-rss, so an
+overnight run of thousands stays flat on memory. --job-memory fails one
+runaway render (recorded in the ledger) instead of the whole box; a worker
+killed outright is recorded against the config it was rendering.
+
+Run:
+    python3 batch_render.py                           # every clients/*.json
+    python3 batch_render.py --resume                  # pick up where the last run stopped
+    python3 batch_render.py clients/ more/ --output-dir out/ --workers 4
+    python3 batch_render.py --max-rss 800M --job-memory 1.5G --tracemalloc   # then: kill -USR1 <pid>
+    python3 batch_render.py --report                  # ledger summary and failures
+
+Exits with status 1 when any job fails.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+from proposal_render import load_template, pick_template, render_config, template_version
+from proposal_sections import CACHE_DIR
+from render_worker import Limits, Reporter, add_limit_args, limits_from, memory_ceiling, supervise
+
+BASE   = os.path.dirname(os.path.abspath(__file__))
+LEDGER = os.path.join(CACHE_DIR, "render_ledger.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  input_path   TEXT    PRIMARY KEY,
+  input_hash   TEXT    NOT NULL,   -- JSON file bytes + template version
+  template     TEXT,
+  output_path  TEXT,
+  status       TEXT    NOT NULL CHECK (status IN ('running', 'done', 'failed')),
+  attempts     INTEGER NOT NULL DEFAULT 0,
+  started_at   REAL    NOT NULL,   -- epoch seconds
+  finished_at  REAL,
+  render_ms    INTEGER,
+  page_count   INTEGER,
+  error        TEXT
+)
+"""
+
+_START = """
+INSERT INTO jobs (input_path, input_hash, template, output_path, status, attempts, started_at)
+VALUES (:path, :hash, :template, :output, 'running', 1, :now)
+ON CONFLICT (input_path) DO UPDATE
+SET input_hash = excluded.input_hash, template = excluded.template,
+    output_path = excluded.output_path, status = 'running', attempts = attempts + 1,
+    started_at = excluded.started_at, finished_at = NULL, render_ms = NULL,
+    page_count = NULL, error = NULL
+"""
+
+_FINISH = """
+UPDATE jobs
+SET status = :status, finished_at = :now, render_ms = :ms, page_count = :pages, error = :error
+WHERE input_path = :path
+"""
+
+
+# ── Ledger ──────────────────────────────────────────────────────────────────
+def open_ledger(path: str = LEDGER) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)  # workers share it
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _finish(conn: sqlite3.Connection, path: str, status: str, ms: Optional[int] = None,
+            pages: Optional[int] = None, error: Optional[str] = None) -> None:
+    with conn:
+        conn.execute(_FINISH, {"path": path, "status": status, "now": time.time(),
+                               "ms": ms, "pages": pages, "error": error})
+
+
+def is_done(row: Optional[sqlite3.Row], input_hash: str, output: str) -> bool:
+    """Finished with the same input into the same, still-present output."""
+    return (row is not None and row["status"] == "done" and row["input_hash"] == input_hash
+            and row["output_path"] == output
+            and os.path.exists(output) and os.path.getsize(output) > 0)
+
+
+# ── Jobs ────────────────────────────────────────────────────────────────────
+def collect(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    return [os.path.abspath(f) for f in files]
+
+
+def run_one(conn: sqlite3.Connection, path: str, output_dir: Optional[str] = None,
+            resume: bool = False, parallel: bool = False,
+            job_memory: Optional[int] = None) -> Tuple[str, Optional[Exception]]:
+    """Render one config under the ledger.
+
+    Returns ('done' | 'skipped' | 'failed', the error if any).
+    """
+    row = conn.execute("SELECT * FROM jobs WHERE input_path = ?", (path,)).fetchone()
+    h = hashlib.sha256()
+    template = output = None
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        h.update(raw)
+        template = pick_template(json.loads(raw))
+        h.update(template_version(template).encode())
+        cfg = load_template(template).ProposalConfig.from_json(path)
+        output = cfg.resolve_output()
+        if output_dir:
+            output = os.path.join(output_dir, os.path.basename(output))
+        output = os.path.abspath(output)
+    except Exception as exc:
+        plan_error: Optional[Exception] = exc
+    else:
+        plan_error = None
+        if resume and is_done(row, h.hexdigest(), output):
+            return "skipped", None
+
+    with conn:
+        conn.execute(_START, {"path": path, "hash": h.hexdigest(), "template": template,
+                              "output": output, "now": time.time()})
+    if plan_error is not None:
+        _finish(conn, path, "failed", error=f"{type(plan_error).__name__}: {plan_error}")
+        return "failed", plan_error
+
+    started = time.perf_counter()
+    try:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with memory_ceiling(job_memory):
+            pages = render_config(cfg, template, output, parallel)
+    except Exception as exc:
+        _finish(conn, path, "failed", error=f"{type(exc).__name__}: {exc}")
+        return "failed", exc
+    _finish(conn, path, "done", round((time.perf_counter() - started) * 1000), pages)
+    return "done", None
+
+
+def work(reporter: Reporter, tasks, output_dir: Optional[str], resume: bool,
+         parallel: bool, ledger: str, limits: Limits) -> bool:
+    """One worker process (render_worker.supervise): take paths off `tasks`
+    until it hands out None. Returns True when it retired on a limit."""
+    conn = open_ledger(ledger)
+    jobs = 0
+    try:
+        while True:
+            path = tasks.get()
+            if path is None:
+                return False
+            reporter.started(path)
+            outcome, error = run_one(conn, path, output_dir, resume, parallel, limits.job_memory)
+            reporter.finished(outcome)
+            if outcome == "skipped":
+                continue
+            print(f"  {outcome:<6} {os.path.relpath(path, BASE)}"
+                  + (f" — {type(error).__name__}: {error}" if error else ""))
+            jobs += 1
+            reason = limits.retire(jobs, error)
+            if reason:
+                print(f"  worker {os.getpid()} retiring after {reason}")
+                return True
+    finally:
+        conn.close()
+
+
+def run(files: List[str], output_dir: Optional[str] = None, resume: bool = False,
+        parallel: bool = False, ledger: str = LEDGER, workers: int = 1,
+        limits: Limits = Limits()) -> Dict[str, int]:
+    """Render `files` with `workers` worker processes (replaced as they hit
+    `limits`). Returns counts: done, skipped, failed, lost, recycled."""
+    open_ledger(ledger).close()  # create it before the workers race to
+    tasks = get_context().Queue()
+    for path in files:
+        tasks.put(path)
+    for _ in range(workers):
+        tasks.put(None)  # one stop marker per worker that runs out of work
+
+    def lost(path: str, reason: str) -> None:
+        conn = open_ledger(ledger)
+        try:
+            _finish(conn, path, "failed", error=reason)
+        finally:
+            conn.close()
+
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+    counts.update(supervise(work, lambda _slot, _done: (tasks, output_dir, resume, parallel,
+                                                          ledger, limits),
+                            workers, limits, lost))
+    return counts
+
+
+def print_report(ledger: str = LEDGER) -> None:
+    conn = open_ledger(ledger)
+    try:
+        for row in conn.execute("SELECT status, count(*) AS n, sum(render_ms) AS ms "
+                                "FROM jobs GROUP BY status ORDER BY status"):
+            print(f"{row['status']:<8} {row['n']:>5} job(s)  {(row['ms'] or 0) / 1000:>8.1f}s rendering")
+        for row in conn.execute("SELECT input_path, attempts, error FROM jobs "
+                                "WHERE status != 'done' ORDER BY input_path"):
+            error = (row["error"] or "unfinished (interrupted)").splitlines()[0]
+            print(f"  {os.path.relpath(row['input_path'], BASE)}  "
+                  f"{row['attempts']} attempt(s)  {error[:80]}")
+    finally:
+        conn.close()
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Re-render client JSON configs in bulk, resumably.")
+    p.add_argument("paths", nargs="*", help="JSON files or directories (default: clients/)")
+    p.add_argument("--resume", action="store_true",
+                   help="Skip jobs the ledger shows finished with unchanged input")
+    p.add_argument("--output-dir", metavar="DIR",
+                   help="Write every PDF here (default: each config's output_path)")
+    p.add_argument("--parallel", action="store_true", help="Lay out sections in parallel")
+    p.add_argument("--workers", type=int, default=1, help="Render processes (default 1)")
+    p.add_argument("--ledger", metavar="FILE", default=LEDGER,
+                   help="SQLite ledger (default: .cache/render_ledger.sqlite)")
+    p.add_argument("--report", action="store_true", help="Summarize the ledger and exit")
+    add_limit_args(p)
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.report:
+        print_report(args.ledger)
+        return
+
+    files = collect(args.paths or [os.path.join(BASE, "clients")])
+    started = time.perf_counter()
+    counts = run(files, args.output_dir, args.resume, args.parallel, args.ledger,
+                 args.workers, limits_from(args))
+    print(f"{len(files)} job(s) in {time.perf_counter() - started:.1f}s — "
+          f"{counts['done']} rendered, {counts['skipped']} skipped, {counts['failed']} failed, "
+          f"{counts['lost']} lost to dead workers; {counts['recycled']} worker(s) recycled")
+    sys.exit(1 if counts["failed"] or counts["lost"] else 0)
+
+
+if __name__ == "__main__":
+    main()
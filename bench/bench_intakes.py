@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark — client_intakes queue polls and listings at scale
+
+Seeds a local Postgres with synthetic intakes (1M by default), then times
+the queries the render worker and dashboards run — before and after
+migrations/002_intake_indexes.sql — including a deep page fetched with
+OFFSET versus a keyset cursor (intake_db.list_intakes).
+
+DROPS AND RECREATES client_intakes: point it at a scratch database only.
+
+    createdb dcb_bench
+    export BENCH_DB_URL=postgresql://localhost/dcb_bench
+    python3 bench/bench_intakes.py                   # seed 1M rows once, then measure
+    python3 bench/bench_intakes.py --reseed --rows 200000 --runs 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from intake_db import _LIST_COLUMNS, connect, encode_cursor, list_intakes, pending_intakes  # noqa: E402
+
+DEEP_OFFSET = 500_000  # rows skipped for the "deep page" cases
+
+SEED_SQL = """
+INSERT INTO client_intakes (created_at, first_name, last_name, street_address, city, zip,
+                            project_total, project_type, status)
+SELECT now() - random() * interval '1095 days',
+       'Client' || g, 'Bench', g || ' Seabreeze Lane', 'Huntington Beach', '92648',
+       '$' || to_char(50000 + (random() * 600000)::int, 'FM999,999'),
+       (ARRAY['Remodel', 'ADU', '2nd Story Addition', 'New Build'])[1 + (random() * 3)::int],
+       CASE WHEN g %% 100 = 0 THEN 'pending' WHEN g %% 3 = 0 THEN 'generated' ELSE 'sent' END
+FROM generate_series(1, %s) AS g
+"""
+
+
+def _sql(*parts: str) -> str:
+    with open(os.path.join(ROOT, *parts)) as f:
+        return f.read()
+
+
+def setup(conn, rows: int, reseed: bool) -> None:
+    """Schema + migrations 001, and `rows` synthetic intakes (kept between runs)."""
+    exists = conn.execute("SELECT to_regclass('client_intakes') IS NOT NULL AS ok").fetchone()["ok"]
+    if exists and not reseed:
+        have = conn.execute("SELECT count(*) AS n FROM client_intakes").fetchone()["n"]
+        if have == rows:
+            print(f"Reusing {have:,} seeded intakes")
+            return
+
+    print(f"Seeding {rows:,} intakes...")
+    started = time.perf_counter()
+    with conn.transaction():
+        conn.execute("DROP VIEW IF EXISTS latest_intakes")
+        conn.execute("DROP TABLE IF EXISTS client_intakes CASCADE")
+        # Table and view only — the RLS policies need Supabase's roles
+        schema = _sql("supabase_schema.sql")
+        conn.execute(schema.split("ALTER TABLE client_intakes ENABLE ROW LEVEL SECURITY")[0])
+        conn.execute(_sql("migrations", "001_rendered_config.sql"))
+        conn.execute("SELECT setseed(0.42)")
+        conn.execute(SEED_SQL, (rows,))
+    conn.execute("ANALYZE client_intakes")
+    print(f"  seeded in {time.perf_counter() - started:.1f}s")
+
+
+def time_ms(fn: Callable[[], object], runs: int) -> Dict[str, float]:
+    fn()  # warm the cache
+    samples: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[int(0.95 * (len(samples) - 1))]}
+
+
+def measure(conn, runs: int) -> Dict[str, Dict[str, float]]:
+    offset_sql = _LIST_COLUMNS + "ORDER BY created_at DESC, id DESC\nOFFSET %s LIMIT 25"
+    anchor = conn.execute(offset_sql.replace("LIMIT 25", "LIMIT 1"), (DEEP_OFFSET - 1,)).fetchone()
+    cursor = encode_cursor(anchor)
+
+    cases = {
+        "queue poll (10 oldest pending)": lambda: pending_intakes(conn, 10),
+        "listing, first page":            lambda: list_intakes(conn, 25),
+        "listing, first page (sent)":     lambda: list_intakes(conn, 25, status="sent"),
+        f"page at row {DEEP_OFFSET:,} — OFFSET": lambda: conn.execute(offset_sql, (DEEP_OFFSET,)).fetchall(),
+        f"page at row {DEEP_OFFSET:,} — keyset": lambda: list_intakes(conn, 25, cursor),
+    }
+    return {name: time_ms(fn, runs) for name, fn in cases.items()}
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark client_intakes queries on a scratch Postgres.")
+    p.add_argument("--rows",   type=int, default=1_000_000, help="Synthetic intakes (default 1M)")
+    p.add_argument("--runs",   type=int, default=20, help="Timed runs per query (default 20)")
+    p.add_argument("--reseed", action="store_true", help="Drop and reseed even if the row count matches")
+    p.add_argument("--db",     metavar="URL", default=os.environ.get("BENCH_DB_URL"),
+                   help="Scratch database URL (default: $BENCH_DB_URL)")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.db:
+        sys.exit("Set BENCH_DB_URL (or --db) to a scratch Postgres database")
+
+    with connect(args.db) as conn:
+        conn.autocommit = True
+        setup(conn, args.rows, args.reseed)
+
+        conn.execute("DROP INDEX IF EXISTS client_intakes_pending_idx")
+        conn.execute("DROP INDEX IF EXISTS client_intakes_created_idx")
+        before = measure(conn, args.runs)
+
+        conn.execute(_sql("migrations", "002_intake_indexes.sql"))
+        conn.execute("ANALYZE client_intakes")
+        after = measure(conn, args.runs)
+
+    width = max(map(len, before))
+    print(f"\n{'query':<{width}}  {'no indexes p50/p95':>20}  {'migration 002 p50/p95':>23}")
+    for name in before:
+        b, a = before[name], after[name]
+        print(f"{name:<{width}}  {b['p50']:>9.2f} /{b['p95']:>7.2f} ms  {a['p50']:>11.2f} /{a['p95']:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
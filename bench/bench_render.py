@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark — serial versus parallel layout of one proposal
+
+Renders the same config repeatedly in each mode and reports the first
+(cold) render — imports, font fetching and, in parallel mode, starting the
+layout pool — separately from the warm renders that follow, which is what
+a long-lived process sees. Use it to decide whether --parallel pays off on
+a given machine and proposal size.
+
+    pip3 install weasyprint pypdf
+    python3 bench/bench_render.py clients/test_martinez_full_scope.json
+    python3 bench/bench_render.py clients/example_restrepo.json --runs 10 --workers 4
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from proposal_render import load_template, parallel_pdf_bytes, pdf_bytes, pick_template  # noqa: E402
+
+
+def timed(render: Callable[[], object], runs: int) -> Dict[str, float]:
+    """Cold (first) render and p50 / p95 of the next `runs`, in ms."""
+    times: List[float] = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        render()
+        times.append((time.perf_counter() - started) * 1000)
+    warm = sorted(times[1:])
+    return {"cold": times[0], "p50": statistics.median(warm),
+            "p95": warm[min(len(warm) - 1, round(0.95 * (len(warm) - 1)))]}
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Time serial vs parallel layout of one proposal.")
+    p.add_argument("config", help="Client JSON file")
+    p.add_argument("--runs", type=int, default=5, help="Warm renders per mode (default: 5)")
+    p.add_argument("--workers", type=int, default=None, help="Layout pool size (default: CPUs)")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with open(args.config) as f:
+        template = pick_template(json.load(f))
+    module = load_template(template)
+    cfg = module.ProposalConfig.from_json(args.config)
+
+    head, parts = module.build_head(), module.build_parts(cfg)
+    html = module.build_html(cfg)
+    results = {
+        "serial":   timed(lambda: pdf_bytes(html), args.runs),
+        "parallel": timed(lambda: parallel_pdf_bytes(head, parts, args.workers), args.runs),
+    }
+
+    print(f"{os.path.basename(args.config)} ({template}, {len(parts)} page groups, "
+          f"{os.cpu_count()} CPUs)")
+    print(f"{'mode':<9}  {'cold':>9}  {'warm p50 / p95':>20}")
+    for mode, r in results.items():
+        print(f"{mode:<9}  {r['cold']:>6.0f} ms  {r['p50']:>8.0f} / {r['p95']:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
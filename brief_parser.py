@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""D&C Builders — Markdown client brief parser
+
+Turns briefs in the client_brief_example.md layout straight into
+ProposalConfig objects, with no LLM round-trip:
+
+  - key/value lines (Client Name, Address, Proposal Date, Project Total,
+    Output File, and optionally Template and Project Types)
+  - a "Project Scope" section: its "- item" bullets, or, when it has
+    numbered sub-headings ("### 2. Full 2nd Story Addition"), their titles
+  - a "Payment Schedule" section: "N. description    $amount" lines, plus an
+    optional "TOTAL: $amount" line that must match the milestones
+
+A file can hold any number of briefs: each "# " heading, or a second
+"Client Name:" line, starts the next one. The file is read one line at a
+time and each brief is handed over as soon as it ends, so a concatenated
+file of hundreds costs no more memory than one brief.
+
+Problems are reported as "file:line:col: message", all of them per brief
+rather than only the first. Parsing doesn't check the writing guide's
+limits — run lint_proposals.py on the JSON for that.
+
+Run:
+    python3 brief_parser.py client_brief_example.md               # check only
+    python3 brief_parser.py briefs.md --out-dir clients/          # write clients/<client>.json
+    pbpaste | python3 brief_parser.py - --out-dir clients/
+
+Exits with status 1 when any brief has errors.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from proposal_render import TEMPLATES, load_template, pick_template, write_atomic
+
+# "Key:" label (case-insensitive) → ProposalConfig field
+KEYS = {
+    "client name":    "client_name",
+    "client":         "client_name",
+    "address":        "client_address",
+    "proposal date":  "proposal_date",
+    "date":           "proposal_date",
+    "project total":  "project_total",
+    "total":          "project_total",
+    "output file":    "output_path",
+    "template":       "template",
+    "project types":  "project_types",
+}
+# What every brief needs, as the brief would call it
+REQUIRED = {
+    "client_name":    "Client Name",
+    "client_address": "Address",
+    "project_total":  "Project Total",
+    "scope_items":    "Project Scope items",
+    "payments":       "Payment Schedule milestones",
+}
+
+_HEADING   = re.compile(r"#{1,6}(?=\s)")
+_FENCE     = re.compile(r"\s*(```|~~~)\s*([\w+-]*)")
+_KEY_VALUE = re.compile(r"\s*([A-Za-z][A-Za-z ]*?)\s*:(\s*)(.*?)\s*$")
+_BULLET    = re.compile(r"(\s*[-*•]\s+)(.+?)\s*$")
+_NUMBERED  = re.compile(r"(\s*)(\d+)[.)](\s+)(.*?)\s*$")
+_AMOUNT    = re.compile(r"\$\d{1,3}(,\d{3})*(\.\d\d)?")
+_TOTAL     = re.compile(r"\s*TOTAL\s*:?\s*(\S+)\s*$", re.IGNORECASE)
+_ITEM_NUM  = re.compile(r"\d+[.)]\s+")
+
+
+class BriefError(ValueError):
+    """One problem in a brief, with where it is."""
+
+    def __init__(self, source: str, line: int, column: int, message: str):
+        super().__init__(f"{source}:{line}:{column}: {message}")
+        self.source, self.line, self.column, self.message = source, line, column, message
+
+
+@dataclass
+class Brief:
+    source: str
+    line:   int                                    # where the brief starts
+    data:   Dict[str, Any] = field(default_factory=dict)
+    errors: List[BriefError] = field(default_factory=list)
+
+    def config(self) -> Tuple[str, Any]:
+        """(template name, ProposalConfig). Raises the first error, if any."""
+        if self.errors:
+            raise self.errors[0]
+        template = pick_template(self.data)
+        fields = {k: v for k, v in self.data.items() if k != "template"}
+        return template, load_template(template).ProposalConfig.from_dict(fields)
+
+
+def dollars(amount: str) -> float:
+    return float(amount.lstrip("$").replace(",", ""))
+
+
+# ── Parsing ─────────────────────────────────────────────────────────────────
+class _State:
+    """The brief being read and where in it we are."""
+
+    def __init__(self, source: str, line: int):
+        self.brief = Brief(source, line)
+        self.seen: Dict[str, int] = {}     # field → line it was set on
+        self.section: Optional[str] = None  # "scope" / "payments" / None
+        self.level = 0                     # heading level of the section
+        self.sub_items: List[str] = []     # numbered sub-headings under Project Scope
+        self.bullets: List[str] = []
+        self.payments: List[Tuple[str, str]] = []
+        self.number = 0                    # last milestone number read
+        self.total: Optional[Tuple[int, int, str]] = None
+        self.content = False
+
+    def error(self, line: int, column: int, message: str) -> None:
+        self.brief.errors.append(BriefError(self.brief.source, line, column, message))
+
+    def finish(self) -> Brief:
+        brief, data = self.brief, self.brief.data
+        if self.sub_items or self.bullets:
+            data["scope_items"] = self.sub_items or self.bullets
+        if self.payments:
+            data["payments"] = [list(p) for p in self.payments]
+        for name, label in REQUIRED.items():
+            if name not in data and name not in self.seen:
+                self.error(brief.line, 1, f"brief has no {label}")
+        if self.total and self.payments and all(_AMOUNT.fullmatch(a) for _, a in self.payments):
+            line, column, amount = self.total
+            paid = sum(dollars(a) for _, a in self.payments)
+            if _AMOUNT.fullmatch(amount) and abs(dollars(amount) - paid) > 0.005:
+                self.error(line, column, f"TOTAL {amount} doesn't match the milestones (${paid:,.0f})")
+        brief.errors.sort(key=lambda e: (e.line, e.column))
+        return brief
+
+
+def _heading(state: _State, level: int, title: str) -> None:
+    lower = title.lower()
+    if state.section and level <= state.level:
+        state.section = None
+    if "project scope" in lower:
+        state.section, state.level = "scope", level
+    elif "payment schedule" in lower:
+        state.section, state.level = "payments", level
+    elif state.section == "scope" and level > state.level and _ITEM_NUM.match(title):
+        state.sub_items.append(_ITEM_NUM.sub("", title, count=1).strip())
+
+
+def _key_value(state: _State, no: int, text: str) -> bool:
+    m = _KEY_VALUE.match(text)
+    name = m and KEYS.get(m.group(1).lower())
+    if not name:
+        return False
+    value, column = m.group(3), m.end(2) + 1
+    if name in state.seen:
+        state.error(no, m.start(1) + 1, f"{m.group(1)} given twice (first on line {state.seen[name]})")
+        return True
+    state.seen[name] = no
+    if not value:
+        state.error(no, column, f"{m.group(1)} is empty")
+        return True
+    if name == "project_total" and not _AMOUNT.fullmatch(value):
+        state.error(no, column, f"{value!r} is not a dollar amount like $312,500")
+    elif name == "template" and value not in TEMPLATES:
+        state.error(no, column, f"unknown template {value!r} (expected {' or '.join(TEMPLATES)})")
+    if name == "project_types":
+        state.brief.data[name] = [t.strip().lower().replace(" ", "_")
+                                  for t in value.split(",") if t.strip()]
+    else:
+        state.brief.data[name] = value
+    return True
+
+
+def _payment(state: _State, no: int, text: str) -> None:
+    total = _TOTAL.match(text)
+    if total:
+        state.total = (no, total.start(1) + 1, total.group(1))
+        if not _AMOUNT.fullmatch(total.group(1)):
+            state.error(no, total.start(1) + 1, f"{total.group(1)!r} is not a dollar amount")
+        return
+    m = _NUMBERED.match(text)
+    if not m:
+        return  # prose and separator rules around the schedule
+    expected, state.number = state.number + 1, int(m.group(2))
+    if state.number != expected:
+        state.error(no, m.start(2) + 1, f"milestone numbered {m.group(2)}, expected {expected}")
+    desc, _, amount = m.group(4).rpartition(" ")
+    desc = desc.rstrip()
+    amount_col = m.start(4) + len(m.group(4)) - len(amount) + 1
+    if not amount.startswith("$") or not desc:
+        state.error(no, m.end(4) + 1, "milestone has no amount (expected 'N. description    $amount')")
+        desc, amount = m.group(4), ""
+    elif not _AMOUNT.fullmatch(amount):
+        state.error(no, amount_col, f"{amount!r} is not a dollar amount like $12,500")
+    state.payments.append((desc, amount))
+
+
+def iter_briefs(lines: Iterable[str], source: str = "<brief>") -> Iterator[Brief]:
+    """Yield each brief in `lines` as soon as it ends."""
+    state = _State(source, 1)
+    fence: Optional[str] = None  # "" for a plain fence, else its language
+    fence_line = no = 0
+    for no, raw in enumerate(lines, 1):
+        text = raw.rstrip("\r\n")
+        f = _FENCE.match(text)
+        if f:
+            fence, fence_line = (None, 0) if fence is not None else (f.group(2).lower(), no)
+            continue
+        if fence not in (None, "", "text", "txt"):
+            continue  # ```json / ```bash examples, not brief content
+
+        h = _HEADING.match(text) if fence is None else None
+        if h and len(h.group(0)) == 1 and state.content:
+            yield state.finish()
+            state = _State(source, no)
+        m = _KEY_VALUE.match(text)
+        if m and KEYS.get(m.group(1).lower()) == "client_name" and "client_name" in state.seen:
+            yield state.finish()
+            state = _State(source, no)
+
+        if h:
+            _heading(state, len(h.group(0)), text[h.end():].strip())
+        elif state.section == "payments":
+            _payment(state, no, text)
+        elif state.section == "scope" and not state.sub_items:
+            b = _BULLET.match(text)
+            if b:
+                state.bullets.append(b.group(2))
+        elif state.section is None:
+            _key_value(state, no, text)
+        state.content = state.content or bool(state.seen or state.payments or state.bullets
+                                               or state.sub_items)
+    if fence is not None:
+        state.error(fence_line, 1, "code fence never closed")
+    if state.content or state.brief.errors:
+        yield state.finish()
+
+
+def parse_file(path: str) -> Iterator[Brief]:
+    """Briefs in a file ('-' for stdin)."""
+    if path == "-":
+        yield from iter_briefs(sys.stdin, "<stdin>")
+        return
+    with open(path, encoding="utf-8") as f:
+        yield from iter_briefs(f, path)
+
+
+_PAIR = re.compile(r'\[\s+("(?:[^"\\]|\\.)*"),\s+("(?:[^"\\]|\\.)*")\s+\]')
+
+
+def to_json(data: Dict[str, Any]) -> str:
+    """JSON in the clients/*.json style: one [description, amount] per line."""
+    return _PAIR.sub(r"[\1, \2]", json.dumps(data, indent=2, ensure_ascii=False)) + "\n"
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "client"
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Parse Markdown client briefs into proposal configs.")
+    p.add_argument("paths", nargs="+", metavar="BRIEF", help="Markdown files ('-' for stdin)")
+    p.add_argument("--out-dir", metavar="DIR", help="Write one <client>.json per brief here")
+    p.add_argument("--force", action="store_true", help="Overwrite existing JSON files")
+    return p.parse_args()
+
+
+def write_json(brief: Brief, out_dir: str, force: bool = False, out: TextIO = sys.stdout) -> bool:
+    path = os.path.join(out_dir, slug(brief.data["client_name"]) + ".json")
+    if os.path.exists(path) and not force:
+        print(f"{brief.source}:{brief.line}:1: {path} exists (use --force to replace it)", file=out)
+        return False
+    write_atomic(path, to_json(brief.data).encode())
+    print(f"  {brief.data['client_name']} → {path}", file=out)
+    return True
+
+
+def main() -> None:
+    args = parse_args()
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    good = bad = 0
+    for path in args.paths:
+        for brief in parse_file(path):
+            for error in brief.errors:
+                print(error)
+            if brief.errors:
+                bad += 1
+            elif args.out_dir and not write_json(brief, args.out_dir, args.force):
+                bad += 1
+            else:
+                good += 1
+                if not args.out_dir:
+                    template, cfg = brief.config()
+                    print(f"  {cfg.client_name}: {len(cfg.scope_items)} scope item(s), "
+                          f"{len(cfg.payments)} milestone(s), {cfg.project_total} ({template})")
+    print(f"{good + bad} brief(s): {good} ok, {bad} with errors")
+    sys.exit(1 if bad else 0)
+
+
+if __name__ == "__main__":
+    main()
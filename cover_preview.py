@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""D&C Builders — Cover Page PNG Preview
+
+Lays out only page 1 (client, address, scope list, total) and rasterizes it,
+so reps can check the cover before spending a full render. Thumbnails are
+cached in memory and under .cache/covers/, keyed by a hash of the cover
+markup — which is exactly the cover fields plus the template stylesheet.
+
+Needs pypdfium2 for rasterizing (pip3 install pypdfium2).
+
+Run:
+    python3 cover_preview.py --json clients/test_martinez_full_scope.json --template full_scope
+    python3 cover_preview.py --json clients/example_restrepo.json --dpi 48 --output cover.png
+"""
+import argparse
+import hashlib
+import io
+import os
+from collections import OrderedDict
+
+from proposal_render import TEMPLATES, assemble_html, layout, load_template, write_atomic
+from proposal_sections import CACHE_DIR
+
+COVER_CACHE = os.path.join(CACHE_DIR, "covers")
+MEMORY_SLOTS = 256  # thumbnails kept in process
+
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+def cover_key(head: str, cover: str, dpi: int) -> str:
+    return hashlib.sha256(f"{dpi}\0{head}\0{cover}".encode()).hexdigest()
+
+
+def _rasterize(pdf: bytes, dpi: int) -> bytes:
+    import pypdfium2 as pdfium
+
+    page = pdfium.PdfDocument(pdf)[0]
+    image = page.render(scale=dpi / 72).to_pil()
+    out = io.BytesIO()
+    image.save(out, format="PNG", optimize=False)
+    return out.getvalue()
+
+
+def cover_png(cfg, template: str = "standard", dpi: int = 72) -> bytes:
+    """PNG bytes of the cover page at `dpi` (from cache when unchanged)."""
+    module = load_template(template)
+    head   = module.build_head()
+    cover  = module.build_cover(cfg)
+    key    = cover_key(head, cover, dpi)
+
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+
+    path = os.path.join(COVER_CACHE, f"{key}.png")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            png = f.read()
+    else:
+        png = _rasterize(layout(assemble_html(head, [cover])).write_pdf(), dpi)
+        os.makedirs(COVER_CACHE, exist_ok=True)
+        write_atomic(path, png)
+
+    _memory[key] = png
+    if len(_memory) > MEMORY_SLOTS:
+        _memory.popitem(last=False)
+    return png
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Render a PNG preview of a proposal cover page.")
+    p.add_argument("--json",     metavar="FILE", required=True, help="Client JSON config")
+    p.add_argument("--template", choices=sorted(TEMPLATES), default="standard")
+    p.add_argument("--dpi",      type=int, default=72, help="Raster resolution (default 72)")
+    p.add_argument("--output",   metavar="PATH", help="PNG path (default: <json name>_cover.png)")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    module = load_template(args.template)
+    cfg = module.ProposalConfig.from_json(args.json)
+    output = args.output or os.path.splitext(args.json)[0] + "_cover.png"
+
+    with open(output, "wb") as f:
+        f.write(cover_png(cfg, args.template, args.dpi))
+    print(f"Cover preview saved to:\n  {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""D&C Builders — project cost estimator
+
+Prices an intake from its form fields (area_sf, stories, bedroom_count,
+bathroom_count, hvac_type, project_type, materials, construction_toggles)
+against the unit-price book in pricing/unit_prices.csv, and turns the total
+into a payment schedule that follows PROPOSAL_WRITING_GUIDE.md.
+
+Each price-book row is one line item: a unit price times a quantity driver
+(each, sf, bedroom or bathroom, scaled by `per`), included when all of its
+`when` conditions hold. Conditions use the section library's syntax —
+"toggle", "!toggle", "material=Value" — plus "type=", "hvac=" and
+"stories=" for the intake's project type, HVAC and stories. Materials are
+resolved through the materials book (material_book.py), so "quartz" prices
+as "Quartz (Prefab)"; a blank or "TBD" material is the book's default.
+
+The book is loaded once per process into NumPy arrays, and estimate() prices
+any number of intakes in one pass: quantities and line costs are (intakes ×
+line items) matrices, so re-pricing the whole pipeline after a supplier
+price change takes a fraction of a second.
+
+    pip3 install numpy
+
+Run:
+    python3 estimator.py intake.json                 # line items, total, payment schedule
+    python3 estimator.py clients/myClient.json --write
+    python3 estimator.py --reprice                   # every open intake in Supabase, old vs new
+    python3 estimator.py --reprice --apply           # store new totals and queue re-renders
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from brief_parser import to_json
+from lint_proposals import MAX_MILESTONE_SHARE, MAX_MILESTONES
+from material_book import load_materials
+from proposal_render import write_atomic
+
+BASE       = os.path.dirname(os.path.abspath(__file__))
+PRICE_BOOK = os.path.join(BASE, "pricing", "unit_prices.csv")
+
+DRIVERS      = ("each", "sf", "bedroom", "bathroom")
+MARKUP       = 0.20   # overhead & profit on the price book's direct costs
+ROUND_TO     = 500    # totals and milestones
+DOWN_PAYMENT = 1_000
+
+# Closing milestones: fixed shares of the total, not tied to a phase's cost
+CLOSING = (("Upon Pass Final Inspection", 0.05),
+           ("Upon Completion & Final Punch List", 0.04))
+
+# Intake field → condition key ("type=ADU", "hvac=Mini-Split", ...)
+ATTRIBUTES = {"type": "project_type", "hvac": "hvac_type", "stories": "stories"}
+
+# Price-book phase → the milestones it is paid over, with each one's share,
+# in schedule order
+PHASES: List[Tuple[str, Tuple[Tuple[str, float], ...]]] = [
+    ("design",     (("Mobilization & Start Architectural Design", 0.6),
+                    ("Upon Plans Approval & Permit Submission", 0.4))),
+    ("demo",       (("Site Prep & Start Demo", 1.0),)),
+    ("foundation", (("Upon Start Foundation Work", 0.6),
+                    ("Upon Foundation Inspection Approval", 0.4))),
+    ("framing",    (("Upon Start Framing", 0.55),
+                    ("Pass Framing Inspection", 0.45))),
+    ("mep",        (("Upon Start Rough MEP", 0.6),
+                    ("Pass Rough MEP Inspection", 0.4))),
+    ("drywall",    (("Upon Start Drywall & Insulation", 1.0),)),
+    ("exterior",   (("Upon Start Exterior Lath & Stucco", 0.6),
+                    ("Upon Finish Stucco & Exterior Paint", 0.4))),
+    ("roofing",    (("Upon Start Roofing", 1.0),)),
+    ("kitchen",    (("Upon Start Kitchen Cabinet Installation", 0.6),
+                    ("Upon Start Countertop Fabrication", 0.4))),
+    ("bath",       (("Upon Start Bathroom Tile Work", 1.0),)),
+    ("finishes",   (("Upon Start Flooring & Interior Finishes", 1.0),)),
+]
+PHASE_NAMES = tuple(name for name, _ in PHASES)
+
+
+# ── Price book ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class PriceBook:
+    keys:       Tuple[str, ...]
+    labels:     Tuple[str, ...]
+    when:       Tuple[Tuple[str, ...], ...]
+    phase:      Any   # int array: index into PHASE_NAMES
+    driver:     Any   # int array: index into DRIVERS
+    per:        Any   # float array: driver units per line-item unit
+    unit_price: Any   # float array: $ per unit
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+@lru_cache(maxsize=4)
+def load_price_book(path: str = PRICE_BOOK) -> PriceBook:
+    """Parse and validate the price book once per process."""
+    import numpy as np
+
+    keys, labels, when, phase, driver, per, price = [], [], [], [], [], [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for n, row in enumerate(csv.DictReader(f), 2):
+            where = f"{path}:{n}"
+            if row["phase"] not in PHASE_NAMES:
+                raise ValueError(f"{where}: unknown phase {row['phase']!r} "
+                                 f"(expected one of {', '.join(PHASE_NAMES)})")
+            if row["driver"] not in DRIVERS:
+                raise ValueError(f"{where}: unknown driver {row['driver']!r} "
+                                 f"(expected one of {', '.join(DRIVERS)})")
+            if row["key"] in keys:
+                raise ValueError(f"{where}: duplicate key {row['key']!r}")
+            try:
+                per.append(float(row["per"] or 1))
+                price.append(float(row["unit_price"]))
+            except ValueError:
+                raise ValueError(f"{where}: per and unit_price must be numbers") from None
+            keys.append(row["key"])
+            labels.append(row["label"])
+            when.append(tuple(c.strip() for c in (row["when"] or "").split(";") if c.strip()))
+            phase.append(PHASE_NAMES.index(row["phase"]))
+            driver.append(DRIVERS.index(row["driver"]))
+    return PriceBook(tuple(keys), tuple(labels), tuple(when), np.array(phase), np.array(driver),
+                     np.array(per), np.array(price))
+
+
+# ── Estimating ──────────────────────────────────────────────────────────────
+def _number(value: Any) -> float:
+    """'1,200', '2.5', 3, None → float (0 when blank or unreadable)."""
+    try:
+        return float(str(value or 0).replace(",", "").strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def _material(materials: Mapping[str, Any], kind: str) -> str:
+    """The book's name for the intake's choice, else the choice as typed."""
+    found = load_materials().resolve(kind, materials.get(kind))
+    return found.name if found else str(materials.get(kind) or "").strip()
+
+
+def _attribute(intake: Mapping[str, Any], kind: str) -> str:
+    if kind in ATTRIBUTES:
+        return str(intake.get(ATTRIBUTES[kind]) or "").strip()
+    return _material(intake.get("materials") or {}, kind)
+
+
+@dataclass
+class Estimates:
+    """Prices for a batch of intakes; row i is intakes[i]."""
+    book:       PriceBook
+    quantities: Any   # (intakes × line items)
+    costs:      Any   # (intakes × line items), direct cost
+    totals:     Any   # (intakes,), with markup, rounded to ROUND_TO
+    unpriced:   List[List[str]]  # per intake: "kind=Value" choices no row prices
+
+    def line_items(self, i: int) -> List[Tuple[str, float, float]]:
+        """(label, quantity, cost) for each line item intake i includes."""
+        return [(self.book.labels[j], float(self.quantities[i, j]), float(self.costs[i, j]))
+                for j in self.costs[i].nonzero()[0]]
+
+    def phase_costs(self, i: int) -> Dict[str, float]:
+        import numpy as np
+
+        sums = np.bincount(self.book.phase, weights=self.costs[i], minlength=len(PHASE_NAMES))
+        return {name: float(c) for name, c in zip(PHASE_NAMES, sums) if c > 0}
+
+
+def estimate(intakes: Sequence[Mapping[str, Any]], book: Optional[PriceBook] = None,
+             markup: float = MARKUP) -> Estimates:
+    """Price every intake against the book in one vectorized pass."""
+    import numpy as np
+
+    book = book or load_price_book()
+    n = len(intakes)
+
+    drivers = np.ones((n, len(DRIVERS)))
+    drivers[:, 1] = [_number(i.get("area_sf")) for i in intakes]
+    drivers[:, 2] = [_number(i.get("bedroom_count")) for i in intakes]
+    drivers[:, 3] = [_number(i.get("bathroom_count")) for i in intakes]
+    quantities = drivers[:, book.driver] * book.per
+
+    # Each distinct condition is evaluated once, as a vector over all intakes
+    include = np.ones((n, len(book)), dtype=bool)
+    values: Dict[str, Any] = {}
+    for j, conds in enumerate(book.when):
+        for cond in conds:
+            if cond not in values:
+                negate, bare = cond.startswith("!"), cond.lstrip("!")
+                if "=" in bare:
+                    kind, want = bare.split("=", 1)
+                    hit = np.array([_attribute(i, kind) == want for i in intakes], dtype=bool)
+                else:
+                    hit = np.array([bool((i.get("construction_toggles") or {}).get(bare, True))
+                                    for i in intakes], dtype=bool)
+                values[cond] = hit != negate
+            include[:, j] &= values[cond]
+
+    costs = np.where(include, quantities * book.unit_price, 0.0)
+    totals = np.round(costs.sum(axis=1) * (1 + markup) / ROUND_TO) * ROUND_TO
+
+    # Materials the book has no row for are left out of the price — say so
+    priced = {c.lstrip("!") for conds in book.when for c in conds if "=" in c}
+    kinds = load_materials().kinds
+    unpriced = []
+    for intake in intakes:
+        missing = []
+        for kind, value in sorted((intake.get("materials") or {}).items()):
+            chosen = _material(intake.get("materials") or {}, kind)
+            if chosen and kind in kinds and f"{kind}={chosen}" not in priced:
+                missing.append(f"{kind}={value}")
+        unpriced.append(missing)
+    return Estimates(book, np.where(include, quantities, 0.0), costs, totals, unpriced)
+
+
+# ── Payment schedule ────────────────────────────────────────────────────────
+def money(amount: float) -> str:
+    return f"${amount:,.0f}"
+
+
+def payment_schedule(total: float, phase_costs: Mapping[str, float]) -> List[Tuple[str, str]]:
+    """Milestones for `total`, following the writing guide's rules.
+
+    Down payment first and the CLOSING milestones last; the rest is split
+    over the phases in proportion to their cost, no milestone above
+    MAX_MILESTONE_SHARE of the total, in ROUND_TO steps. When the phases'
+    milestones can't hold the body under that cap (a small job with one or
+    two phases), the largest are paid in parts: "Upon Start Roofing (1/3)".
+    """
+    closing = [(name, round(total * share / ROUND_TO) * ROUND_TO) for name, share in CLOSING]
+    body = total - DOWN_PAYMENT - sum(a for _, a in closing)
+    names, weights = [], []
+    for phase, milestones in PHASES:
+        for name, share in milestones:
+            if phase_costs.get(phase, 0) > 0:
+                names.append(name)
+                weights.append(phase_costs[phase] * share)
+    if not names or body <= 0:
+        return [("Down payment", money(DOWN_PAYMENT)),
+                (CLOSING[-1][0], money(max(total - DOWN_PAYMENT, 0)))]
+
+    # The cap in whole ROUND_TO steps, so rounding never lifts a milestone over it
+    cap = MAX_MILESTONE_SHARE * total // ROUND_TO * ROUND_TO
+    if cap <= 0:
+        raise ValueError(f"a {money(total)} total can't be scheduled with no milestone "
+                         f"over {MAX_MILESTONE_SHARE:.0%}")
+
+    # Enough milestones to hold the body: split the heaviest into parts
+    parts = [1] * len(names)
+    while sum(parts) * cap < body:
+        j = max(range(len(names)), key=lambda k: weights[k] / parts[k])
+        parts[j] += 1
+        if sum(parts) + 1 + len(closing) > MAX_MILESTONES:
+            raise ValueError(f"a {money(total)} total needs more than {MAX_MILESTONES} milestones "
+                             f"to keep each under {MAX_MILESTONE_SHARE:.0%}")
+    names = [f"{name} ({i}/{n})" if n > 1 else name
+             for name, n in zip(names, parts) for i in range(1, n + 1)]
+    weights = [w / n for w, n in zip(weights, parts) for _ in range(n)]
+
+    # Proportional split; a milestone over the cap is held at it and the
+    # excess goes to the others, in proportion, until none is over
+    capped = [False] * len(names)
+    while True:
+        free = body - cap * sum(capped)
+        weight = sum(w for w, c in zip(weights, capped) if not c)
+        amounts = [cap if c else free * w / weight for w, c in zip(weights, capped)]
+        over = [a > cap for a in amounts]
+        if not any(over):
+            break
+        capped = [c or o for c, o in zip(capped, over)]
+
+    amounts = [round(a / ROUND_TO) * ROUND_TO for a in amounts]
+    residual = body - sum(amounts)  # whole ROUND_TO steps go where there's headroom
+    while abs(residual) >= ROUND_TO:
+        step = ROUND_TO if residual > 0 else -ROUND_TO
+        j = (max(range(len(amounts)), key=lambda k: cap - amounts[k]) if step > 0
+             else max(range(len(amounts)), key=lambda k: amounts[k]))
+        amounts[j] += step
+        residual -= step
+    # What's left when the total isn't a round number: on the last milestone
+    # if it fits there (under the cap, above zero), else where it does
+    j = len(amounts) - 1
+    if residual > 0 and amounts[j] + residual > cap:
+        j = max(range(len(amounts)), key=lambda k: cap - amounts[k])
+    elif residual < 0 and amounts[j] + residual <= 0:
+        j = max(range(len(amounts)), key=lambda k: amounts[k])
+    amounts[j] += residual
+
+    return ([("Down payment", money(DOWN_PAYMENT))]
+            + [(name, money(a)) for name, a in zip(names, amounts) if a > 0]
+            + [(name, money(a)) for name, a in closing])
+
+
+def priced(intake: Mapping[str, Any], markup: float = MARKUP) -> Dict[str, Any]:
+    """project_total and payments for one intake."""
+    est = estimate([intake], markup=markup)
+    total = float(est.totals[0])
+    return {"project_total": money(total),
+            "payments": [list(p) for p in payment_schedule(total, est.phase_costs(0))]}
+
+
+# ── Re-pricing open intakes ─────────────────────────────────────────────────
+_OPEN = """
+SELECT id, first_name || ' & ' || last_name AS client_name, status, project_total,
+       project_type, stories, area_sf, bedroom_count, bathroom_count, hvac_type,
+       materials, construction_toggles, rendered_config, template
+FROM client_intakes
+WHERE status IN ('pending', 'generated', 'failed') AND coalesce(area_sf, '') <> ''
+ORDER BY created_at, id
+"""
+
+# New price on the form columns and, if rendered before, on the stored config
+# too — which queues it for a bulk re-render (render_jobs.py)
+_REPRICE = """
+UPDATE client_intakes
+SET project_total   = %(total)s,
+    payments        = %(payments)s,
+    rendered_config = CASE WHEN %(rerender)s THEN %(config)s ELSE rendered_config END,
+    config_hash     = CASE WHEN %(rerender)s THEN %(hash)s ELSE config_hash END,
+    status          = CASE WHEN %(rerender)s THEN 'pending' ELSE status END,
+    priority        = CASE WHEN %(rerender)s THEN 'bulk' ELSE priority END,
+    attempts        = CASE WHEN %(rerender)s THEN 0 ELSE attempts END,
+    next_attempt_at = CASE WHEN %(rerender)s THEN NULL ELSE next_attempt_at END
+WHERE id = %(id)s AND status <> 'sent'
+"""
+
+
+def reprice(apply: bool = False, markup: float = MARKUP) -> List[Dict[str, Any]]:
+    """Price every open intake; with apply, store the changed ones.
+
+    Returns one {id, client_name, old, new} per intake whose total changed.
+    """
+    from psycopg.types.json import Jsonb
+
+    from intake_db import connect
+    from proposal_render import config_dict, config_hash, load_template
+
+    with connect() as conn:
+        rows = conn.execute(_OPEN).fetchall()
+        est = estimate(rows, markup=markup)
+        changes = []
+        for i, row in enumerate(rows):
+            total = money(float(est.totals[i]))
+            if total == row["project_total"]:
+                continue
+            changes.append({"id": row["id"], "client_name": row["client_name"],
+                            "old": row["project_total"] or "—", "new": total})
+            if not apply:
+                continue
+            payments = payment_schedule(float(est.totals[i]), est.phase_costs(i))
+            config = digest = None
+            if row["rendered_config"] and row["template"]:
+                cfg = load_template(row["template"]).ProposalConfig.from_dict(row["rendered_config"])
+                cfg.project_total, cfg.payments = total, payments
+                config, digest = Jsonb(config_dict(cfg)), config_hash(cfg)
+            with conn.transaction():
+                conn.execute(_REPRICE, {"total": total, "payments": Jsonb([list(p) for p in payments]),
+                                        "rerender": config is not None, "config": config,
+                                        "hash": digest, "id": row["id"]})
+    return changes
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Price intakes from the unit-price book.")
+    p.add_argument("paths", nargs="*", metavar="JSON", help="Intake or client JSON files")
+    p.add_argument("--write", action="store_true",
+                   help="Store project_total and payments back into each JSON file")
+    p.add_argument("--markup", type=float, default=MARKUP,
+                   help=f"Overhead & profit on direct cost (default {MARKUP:.0%})")
+    p.add_argument("--reprice", action="store_true", help="Re-price every open intake in Supabase")
+    p.add_argument("--apply", action="store_true", help="With --reprice: store the new prices")
+    return p.parse_args()
+
+
+def print_estimate(path: str, est: Estimates, i: int, markup: float = MARKUP) -> None:
+    total = float(est.totals[i])
+    print(f"{path}")
+    for label, qty, cost in est.line_items(i):
+        print(f"  {label:<52} {qty:>9,.1f}  {money(cost):>10}")
+    for choice in est.unpriced[i]:
+        print(f"  ! not in the price book: {choice}")
+    print(f"  {f'Total (incl. {markup:.0%} overhead & profit)':<63}{money(total):>10}")
+    for n, (desc, amount) in enumerate(payment_schedule(total, est.phase_costs(i)), 1):
+        print(f"    {n:>2}. {desc:<50} {amount:>10}")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.reprice:
+        changes = reprice(args.apply, args.markup)
+        for c in changes:
+            print(f"{c['id']}  {c['client_name']:<28} {c['old']:>10} → {c['new']:>10}")
+        print(f"{len(changes)} intake(s) re-priced" + (" and queued for re-render" if args.apply
+                                                       else " (dry run; --apply to store)"))
+        return
+    if not args.paths:
+        sys.exit("Pass intake JSON files, or --reprice")
+
+    intakes = []
+    for path in args.paths:
+        with open(path) as f:
+            intakes.append(json.load(f))
+    est = estimate(intakes, markup=args.markup)
+    for i, path in enumerate(args.paths):
+        if not _number(intakes[i].get("area_sf")):
+            print(f"{path}: no area_sf — only fixed-price items are included")
+        print_estimate(path, est, i, args.markup)
+        if args.write:
+            total = float(est.totals[i])
+            intakes[i]["project_total"] = money(total)
+            intakes[i]["payments"] = [list(p) for p in payment_schedule(total, est.phase_costs(i))]
+            write_atomic(path, to_json(intakes[i]).encode())
+
+
+if __name__ == "__main__":
+    main()
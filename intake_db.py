@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""D&C Builders — client_intakes persistence
+
+Keeps the final rendered config on its intake row (rendered_config, with
+config_hash, template, template_version and rendered_at — see
+migrations/001_rendered_config.sql), so a proposal can be re-issued from
+any machine with a render instead of regenerating the client JSON.
+
+A render is skipped when the row already holds the same config hash and
+template version and the PDF is present locally.
+
+Listings page with keyset cursors on (created_at, id) rather than OFFSET,
+so page 5,000 costs the same as page 1 (indexes: migrations/002).
+
+Renders record render_ms and page_count; a status trigger stamps
+generated_at / sent_at. `report` refreshes the intake_latency_daily rollup
+(migrations/003) and prints p50/p95 latency per day and project type.
+
+Needs psycopg and the Supabase Postgres connection string:
+
+    pip3 install "psycopg[binary]"
+    export SUPABASE_DB_URL="postgresql://postgres:<password>@db.<project>.supabase.co:5432/postgres"
+
+Run:
+    python3 generate_proposal_full_scope.py --json clients/myClient.json --intake <id>   # render + store
+    python3 intake_db.py render <id>                                                    # re-render from the row
+    python3 intake_db.py render <id> --output /tmp/proposal.pdf --force
+    python3 intake_db.py list --status pending --limit 20
+    python3 intake_db.py list --cursor <next cursor from the previous page>
+    python3 intake_db.py report --days 30
+"""
+import argparse
+import base64
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from proposal_render import config_dict, config_hash, load_template, render_config, template_version
+
+DB_URL_ENV = "SUPABASE_DB_URL"
+
+# Retry policy for failed renders
+MAX_ATTEMPTS   = 5
+BACKOFF_BASE_S = 30      # first retry after ~30s, then 60s, 120s, ...
+BACKOFF_CAP_S  = 3600
+
+# Render queue classes, most urgent first (migrations/005)
+PRIORITIES = ("interactive", "normal", "bulk")
+
+_RENDER_STATE = """
+SELECT rendered_config, config_hash, template, template_version, rendered_at, pdf_path
+FROM client_intakes WHERE id = %s
+"""
+
+_RECORD_RENDER = """
+UPDATE client_intakes
+SET rendered_config  = %(config)s,
+    config_hash      = %(hash)s,
+    template         = %(template)s,
+    template_version = %(version)s,
+    rendered_at      = now(),
+    pdf_path         = %(pdf_path)s,
+    render_ms        = %(render_ms)s,
+    page_count       = %(page_count)s,
+    next_attempt_at  = NULL,
+    last_error       = NULL,
+    status           = CASE WHEN status IN ('pending', 'failed', 'dead') THEN 'generated'
+                            ELSE status END
+WHERE id = %(id)s
+"""
+
+# Failed render: back off exponentially (with jitter), dead after max attempts.
+# Rows already generated/sent keep their status; only the error is recorded.
+_RECORD_FAILURE = """
+UPDATE client_intakes
+SET attempts        = attempts + %(bump)s,
+    last_error      = %(error)s,
+    next_attempt_at = now() + make_interval(secs =>
+                        least(%(cap)s, %(base)s * power(2, attempts + %(bump)s - 1))
+                        * (1 + random() * 0.25)),
+    status          = CASE WHEN status IN ('generated', 'sent') THEN status
+                           WHEN attempts + %(bump)s >= %(max)s THEN 'dead'
+                           ELSE 'failed' END
+WHERE id = %(id)s
+RETURNING status, attempts, next_attempt_at
+"""
+
+_STORE_CONFIG = """
+UPDATE client_intakes
+SET rendered_config = %(config)s,
+    config_hash     = %(hash)s,
+    template        = %(template)s,
+    priority        = %(priority)s,
+    requested_by    = coalesce(%(rep)s, requested_by),
+    status          = 'pending',
+    attempts        = 0,
+    next_attempt_at = NULL
+WHERE id = %(id)s AND status IN ('pending', 'failed', 'dead')
+"""
+
+
+_LIST_COLUMNS = """
+SELECT id, created_at, first_name || ' & ' || last_name AS client_name,
+       status, project_total, pdf_path
+FROM client_intakes
+"""
+
+
+def connect(url: Optional[str] = None):
+    """psycopg connection with dict rows (SUPABASE_DB_URL by default)."""
+    import psycopg
+    from psycopg.rows import dict_row
+
+    url = url or os.environ.get(DB_URL_ENV)
+    if not url:
+        raise RuntimeError(f"Set {DB_URL_ENV} to the Supabase Postgres connection string")
+    return psycopg.connect(url, row_factory=dict_row)
+
+
+def render_state(conn, intake_id: str) -> Dict[str, Any]:
+    # Its own transaction: left implicit, it would stay open through the
+    # render and turn record_failure's into a savepoint that the re-raise
+    # rolls back with it
+    with conn.transaction():
+        row = conn.execute(_RENDER_STATE, (intake_id,)).fetchone()
+    if row is None:
+        raise LookupError(f"No client_intakes row with id {intake_id}")
+    return row
+
+
+def is_current(state: Dict[str, Any], cfg, template: str, output: str) -> bool:
+    """True when `state` already records this exact render at `output`."""
+    return (state.get("config_hash") == config_hash(cfg)
+            and state.get("template") == template
+            and state.get("template_version") == template_version(template)
+            and os.path.exists(output))
+
+
+def record_render(conn, intake_id: str, cfg, template: str, output: str,
+                  render_ms: Optional[int] = None, page_count: Optional[int] = None) -> None:
+    """Store a finished render (generated_at is stamped by the status trigger)."""
+    from psycopg.types.json import Jsonb
+
+    with conn.transaction():
+        conn.execute(_RECORD_RENDER, {
+            "config":     Jsonb(config_dict(cfg)),
+            "hash":       config_hash(cfg),
+            "template":   template,
+            "version":    template_version(template),
+            "pdf_path":   output,
+            "render_ms":  render_ms,
+            "page_count": page_count,
+            "id":         intake_id,
+        })
+
+
+def error_text(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"[:2000]
+
+
+def record_failure(conn, intake_id: str, error: str, claimed: bool = False,
+                   max_attempts: int = MAX_ATTEMPTS) -> Dict[str, Any]:
+    """Store a failed render; returns the row's new status/attempts/next_attempt_at.
+
+    claimed=True when the attempt was already counted by render_jobs.claim().
+    """
+    with conn.transaction():
+        return conn.execute(_RECORD_FAILURE, {
+            "bump":  0 if claimed else 1,
+            "error": error,
+            "base":  BACKOFF_BASE_S,
+            "cap":   BACKOFF_CAP_S,
+            "max":   max_attempts,
+            "id":    intake_id,
+        }).fetchone()
+
+
+def store_config(conn, intake_id: str, cfg, template: str, priority: str = "normal",
+                 rep: Optional[str] = None) -> bool:
+    """Queue an intake for rendering with `cfg` (render_jobs.py drains it).
+
+    `priority` is one of PRIORITIES; `rep` is who asked for the render, the
+    unit the queue shares workers between. Returns False if the intake is
+    already generated or sent.
+    """
+    from psycopg.types.json import Jsonb
+
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority!r} (expected one of {', '.join(PRIORITIES)})")
+
+    with conn.transaction():
+        cur = conn.execute(_STORE_CONFIG, {
+            "config":   Jsonb(config_dict(cfg)),
+            "hash":     config_hash(cfg),
+            "template": template,
+            "priority": priority,
+            "rep":      rep,
+            "id":       intake_id,
+        })
+        return cur.rowcount == 1
+
+
+def render_for_intake(intake_id: str, cfg, template: str, output: str,
+                      parallel: bool = False, force: bool = False) -> bool:
+    """Render `cfg` for an intake and store it on the row.
+
+    Returns False (nothing rendered) when the row is already current. A
+    failed render is recorded on the row (see record_failure) and re-raised.
+    """
+    with connect() as conn:
+        if not force and is_current(render_state(conn, intake_id), cfg, template, output):
+            return False
+        started = time.perf_counter()
+        try:
+            pages = render_config(cfg, template, output, parallel)
+        except Exception as exc:
+            record_failure(conn, intake_id, error_text(exc))
+            raise
+        elapsed = round((time.perf_counter() - started) * 1000)
+        record_render(conn, intake_id, cfg, template, output, elapsed, pages)
+    return True
+
+
+def load_stored(intake_id: str):
+    """(ProposalConfig, template name) rebuilt from the row's rendered_config."""
+    with connect() as conn:
+        state = render_state(conn, intake_id)
+    if not state["rendered_config"]:
+        raise LookupError(f"Intake {intake_id} has no stored config yet — "
+                          f"render it once from JSON with --intake {intake_id}")
+    module = load_template(state["template"])
+    return module.ProposalConfig.from_dict(state["rendered_config"]), state["template"]
+
+
+# ── Listing ─────────────────────────────────────────────────────────────────
+def encode_cursor(row: Dict[str, Any]) -> str:
+    raw = f"{row['created_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created, intake_id = raw.split("|", 1)
+        return datetime.fromisoformat(created), intake_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor {cursor!r}") from None
+
+
+def list_intakes(conn, limit: int = 25, cursor: Optional[str] = None,
+                 status: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of intakes, newest first, plus the cursor for the next page
+    (None on the last page)."""
+    where, params = [], []
+    if status:
+        where.append("status = %s")
+        params.append(status)
+    if cursor:
+        where.append("(created_at, id) < (%s::timestamptz, %s::uuid)")
+        params.extend(decode_cursor(cursor))
+    sql = (_LIST_COLUMNS + (f"WHERE {' AND '.join(where)}\n" if where else "")
+           + "ORDER BY created_at DESC, id DESC\nLIMIT %s")
+    rows = conn.execute(sql, (*params, limit)).fetchall()
+    return rows, (encode_cursor(rows[-1]) if len(rows) == limit else None)
+
+
+def pending_intakes(conn, limit: int = 10) -> List[Dict[str, Any]]:
+    """Oldest pending intakes first — the render queue."""
+    return conn.execute(
+        _LIST_COLUMNS + "WHERE status = 'pending'\nORDER BY created_at, id\nLIMIT %s", (limit,)
+    ).fetchall()
+
+
+# ── Latency report ──────────────────────────────────────────────────────────
+_LATENCY = """
+SELECT day, project_type, intakes, generated, sent, sent_within_day,
+       wait_p50_s, wait_p95_s, send_p50_s, send_p95_s, total_p50_s, total_p95_s,
+       render_p50_ms, render_p95_ms
+FROM intake_latency_daily
+WHERE day > (now() AT TIME ZONE 'America/Los_Angeles')::date - %s
+ORDER BY day DESC, project_type
+"""
+
+
+def refresh_latency(conn) -> int:
+    """Bring intake_latency_daily up to date; returns the days recomputed."""
+    with conn.transaction():
+        return conn.execute("SELECT refresh_intake_latency() AS days").fetchone()["days"]
+
+
+def latency_rows(conn, days: int = 14) -> List[Dict[str, Any]]:
+    """Daily p50/p95 latency rows for the last `days` days, newest first."""
+    return conn.execute(_LATENCY, (days,)).fetchall()
+
+
+def _duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "—"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+def print_report(args: argparse.Namespace) -> None:
+    with connect() as conn:
+        if not args.no_refresh:
+            refresh_latency(conn)
+        rows = latency_rows(conn, args.days)
+
+    print(f"{'day':<10}  {'project type':<20} {'intakes':>7} {'sent<1d':>8}"
+          f"  {'wait p50/p95':>13}  {'send p50/p95':>13}  {'total p50/p95':>13}  {'render p50/p95':>14}")
+    for r in rows:
+        pair = lambda a, b: f"{_duration(a)}/{_duration(b)}"  # noqa: E731
+        render = ("—" if r["render_p50_ms"] is None
+                  else f"{r['render_p50_ms'] / 1000:.1f}/{r['render_p95_ms'] / 1000:.1f}s")
+        print(f"{r['day']:%Y-%m-%d}  {r['project_type'][:20]:<20} {r['intakes']:>7} "
+              f"{r['sent_within_day']:>4}/{r['sent']:<3}"
+              f"  {pair(r['wait_p50_s'], r['wait_p95_s']):>13}"
+              f"  {pair(r['send_p50_s'], r['send_p95_s']):>13}"
+              f"  {pair(r['total_p50_s'], r['total_p95_s']):>13}  {render:>14}")
+
+    sent   = sum(r["sent"] for r in rows)
+    on_sla = sum(r["sent_within_day"] for r in rows)
+    if sent:
+        print(f"\nSLA: {on_sla} of {sent} proposals sent within a day of intake ({on_sla / sent:.0%})")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Re-render and list proposals stored on client_intakes.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    r = sub.add_parser("render", help="Re-render a proposal from its stored config")
+    r.add_argument("intake", metavar="ID", help="client_intakes id")
+    r.add_argument("--output", metavar="PATH", help="Output PDF path (default: from the config)")
+    r.add_argument("--parallel", action="store_true",
+                   help="Lay out page groups in parallel processes (needs pypdf)")
+    r.add_argument("--force", action="store_true", help="Render even if unchanged")
+
+    ls = sub.add_parser("list", help="List intakes, newest first")
+    ls.add_argument("--status", choices=["pending", "generated", "sent", "failed", "dead"])
+    ls.add_argument("--limit", type=int, default=25, help="Rows per page (default 25)")
+    ls.add_argument("--cursor", metavar="CURSOR", help="Next-page cursor from a previous listing")
+
+    rp = sub.add_parser("report", help="p50/p95 intake → generated → sent latency per day")
+    rp.add_argument("--days", type=int, default=14, help="Days to show (default 14)")
+    rp.add_argument("--no-refresh", action="store_true",
+                    help="Skip refresh_intake_latency() and show the rollup as is")
+    return p.parse_args()
+
+
+def print_listing(args: argparse.Namespace) -> None:
+    with connect() as conn:
+        rows, next_cursor = list_intakes(conn, args.limit, args.cursor, args.status)
+    for row in rows:
+        print(f"{row['created_at']:%Y-%m-%d %H:%M}  {row['status']:<9}  {row['id']}  "
+              f"{row['client_name']}  {row['project_total'] or ''}")
+    if next_cursor:
+        print(f"\nNext page: --cursor {next_cursor}")
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "list":
+        print_listing(args)
+        return
+    if args.command == "report":
+        print_report(args)
+        return
+
+    cfg, template = load_stored(args.intake)
+    if args.output:
+        cfg.output_path = args.output
+    output = cfg.resolve_output()
+
+    print(f"Client  : {cfg.client_name}")
+    print(f"Template: {template}")
+    print(f"Output  : {output}")
+    if render_for_intake(args.intake, cfg, template, output, args.parallel, args.force):
+        print(f"Done! Saved to:\n  {output}")
+    else:
+        print("Unchanged since the last render — skipped (use --force to render anyway).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""D&C Builders — Proposal Layout Linter
+
+Checks client JSON configs against the hard limits in PROPOSAL_WRITING_GUIDE.md
+without rendering anything, so a bad config is rejected before a render is
+spent on it. Every render runs the same rules first (check_config, from
+proposal_render.render_document) except the widths, which are estimates and
+need the fonts — those only fail this CLI:
+
+  - cover scope: at most 6 items, each about 30 characters wide
+  - payment schedule: at most 22 milestones, each about 45 characters wide
+  - no milestone above 12% of the project total
+  - milestones add up to the project total
+
+Widths are not character counts: each string is measured with Raleway's own
+glyph advances (text_metrics.py) and compared with the width of that many
+average Raleway characters, so "Illinois" and "MMMMMMMM" are judged by the
+space they actually take. Lines must also physically fit on one line at the
+template's font size. Needs fontTools and the Raleway TTFs in fonts/ (see
+text_metrics.py); without them the width checks are skipped with a warning
+and the other rules still run.
+
+Run:
+    python3 lint_proposals.py                              # every clients/*.json
+    python3 lint_proposals.py clients/example_restrepo.json
+
+Exits with status 1 when any config breaks a rule.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import List
+
+from proposal_render import load_template, pick_template
+from text_metrics import FontMetricsError, advances, char_width, fits
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# Limits from PROPOSAL_WRITING_GUIDE.md
+MAX_COVER_ITEMS     = 6
+COVER_ITEM_CHARS    = 30
+MAX_MILESTONES      = 22
+MILESTONE_CHARS     = 45
+MAX_MILESTONE_SHARE = 0.12
+WIDTH_SLACK         = 1.10  # "about N characters" — allow 10% over
+
+
+class ConfigRejected(ValueError):
+    """A config breaks the writing guide's hard limits; rendering it would be wasted."""
+
+
+def _money(value: str) -> float:
+    return float(value.strip().lstrip("$").replace(",", ""))
+
+
+# ── Rules ─────────────────────────────────────────────────────────────────────
+def lint_config(cfg, template: str = "standard", widths: bool = True) -> List[str]:
+    """Rule violations for one ProposalConfig, as 'field: message' lines.
+
+    widths=False skips the checks that need Raleway's metrics.
+    """
+    issues: List[str] = []
+
+    if len(cfg.scope_items) > MAX_COVER_ITEMS:
+        issues.append(f"scope_items: {len(cfg.scope_items)} cover items (max {MAX_COVER_ITEMS})")
+    for i, item in enumerate(cfg.scope_items if widths else ()):
+        width = char_width(item)
+        if width > COVER_ITEM_CHARS * WIDTH_SLACK:
+            issues.append(f"scope_items[{i}]: {item!r} is {width:.0f} characters wide "
+                          f"(max ~{COVER_ITEM_CHARS})")
+        elif not fits(item, "cover-item", template):
+            issues.append(f"scope_items[{i}]: {item!r} does not fit on one cover line")
+
+    if len(cfg.payments) > MAX_MILESTONES:
+        issues.append(f"payments: {len(cfg.payments)} milestones (max {MAX_MILESTONES}) "
+                      f"— consolidate similar phases")
+    for i, (desc, amount) in enumerate(cfg.payments if widths else ()):
+        width = char_width(desc)
+        if width > MILESTONE_CHARS * WIDTH_SLACK:
+            issues.append(f"payments[{i}]: {desc!r} is {width:.0f} characters wide "
+                          f"(max ~{MILESTONE_CHARS})")
+        elif not fits(f"{desc}: {amount}", "pay-item", template):
+            issues.append(f"payments[{i}]: {desc!r} does not fit on one payment line")
+
+    try:
+        total = _money(cfg.project_total)
+    except ValueError:
+        issues.append(f"project_total: {cfg.project_total!r} is not a dollar amount")
+        return issues
+
+    paid = 0.0
+    for i, (desc, amount) in enumerate(cfg.payments):
+        try:
+            value = _money(amount)
+        except ValueError:
+            issues.append(f"payments[{i}]: {amount!r} is not a dollar amount")
+            continue
+        paid += value
+        if total and value > total * MAX_MILESTONE_SHARE:
+            issues.append(f"payments[{i}]: {desc!r} is {amount} = {value / total:.1%} of the total "
+                          f"(max {MAX_MILESTONE_SHARE:.0%}) — split into start + inspection")
+    if cfg.payments and round(paid, 2) != round(total, 2):
+        issues.append(f"payments: milestones add up to ${paid:,.0f}, "
+                      f"project total is {cfg.project_total}")
+    return issues
+
+
+def check_config(cfg, template: str = "standard") -> None:
+    """Raise ConfigRejected when `cfg` breaks a rule other than the widths."""
+    issues = lint_config(cfg, template, widths=False)
+    if issues:
+        raise ConfigRejected("Config breaks the writing guide's limits — " + "; ".join(issues))
+
+
+def lint_file(path: str, widths: bool = True) -> List[str]:
+    """Rule violations for one client JSON file, prefixed with its path."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        template = pick_template(data)
+        cfg = load_template(template).ProposalConfig.from_json(path)
+    except (OSError, ValueError, TypeError) as exc:
+        return [f"{path}: cannot load config: {exc}"]
+    return [f"{path}: {issue}" for issue in lint_config(cfg, template, widths)]
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Check client configs against the writing guide's layout rules.")
+    p.add_argument("paths", nargs="*", metavar="PATH",
+                   help="Client JSON files or folders (default: clients/)")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    files: List[str] = []
+    for path in args.paths or [os.path.join(BASE, "clients")]:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+
+    # Without fontTools or the TTFs, check everything but the widths
+    try:
+        advances(400)
+        widths = True
+    except FontMetricsError as exc:
+        print(f"warning: {exc}\nwarning: width checks skipped", file=sys.stderr)
+        widths = False
+
+    started = time.perf_counter()
+    issues = [issue for path in files for issue in lint_file(path, widths)]
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for issue in issues:
+        print(issue)
+    bad = len({issue.split(": ", 1)[0] for issue in issues})
+    print(f"{len(files)} config(s) checked in {elapsed:.0f} ms — "
+          f"{bad} with problems, {len(issues)} issue(s)")
+    sys.exit(1 if issues else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""D&C Builders — materials price book
+
+The intake form's Materials tab (flooring, countertop, cabinets, exterior,
+roofing, windows) is free text: "Quartz (Prefab)", "quartz", "Clay tiles".
+pricing/materials.csv names each material once per kind, with the other
+ways reps write it, its allowance (material only, per unit) and the spec
+wording proposals use. The estimator, the section library and the
+allowances section all resolve a choice through this book.
+
+Lookups go through a hash index on normalized names and aliases, so an
+exact hit is one dict lookup. A choice that misses is matched fuzzily —
+the closest name by difflib ("Engineerd hardwood"), else the longest name
+whose words it contains ("Custom Shaker in white oak") — and the answer is
+memoized, so a batch run pays for each distinct spelling once.
+
+The CSV is compiled to .cache/material_book.pickle the first time it is
+read, and recompiled whenever it changes; load_materials() loads the
+compiled book once per process.
+"""
+import csv
+import difflib
+import os
+import pickle
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from proposal_sections import CACHE_DIR
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+MATERIALS = os.path.join(BASE, "pricing", "materials.csv")
+COMPILED  = os.path.join(CACHE_DIR, "material_book.pickle")
+FORMAT    = 1       # bump when the compiled layout changes
+CUTOFF    = 0.8     # difflib similarity a fuzzy match needs
+UNITS     = ("", "sf", "each")
+
+_WORD  = re.compile(r"[a-z0-9]+")
+_BLANK = ("", "tbd")
+
+
+def normalize(text: Any) -> str:
+    """'Quartz (Prefab)' → 'quartz prefab'; 'LVP/SPC' → 'lvp spc'."""
+    return " ".join(_WORD.findall(str(text or "").lower().replace("&", " and ")))
+
+
+@dataclass(frozen=True)
+class Material:
+    kind:      str
+    name:      str     # as the form writes it
+    unit:      str     # what `allowance` is per: "sf", "each", or "" for none
+    allowance: float   # material-only allowance per unit, $ (0 = none)
+    spec:      str     # wording for proposal text
+    default:   bool    # what a blank or "TBD" choice means
+
+
+class MaterialBook:
+    """Materials by kind, indexed on normalized names and aliases."""
+
+    def __init__(self, materials: List[Material], index: Dict[Tuple[str, str], int]):
+        self.materials = materials
+        self.index = index
+        self.defaults = {m.kind: m for m in materials if m.default}
+        self.kinds = tuple(dict.fromkeys(m.kind for m in materials))
+        self._fuzzy: Dict[Tuple[str, str], Optional[Material]] = {}
+
+    def get(self, kind: str, text: Any) -> Optional[Material]:
+        """Exact match on the name or an alias (after normalizing)."""
+        i = self.index.get((kind, normalize(text)))
+        return None if i is None else self.materials[i]
+
+    def match(self, kind: str, text: Any) -> Optional[Material]:
+        """Exact match, else the closest fuzzy match, else None."""
+        key = (kind, normalize(text))
+        i = self.index.get(key)
+        if i is not None:
+            return self.materials[i]
+        if key not in self._fuzzy:
+            self._fuzzy[key] = self._closest(*key)
+        return self._fuzzy[key]
+
+    def resolve(self, kind: str, text: Any) -> Optional[Material]:
+        """Like match(), but a blank or "TBD" choice is the kind's default."""
+        if normalize(text) in _BLANK:
+            return self.defaults.get(kind)
+        return self.match(kind, text)
+
+    def canonical(self, materials: Mapping[str, Any]) -> Dict[str, Any]:
+        """`materials` with every recognized choice spelled as the book names it."""
+        out = dict(materials)
+        for kind, value in materials.items():
+            found = None if normalize(value) in _BLANK else self.match(kind, value)
+            if found:
+                out[kind] = found.name
+        return out
+
+    def _closest(self, kind: str, norm: str) -> Optional[Material]:
+        if not norm:
+            return None
+        names = [name for k, name in self.index if k == kind]
+        close = difflib.get_close_matches(norm, names, n=1, cutoff=CUTOFF)
+        if close:  # a misspelling
+            return self.materials[self.index[kind, close[0]]]
+        words = set(norm.split())
+        contained = [name for name in names if set(name.split()) <= words]
+        if contained:  # a name with extra words around it
+            return self.materials[self.index[kind, max(contained, key=len)]]
+        return None
+
+
+# ── Loading ─────────────────────────────────────────────────────────────────
+def compile_book(path: str = MATERIALS) -> MaterialBook:
+    """Parse and validate the CSV."""
+    materials: List[Material] = []
+    index: Dict[Tuple[str, str], int] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for n, row in enumerate(csv.DictReader(f), 2):
+            where = f"{path}:{n}"
+            kind, unit = row["kind"].strip(), (row["unit"] or "").strip()
+            if not kind or not row["name"].strip():
+                raise ValueError(f"{where}: kind and name are required")
+            if unit not in UNITS:
+                raise ValueError(f"{where}: unknown unit {unit!r} (expected sf or each)")
+            try:
+                allowance = float(row["allowance"] or 0)
+            except ValueError:
+                raise ValueError(f"{where}: allowance must be a number") from None
+            if allowance and not unit:
+                raise ValueError(f"{where}: an allowance needs a unit")
+            default = (row["default"] or "").strip() in ("1", "yes", "true")
+            if default and any(m.kind == kind and m.default for m in materials):
+                raise ValueError(f"{where}: second default for {kind}")
+            for name in [row["name"], *(row["aliases"] or "").split("|")]:
+                key = (kind, normalize(name))
+                if not key[1]:
+                    continue
+                if key in index and index[key] != len(materials):
+                    other = materials[index[key]].name
+                    raise ValueError(f"{where}: {name.strip()!r} already names {kind} {other!r}")
+                index[key] = len(materials)
+            materials.append(Material(kind, row["name"].strip(), unit, allowance,
+                                      (row["spec"] or "").strip() or row["name"].strip(), default))
+    return MaterialBook(materials, index)
+
+
+def _stamp(path: str) -> Tuple[int, str, int, int]:
+    st = os.stat(path)
+    return FORMAT, os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=4)
+def load_materials(path: str = MATERIALS, compiled: str = COMPILED) -> MaterialBook:
+    """The book for `path`, from its compiled copy when that is current."""
+    from proposal_render import write_atomic
+
+    stamp = _stamp(path)
+    try:
+        with open(compiled, "rb") as f:
+            saved_stamp, materials, index = pickle.load(f)
+        if saved_stamp == stamp:
+            return MaterialBook(materials, index)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+        pass  # missing, stale or from an older layout: recompile
+
+    book = compile_book(path)
+    try:
+        os.makedirs(os.path.dirname(compiled), exist_ok=True)
+        write_atomic(compiled, pickle.dumps((stamp, book.materials, book.index),
+                                            pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # read-only checkout: the CSV is parsed again next process
+    return book
@@ -0,0 +1,48 @@
+-- 001 — Store the rendered proposal config on its intake
+-- Lets any machine re-render a proposal from the database (intake_db.py)
+-- instead of regenerating clients/<name>.json. Safe to run more than once.
+
+ALTER TABLE client_intakes
+  ADD COLUMN IF NOT EXISTS rendered_config   jsonb,        -- final ProposalConfig (no output_path)
+  ADD COLUMN IF NOT EXISTS config_hash       text,         -- sha256 of rendered_config
+  ADD COLUMN IF NOT EXISTS template          text,         -- "standard" | "full_scope"
+  ADD COLUMN IF NOT EXISTS template_version  text,         -- source hash of the template used
+  ADD COLUMN IF NOT EXISTS rendered_at       timestamptz;  -- last successful render
+
+-- New columns go at the end so CREATE OR REPLACE keeps the existing ones
+CREATE OR REPLACE VIEW latest_intakes AS
+SELECT
+  id,
+  created_at,
+  first_name || ' & ' || last_name                                    AS client_name,
+  email,
+  phone,
+  street_address || ', ' || city || ', ' || state || ' ' || zip       AS full_address,
+  proposal_date,
+  project_total,
+  scope_items,
+  payments,
+  design_toggles,
+  construction_toggles,
+  materials,
+  project_type,
+  stories,
+  area_sf,
+  bedroom_count,
+  bathroom_count,
+  hvac_type,
+  construction_notes,
+  nc_notes,
+  special_requirements,
+  design_preferences,
+  desired_start_date,
+  referred_by,
+  additional_notes,
+  status,
+  pdf_path,
+  template,
+  template_version,
+  config_hash,
+  rendered_at
+FROM client_intakes
+ORDER BY created_at DESC;
@@ -0,0 +1,15 @@
+-- 002 — Indexes for the render queue and intake listings
+-- Without these every queue poll and every latest_intakes page scans the
+-- whole table. Safe to run more than once.
+
+-- Queue polls: oldest pending intakes first (intake_db.pending_intakes).
+-- Partial, so it stays as small as the backlog however large history grows.
+CREATE INDEX IF NOT EXISTS client_intakes_pending_idx
+  ON client_intakes (created_at, id)
+  WHERE status = 'pending';
+
+-- Listings, newest first, paged by (created_at, id) keyset cursors
+-- (intake_db.list_intakes). Both columns descend so the row comparison
+-- (created_at, id) < (cursor) walks the index in order.
+CREATE INDEX IF NOT EXISTS client_intakes_created_idx
+  ON client_intakes (created_at DESC, id DESC);
@@ -0,0 +1,123 @@
+-- 003 — Pipeline timing and the daily latency rollup
+-- When each intake was generated and sent, how long its render took, and
+-- p50/p95 intake → generated → sent latency per day and project type
+-- (python3 intake_db.py report). Safe to run more than once.
+
+ALTER TABLE client_intakes
+  ADD COLUMN IF NOT EXISTS generated_at  timestamptz,  -- first time status reached 'generated'
+  ADD COLUMN IF NOT EXISTS sent_at       timestamptz,  -- first time status reached 'sent'
+  ADD COLUMN IF NOT EXISTS render_ms     integer,      -- last render, wall clock
+  ADD COLUMN IF NOT EXISTS page_count    integer;      -- last render
+
+-- Best available history: the last render stands in for the first
+UPDATE client_intakes SET generated_at = rendered_at
+WHERE generated_at IS NULL AND rendered_at IS NOT NULL;
+
+-- Stamp status changes wherever they come from (renderer, dashboard, SQL editor)
+CREATE OR REPLACE FUNCTION stamp_intake_status() RETURNS trigger AS $$
+BEGIN
+  IF NEW.status IN ('generated', 'sent') AND NEW.generated_at IS NULL THEN
+    NEW.generated_at := now();
+  END IF;
+  IF NEW.status = 'sent' AND NEW.sent_at IS NULL THEN
+    NEW.sent_at := now();
+  END IF;
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS client_intakes_stamp_status ON client_intakes;
+CREATE TRIGGER client_intakes_stamp_status
+  BEFORE INSERT OR UPDATE OF status ON client_intakes
+  FOR EACH ROW EXECUTE FUNCTION stamp_intake_status();
+
+-- Finding what changed since the last refresh
+CREATE INDEX IF NOT EXISTS client_intakes_generated_at_idx
+  ON client_intakes (generated_at) WHERE generated_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS client_intakes_sent_at_idx
+  ON client_intakes (sent_at) WHERE sent_at IS NOT NULL;
+
+-- ─────────────────────────────────────────────────────────────
+-- Rollup: one row per intake day (Pacific time) and project type.
+-- A materialized view can only be refreshed whole, so this is a table
+-- that refresh_intake_latency() rewrites for the days touched since its
+-- last run — cheap enough to run every few minutes.
+-- ─────────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS intake_latency_daily (
+  day              date              NOT NULL,
+  project_type     text              NOT NULL,
+  intakes          integer           NOT NULL,
+  generated        integer           NOT NULL,
+  sent             integer           NOT NULL,
+  sent_within_day  integer           NOT NULL,   -- SLA: sent ≤ 24h after intake
+  wait_p50_s       double precision,             -- intake → generated
+  wait_p95_s       double precision,
+  send_p50_s       double precision,             -- generated → sent
+  send_p95_s       double precision,
+  total_p50_s      double precision,             -- intake → sent
+  total_p95_s      double precision,
+  render_p50_ms    double precision,
+  render_p95_ms    double precision,
+  refreshed_at     timestamptz       NOT NULL DEFAULT now(),
+  PRIMARY KEY (day, project_type)
+);
+
+CREATE TABLE IF NOT EXISTS intake_latency_state (
+  id            boolean      PRIMARY KEY DEFAULT true CHECK (id),
+  refreshed_to  timestamptz  NOT NULL DEFAULT '-infinity'
+);
+INSERT INTO intake_latency_state DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+-- Returns the number of days recomputed. Rescans a 15 minute overlap so
+-- rows stamped by transactions still open at the last refresh are not lost.
+CREATE OR REPLACE FUNCTION refresh_intake_latency() RETURNS integer AS $$
+DECLARE
+  since    timestamptz;
+  touched  date[];
+BEGIN
+  SELECT refreshed_to - interval '15 minutes' INTO since
+  FROM intake_latency_state FOR UPDATE;
+
+  SELECT coalesce(array_agg(DISTINCT (created_at AT TIME ZONE 'America/Los_Angeles')::date), '{}')
+  INTO touched
+  FROM client_intakes
+  WHERE created_at >= since OR generated_at >= since OR sent_at >= since;
+
+  DELETE FROM intake_latency_daily WHERE day = ANY (touched);
+
+  INSERT INTO intake_latency_daily
+  SELECT t.day,
+         coalesce(nullif(i.project_type, ''), 'Unspecified'),
+         count(*),
+         count(i.generated_at),
+         count(i.sent_at),
+         count(*) FILTER (WHERE i.sent_at - i.created_at <= interval '1 day'),
+         percentile_cont(0.50) WITHIN GROUP (ORDER BY extract(epoch FROM i.generated_at - i.created_at)),
+         percentile_cont(0.95) WITHIN GROUP (ORDER BY extract(epoch FROM i.generated_at - i.created_at)),
+         percentile_cont(0.50) WITHIN GROUP (ORDER BY extract(epoch FROM i.sent_at - i.generated_at)),
+         percentile_cont(0.95) WITHIN GROUP (ORDER BY extract(epoch FROM i.sent_at - i.generated_at)),
+         percentile_cont(0.50) WITHIN GROUP (ORDER BY extract(epoch FROM i.sent_at - i.created_at)),
+         percentile_cont(0.95) WITHIN GROUP (ORDER BY extract(epoch FROM i.sent_at - i.created_at)),
+         percentile_cont(0.50) WITHIN GROUP (ORDER BY i.render_ms),
+         percentile_cont(0.95) WITHIN GROUP (ORDER BY i.render_ms),
+         now()
+  FROM unnest(touched) AS t(day)
+  JOIN client_intakes i
+    ON i.created_at >= t.day::timestamp AT TIME ZONE 'America/Los_Angeles'
+   AND i.created_at <  (t.day + 1)::timestamp AT TIME ZONE 'America/Los_Angeles'
+  GROUP BY 1, 2;
+
+  UPDATE intake_latency_state SET refreshed_to = now();
+  RETURN cardinality(touched);
+END
+$$ LANGUAGE plpgsql;
+
+-- Optional, with the pg_cron extension enabled:
+--   SELECT cron.schedule('intake-latency', '*/10 * * * *', 'SELECT refresh_intake_latency()');
+
+ALTER TABLE intake_latency_daily ENABLE ROW LEVEL SECURITY;
+ALTER TABLE intake_latency_state ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "allow_auth_select" ON intake_latency_daily;
+CREATE POLICY "allow_auth_select"
+  ON intake_latency_daily FOR SELECT TO authenticated USING (true);
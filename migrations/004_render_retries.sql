@@ -0,0 +1,19 @@
+-- 004 — Retries, backoff and dead-lettering for queued renders
+-- A failed render moves to 'failed' with its error and a backoff time;
+-- after too many attempts it moves to 'dead' until re-driven
+-- (python3 render_jobs.py redrive). Safe to run more than once.
+
+ALTER TABLE client_intakes
+  DROP CONSTRAINT IF EXISTS client_intakes_status_check,
+  ADD CONSTRAINT client_intakes_status_check
+    CHECK (status IN ('pending', 'generated', 'sent', 'failed', 'dead'));
+
+ALTER TABLE client_intakes
+  ADD COLUMN IF NOT EXISTS attempts         integer NOT NULL DEFAULT 0,  -- renders started
+  ADD COLUMN IF NOT EXISTS last_error       text,                        -- most recent failure
+  ADD COLUMN IF NOT EXISTS next_attempt_at  timestamptz;                 -- backoff / claim lease
+
+-- The render queue: claimable rows in due order (render_jobs.claim)
+CREATE INDEX IF NOT EXISTS client_intakes_queue_idx
+  ON client_intakes ((coalesce(next_attempt_at, created_at)), id)
+  WHERE status IN ('pending', 'failed') AND rendered_config IS NOT NULL;
@@ -0,0 +1,20 @@
+-- 005 — Priority classes and per-rep fairness for the render queue
+-- A rep waiting live with a client ('interactive') goes ahead of routine
+-- intakes ('normal'), which go ahead of re-brand batches ('bulk'). Within a
+-- class, render_jobs.claim shares workers across reps by pages rendered.
+-- Safe to run more than once.
+
+ALTER TABLE client_intakes
+  ADD COLUMN IF NOT EXISTS priority      text NOT NULL DEFAULT 'normal',
+  ADD COLUMN IF NOT EXISTS requested_by  text;   -- rep who queued the render
+
+ALTER TABLE client_intakes
+  DROP CONSTRAINT IF EXISTS client_intakes_priority_check,
+  ADD CONSTRAINT client_intakes_priority_check
+    CHECK (priority IN ('interactive', 'normal', 'bulk'));
+
+-- Claims filter by class first, so the class leads the queue index
+DROP INDEX IF EXISTS client_intakes_queue_idx;
+CREATE INDEX IF NOT EXISTS client_intakes_queue_class_idx
+  ON client_intakes (priority, (coalesce(next_attempt_at, created_at)), id)
+  WHERE status IN ('pending', 'failed') AND rendered_config IS NOT NULL;
@@ -0,0 +1,18 @@
+-- 006 — Emailing generated proposals (proposal_mailer.py)
+-- A rep approves a generated proposal for sending (send_requested_at); the
+-- mailer emails the PDF and moves the intake to 'sent', which stamps
+-- sent_at (migrations/003). A failed send keeps the intake 'generated',
+-- records the error and backs off; after too many attempts it is left for
+-- a rep to look at. Safe to run more than once.
+
+ALTER TABLE client_intakes
+  ADD COLUMN IF NOT EXISTS send_requested_at      timestamptz,                   -- approved to email
+  ADD COLUMN IF NOT EXISTS email_attempts         integer NOT NULL DEFAULT 0,    -- sends started
+  ADD COLUMN IF NOT EXISTS email_error            text,                          -- most recent failure
+  ADD COLUMN IF NOT EXISTS email_next_attempt_at  timestamptz,                   -- backoff / claim lease
+  ADD COLUMN IF NOT EXISTS email_message_id       text;                          -- Message-ID sent
+
+-- The outbox: approved, unsent proposals in due order (proposal_mailer.claim)
+CREATE INDEX IF NOT EXISTS client_intakes_outbox_idx
+  ON client_intakes ((coalesce(email_next_attempt_at, send_requested_at)), id)
+  WHERE status = 'generated' AND send_requested_at IS NOT NULL;
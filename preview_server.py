@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""D&C Builders — HTML Live Preview Server
+
+Serves the HTML that build_html() produces, styled as print sheets on screen,
+without running any PDF layout. Each page polls for changes and reloads as
+soon as its clients/*.json file is saved, so iterating on scope text costs
+milliseconds instead of a full WeasyPrint render.
+
+Sections are shown unclipped: anything taller than its sheet is what the PDF
+renderer continues onto an extra page. Gallery images are served from the
+prepared-image cache (proposal_images.py) under /images/.
+
+Run:
+    python3 preview_server.py                  # http://localhost:8030
+    python3 preview_server.py --port 9000 --clients clients
+"""
+import argparse
+import html as html_lib
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlparse
+
+from proposal_images import IMAGE_DIR
+from proposal_render import assemble_html, load_template, pick_template
+from proposal_sections import number_toc
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# Print emulation: sheets on a gray desk, overflow visible instead of clipped
+SCREEN_CSS = """<style>
+@media screen {
+  html { background: #5f6368; }
+  body { padding: 0.3in 0; }
+  .page { margin: 0 auto 0.3in auto; box-shadow: 0 2px 14px rgba(0, 0, 0, 0.45); }
+  .page, .content, .cover, .toc-page, .thankyou {
+    height: auto !important;
+    min-height: 11in;
+    overflow: visible !important;
+  }
+}
+</style>
+"""
+
+RELOAD_JS = """<script>
+(function () {
+  var seen = null;
+  setInterval(function () {
+    fetch("/__version?name=%s").then(function (r) { return r.text(); }).then(function (v) {
+      if (seen === null) { seen = v; } else if (v !== seen) { location.reload(); }
+    }).catch(function () {});
+  }, 400);
+})();
+</script>
+"""
+
+
+def build_preview(path: str, template: str = "") -> str:
+    """Preview HTML for one client JSON file."""
+    with open(path) as f:
+        data = json.load(f)
+    module = load_template(template or pick_template(data))
+    cfg = module.ProposalConfig.from_json(path)
+    parts = number_toc(module.build_parts(cfg, measure=False))
+    head = module.build_head().replace("</head>", SCREEN_CSS + "</head>")
+    return assemble_html(head, parts).replace(Path(IMAGE_DIR).resolve().as_uri() + "/", "/images/")
+
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    clients_dir = os.path.join(BASE, "clients")
+
+    def _send(self, status: int, body: str, content_type: str = "text/html",
+              started: float = 0.0) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        if started:
+            self.send_header("Server-Timing", f"build;dur={(time.perf_counter() - started) * 1000:.1f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _client_path(self, name: str) -> str:
+        return os.path.join(self.clients_dir, os.path.basename(name))
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/":
+            names = sorted(n for n in os.listdir(self.clients_dir) if n.endswith(".json"))
+            links = "\n".join(
+                f'<li><a href="/p/{quote(n)}">{html_lib.escape(n)}</a></li>' for n in names
+            )
+            self._send(200, f"<!DOCTYPE html><title>Proposal previews</title><ul>{links}</ul>")
+            return
+
+        if url.path == "/__version":
+            path = self._client_path(query.get("name", [""])[0])
+            version = str(os.stat(path).st_mtime_ns) if os.path.isfile(path) else "missing"
+            self._send(200, version, "text/plain")
+            return
+
+        if url.path.startswith("/images/"):
+            path = os.path.join(IMAGE_DIR, os.path.basename(url.path))
+            if not os.path.isfile(path):
+                self._send(404, "Not found", "text/plain")
+                return
+            with open(path, "rb") as f:
+                data = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "max-age=86400")  # names are content hashes
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        if url.path.startswith("/p/"):
+            name = os.path.basename(url.path[len("/p/"):])
+            path = self._client_path(name)
+            if not name.endswith(".json") or not os.path.isfile(path):
+                self._send(404, "Not found", "text/plain")
+                return
+            reload_js = RELOAD_JS % quote(name)
+            started = time.perf_counter()
+            try:
+                page = build_preview(path, query.get("template", [""])[0])
+            except Exception as exc:  # show the error, keep polling for a fix
+                msg = html_lib.escape(f"{type(exc).__name__}: {exc}")
+                self._send(500, f"<!DOCTYPE html><pre>{msg}</pre>{reload_js}")
+                return
+            self._send(200, page.replace("</body>", reload_js + "</body>"), started=started)
+            return
+
+        self._send(404, "Not found", "text/plain")
+
+    def log_message(self, fmt: str, *args) -> None:
+        if not self.path.startswith("/__version"):
+            super().log_message(fmt, *args)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Serve live HTML previews of client proposals.")
+    p.add_argument("--port",    type=int, default=8030, help="Port (default 8030)")
+    p.add_argument("--clients", metavar="DIR", default=PreviewHandler.clients_dir,
+                   help="Folder of client JSON files")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    PreviewHandler.clients_dir = os.path.abspath(args.clients)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), PreviewHandler)
+    print(f"Previewing {PreviewHandler.clients_dir}")
+    print(f"Open http://localhost:{args.port}/  (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""D&C Builders — mood board and project photo images
+
+Client photos and mood-board images arrive as phone JPEGs and PNG exports
+of several megabytes each. Embedded as-is they would make write_pdf()
+re-compress every pixel and the PDF tens of megabytes, so before layout
+each image is prepared once:
+
+  - decoded in a thread pool (Pillow releases the GIL while decoding and
+    resampling), using JPEG draft mode to decode at a reduced scale
+  - turned upright (EXIF orientation) and downsampled to fit its gallery
+    box at PRINT_DPI — no more pixels than the printed page can show
+  - saved as a baseline JPEG, with any transparency flattened onto white.
+    WeasyPrint copies JPEG data into the PDF untouched, whereas WebP or PNG
+    would be decoded and re-compressed at write time
+
+Results live under .cache/images/, named by a hash of the source bytes and
+the output settings, so a photo is processed once however many proposals
+and re-renders use it.
+
+A config lists images as paths (relative to this folder) or [path,
+caption] pairs:
+
+  "mood_board":     ["clients/photos/martinez/board1.png", ...]
+  "project_photos": [["clients/photos/martinez/front.jpg", "Front elevation"], ...]
+
+The Mood Board section is left out when design_toggles.mood_boards is off.
+
+    pip3 install pillow
+
+Run (prepare ahead of a batch, and see what each image costs):
+    python3 proposal_images.py clients/test_martinez_full_scope.json
+    python3 proposal_images.py clients/photos/martinez/*.jpg
+"""
+import argparse
+import hashlib
+import html as html_lib
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import render_metrics
+from proposal_sections import CACHE_DIR
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = os.path.join(CACHE_DIR, "images")
+
+PIPELINE_VERSION = 1     # bump when prepared output changes
+PRINT_DPI        = 200
+JPEG_QUALITY     = 82
+IMAGE_THREADS    = 8
+
+# Gallery grid inside the 7.4in content box: two 3.6in columns, 0.2in apart
+COLUMNS = 2
+BOX     = (3.6, 2.7)     # inches, one cell
+GAP     = 0.2
+
+GALLERY_CSS = f"""
+.gallery {{
+  display: flex;
+  gap: {GAP}in;
+  margin: 0.12in 0;
+}}
+
+.gallery figure {{
+  width: {BOX[0]}in;
+}}
+
+.gallery .frame {{
+  width: {BOX[0]}in;
+  height: {BOX[1]}in;
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  background: #f4f4f4;
+}}
+
+.gallery figcaption {{
+  font-size: 9pt;
+  margin-top: 0.05in;
+}}
+"""
+
+
+class ImageError(ValueError):
+    """An image could not be found, read or prepared."""
+
+
+@dataclass(frozen=True)
+class Picture:
+    source:  str    # as given in the config
+    path:    str    # prepared JPEG under IMAGE_DIR
+    caption: str
+    width:   int    # pixels
+    height:  int
+    dpi:     int
+
+
+# ── Preparation ─────────────────────────────────────────────────────────────
+_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+def resolve(source: str) -> str:
+    path = source if os.path.isabs(source) else os.path.join(BASE, source)
+    if not os.path.isfile(path):
+        raise ImageError(f"Image not found: {source}")
+    return path
+
+
+def source_digest(path: str) -> str:
+    """SHA-256 of the file, remembered per (path, mtime, size) for the process."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        _digests[key] = h.hexdigest()
+    return _digests[key]
+
+
+def box_pixels(box: Tuple[float, float] = BOX, dpi: int = PRINT_DPI) -> Tuple[int, int]:
+    return round(box[0] * dpi), round(box[1] * dpi)
+
+
+def _prepare(source: str, size: Tuple[int, int], quality: int) -> Tuple[str, int, int]:
+    """(prepared path, width, height) for one source image."""
+    from proposal_render import write_atomic
+
+    path = resolve(source)
+    name = f"{source_digest(path)[:32]}-{size[0]}x{size[1]}-q{quality}-v{PIPELINE_VERSION}.jpg"
+    out = os.path.join(IMAGE_DIR, name)
+    if os.path.exists(out):
+        from PIL import Image
+
+        render_metrics.cache("images", True)
+        with Image.open(out) as im:  # reads the header only
+            return (out, *im.size)
+    render_metrics.cache("images", False)
+
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as im:
+            im.draft("RGB", size)  # JPEG: decode at 1/2, 1/4 or 1/8 scale
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            if im.mode in ("RGBA", "LA", "P"):
+                im = im.convert("RGBA")
+                flat = Image.new("RGB", im.size, "white")
+                flat.paste(im, mask=im.getchannel("A"))
+                im = flat
+            elif im.mode != "RGB":
+                im = im.convert("RGB")
+            buf = io.BytesIO()
+            im.save(buf, "JPEG", quality=quality, optimize=True)
+    except (UnidentifiedImageError, OSError) as exc:
+        raise ImageError(f"Can't read image {source}: {exc}") from exc
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    write_atomic(out, buf.getvalue())
+    return (out, *im.size)
+
+
+def _entry(item: Any) -> Tuple[str, str]:
+    if isinstance(item, str):
+        return item, ""
+    if isinstance(item, (list, tuple)) and 1 <= len(item) <= 2:
+        return str(item[0]), str(item[1]) if len(item) > 1 else ""
+    raise ImageError(f"Expected an image path or [path, caption], got {item!r}")
+
+
+def prepare(items: Sequence[Any], box: Tuple[float, float] = BOX, dpi: int = PRINT_DPI,
+            quality: int = JPEG_QUALITY, threads: int = IMAGE_THREADS) -> List[Picture]:
+    """Prepared images for config entries, in order (cached ones are only stat'ed)."""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        raise ImageError("Pillow not installed. Run: pip3 install pillow") from None
+
+    entries = [_entry(item) for item in items]
+    sources = list(dict.fromkeys(source for source, _ in entries))  # each file once
+    if not sources:
+        return []
+    size = box_pixels(box, dpi)
+    with ThreadPoolExecutor(max_workers=min(threads, len(sources))) as pool:
+        prepared = dict(zip(sources, pool.map(lambda src: _prepare(src, size, quality), sources)))
+    pictures = []
+    for source, caption in entries:
+        path, width, height = prepared[source]
+        pictures.append(Picture(source, path, caption, width, height, dpi))
+    return pictures
+
+
+# ── Markup ──────────────────────────────────────────────────────────────────
+def _figure(pic: Picture) -> str:
+    caption = f"<figcaption>{html_lib.escape(pic.caption)}</figcaption>" if pic.caption else ""
+    alt = html_lib.escape(pic.caption or os.path.basename(pic.source), quote=True)
+    uri = Path(pic.path).resolve().as_uri()
+    size = f"width: {pic.width / pic.dpi:.3f}in; height: {pic.height / pic.dpi:.3f}in"
+    return (f'<figure><div class="frame"><img src="{html_lib.escape(uri, quote=True)}" '
+            f'alt="{alt}" style="{size}"></div>{caption}</figure>')
+
+
+def gallery_html(items: Sequence[Any]) -> str:
+    """Section body: one grid row per block, so long galleries continue
+    onto further pages (proposal_sections.paginate)."""
+    pictures = prepare(items)
+    rows = [pictures[i:i + COLUMNS] for i in range(0, len(pictures), COLUMNS)]
+    return "\n" + "\n\n".join(
+        '    <div class="gallery">' + "".join(_figure(p) for p in row) + "</div>" for row in rows)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Prepare proposal images ahead of rendering.")
+    p.add_argument("paths", nargs="+", metavar="PATH", help="Client JSON configs or image files")
+    p.add_argument("--dpi", type=int, default=PRINT_DPI, help=f"Print resolution (default {PRINT_DPI})")
+    p.add_argument("--quality", type=int, default=JPEG_QUALITY,
+                   help=f"JPEG quality (default {JPEG_QUALITY})")
+    return p.parse_args()
+
+
+def _config_images(path: str) -> List[Any]:
+    with open(path) as f:
+        data = json.load(f)
+    return list(data.get("mood_board") or []) + list(data.get("project_photos") or [])
+
+
+def main() -> None:
+    args = parse_args()
+    items: List[Any] = []
+    for path in args.paths:
+        items.extend(_config_images(path) if path.endswith(".json") else [os.path.abspath(path)])
+    try:
+        pictures = prepare(items, dpi=args.dpi, quality=args.quality)
+    except ImageError as exc:
+        sys.exit(str(exc))
+
+    before = after = 0
+    for pic in pictures:
+        src, out = os.path.getsize(resolve(pic.source)), os.path.getsize(pic.path)
+        before, after = before + src, after + out
+        print(f"  {os.path.relpath(resolve(pic.source), BASE):<50} {src / 1024:>8.0f} KB → "
+              f"{out / 1024:>6.0f} KB  {pic.width}×{pic.height}")
+    print(f"{len(pictures)} image(s): {before / 1024 / 1024:.1f} MB → {after / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
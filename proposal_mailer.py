@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""D&C Builders — email generated proposals
+
+Sends approved proposals to their clients and marks the intakes 'sent'
+(the status trigger stamps sent_at, so the latency report's sent columns
+finally fill in). A rep approves what goes out — `approve <id>` or
+`approve --all` for every generated proposal — and `send` delivers the
+outbox, e.g. from an end-of-day cron.
+
+  - one pool of SMTP connections, opened lazily and reused for every
+    message (a NOOP checks a connection that sat idle), so 50 proposals
+    cost a handful of TLS handshakes and logins, not 50
+  - --concurrency messages in flight at once, each on its own connection
+  - transient failures (4xx replies, dropped connections) are retried
+    within the run with backoff; an intake whose send still fails keeps
+    'generated', records email_error and is retried by a later run
+    (exponential backoff, at most MAX_SEND_ATTEMPTS); a 5xx reply to MAIL,
+    RCPT or DATA is not retried
+  - a server that can't be used at all (connect, STARTTLS or login fails)
+    stops the run: messages not yet sent are handed back unchanged, with
+    the error, so a wrong SMTP_PASSWORD doesn't use up the outbox's attempts
+  - a sent message is marked 'sent' as soon as the server accepts it;
+    failures are written back in batches of STATUS_BATCH, one UPDATE each
+  - the PDF is attached from the render itself: an intake whose PDF is
+    missing or out of date on this machine is rendered in memory
+    (proposal_render.render_document), saved, and the same bytes are sent.
+    A current PDF is read from disk once
+
+Intakes are claimed with FOR UPDATE SKIP LOCKED and a lease (LEASE_S),
+renewed while the run still holds them, so concurrent senders don't pick
+up each other's intakes. Delivery is at-least-once: a sender that crashes
+after the server accepted a message but before marking it sent leaves the
+intake to be emailed again once the lease runs out.
+
+SMTP settings come from the environment (or --smtp host:port):
+
+    export SMTP_HOST=smtp.example.com SMTP_PORT=587 SMTP_TLS=starttls   # or ssl / none
+    export SMTP_USER=proposals@dcbuilders.com SMTP_PASSWORD=...
+    export MAIL_FROM="D&C Builders <proposals@dcbuilders.com>"
+    export MAIL_BCC=office@dcbuilders.com          # optional
+
+Needs migrations/006_email_delivery.sql and pip3 install "psycopg[binary]".
+
+Run:
+    python3 proposal_mailer.py approve <id> <id> ...      # or: approve --all
+    python3 proposal_mailer.py outbox
+    python3 proposal_mailer.py send                       # deliver everything approved
+    python3 proposal_mailer.py send --smtp localhost:1025 --tls none --concurrency 8   # local SMTP sink
+"""
+import argparse
+import os
+import queue
+import smtplib
+import ssl
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from intake_db import BACKOFF_BASE_S, BACKOFF_CAP_S, connect, error_text, is_current, record_render
+from lint_proposals import ConfigRejected
+from proposal_render import load_template, render_document
+
+BASE              = os.path.dirname(os.path.abspath(__file__))
+CONCURRENCY       = 4       # messages in flight, and the most SMTP connections open
+CLAIM_BATCH       = 50      # intakes claimed per query
+STATUS_BATCH      = 25      # outcomes per status UPDATE
+MAX_SEND_ATTEMPTS = 5       # runs that may try one intake before it is left to a rep
+SEND_RETRIES      = 3       # tries per message within a run (transient failures only)
+RETRY_DELAY_S     = 2.0     # first in-run retry; doubles each time
+IDLE_CHECK_S      = 30.0    # NOOP a pooled connection idle longer than this
+LEASE_S           = 600     # a claimed intake is left alone this long
+SMTP_TIMEOUT_S    = 60
+
+_CLAIM = """
+UPDATE client_intakes
+SET email_attempts        = email_attempts + 1,
+    email_next_attempt_at = now() + make_interval(secs => %(lease)s)
+WHERE id IN (
+  SELECT id FROM client_intakes
+  WHERE status = 'generated' AND send_requested_at IS NOT NULL
+    AND coalesce(email_next_attempt_at, send_requested_at) <= now()
+    AND email_attempts < %(max)s
+  ORDER BY coalesce(email_next_attempt_at, send_requested_at), id
+  LIMIT %(limit)s
+  FOR UPDATE SKIP LOCKED
+)
+RETURNING id, first_name, last_name, email, street_address, city, rendered_config,
+          config_hash, template, template_version, pdf_path
+"""
+
+_MARK_SENT = """
+UPDATE client_intakes c
+SET status                = 'sent',
+    email_message_id      = s.message_id,
+    email_error           = NULL,
+    email_next_attempt_at = NULL
+FROM unnest(%(ids)s::uuid[], %(message_ids)s::text[]) AS s(id, message_id)
+WHERE c.id = s.id AND c.status = 'generated'
+"""
+
+# Back off exponentially; a permanent refusal uses up the attempts at once
+_MARK_FAILED = """
+UPDATE client_intakes c
+SET email_error           = s.error,
+    email_attempts        = CASE WHEN s.permanent THEN greatest(c.email_attempts, %(max)s)
+                                 ELSE c.email_attempts END,
+    email_next_attempt_at = now() + make_interval(secs =>
+                              least(%(cap)s, %(base)s * power(2, c.email_attempts - 1)))
+FROM unnest(%(ids)s::uuid[], %(errors)s::text[], %(permanent)s::bool[]) AS s(id, error, permanent)
+WHERE c.id = s.id
+"""
+
+# Claimed intakes a stopped run never got to: as they were before the claim
+_RELEASE = """
+UPDATE client_intakes
+SET email_attempts        = greatest(email_attempts - 1, 0),
+    email_next_attempt_at = NULL,
+    email_error           = %(error)s
+WHERE id = ANY(%(ids)s::uuid[]) AND status = 'generated'
+"""
+
+# Extend the lease on intakes this run has claimed but not finished
+_RENEW = """
+UPDATE client_intakes
+SET email_next_attempt_at = now() + make_interval(secs => %(lease)s)
+WHERE id = ANY(%(ids)s::uuid[]) AND status = 'generated'
+"""
+
+_APPROVE = """
+UPDATE client_intakes
+SET send_requested_at = now(), email_attempts = 0, email_error = NULL, email_next_attempt_at = NULL
+WHERE status = 'generated' {only}
+RETURNING id
+"""
+
+_OUTBOX = """
+SELECT id, first_name || ' & ' || last_name AS client_name, email, send_requested_at,
+       email_attempts, email_error, email_next_attempt_at
+FROM client_intakes
+WHERE status = 'generated' AND send_requested_at IS NOT NULL
+ORDER BY coalesce(email_next_attempt_at, send_requested_at), id
+"""
+
+
+class DeliveryError(Exception):
+    """A message could not be sent; `permanent` when retrying won't help."""
+
+    def __init__(self, message: str, permanent: bool = False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class SmtpUnavailable(Exception):
+    """No connection to the SMTP server could be opened (connect, STARTTLS or
+    login failed) — a problem with the run, not with any one message."""
+
+
+# ── SMTP ────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class SmtpSettings:
+    host:     str
+    port:     int = 587
+    tls:      str = "starttls"    # starttls / ssl / none
+    user:     str = ""
+    password: str = ""
+    sender:   str = ""
+    bcc:      str = ""
+
+    @classmethod
+    def from_env(cls) -> "SmtpSettings":
+        tls = os.environ.get("SMTP_TLS", "starttls").lower()
+        if tls not in ("starttls", "ssl", "none"):
+            raise ValueError(f"SMTP_TLS must be starttls, ssl or none, not {tls!r}")
+        return cls(host=os.environ.get("SMTP_HOST", ""),
+                   port=int(os.environ.get("SMTP_PORT") or (465 if tls == "ssl" else 587)),
+                   tls=tls,
+                   user=os.environ.get("SMTP_USER", ""),
+                   password=os.environ.get("SMTP_PASSWORD", ""),
+                   sender=os.environ.get("MAIL_FROM", ""),
+                   bcc=os.environ.get("MAIL_BCC", ""))
+
+
+class SmtpPool:
+    """Up to `size` SMTP connections, opened on demand and reused.
+
+    connection() hands out an idle connection (or opens one) and takes it
+    back afterwards. A connection that failed mid-use is closed instead,
+    unless the server only refused the addresses (smtplib has already
+    reset that transaction).
+    """
+
+    def __init__(self, settings: SmtpSettings, size: int = CONCURRENCY):
+        self.settings = settings
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self.opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> smtplib.SMTP:
+        s = self.settings
+        if s.tls == "ssl":
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(s.host, s.port, timeout=SMTP_TIMEOUT_S,
+                                                  context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(s.host, s.port, timeout=SMTP_TIMEOUT_S)
+            if s.tls == "starttls":
+                smtp.starttls(context=ssl.create_default_context())
+        if s.user:
+            smtp.login(s.user, s.password)
+        with self._lock:
+            self.opened += 1
+        return smtp
+
+    def _take(self) -> smtplib.SMTP:
+        while True:
+            try:
+                smtp, last_used = self.idle.get_nowait()
+            except queue.Empty:
+                try:
+                    return self._open()
+                except (smtplib.SMTPException, OSError) as exc:
+                    raise SmtpUnavailable(f"{self.settings.host}:{self.settings.port}: "
+                                          f"{error_text(exc)}") from exc
+            if time.monotonic() - last_used < IDLE_CHECK_S:
+                return smtp
+            try:  # the server may have dropped it while idle
+                if smtp.noop()[0] == 250:
+                    return smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            _close(smtp)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        with self.slots:
+            smtp = self._take()
+            try:
+                yield smtp
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused):
+                self.idle.put((smtp, time.monotonic()))
+                raise
+            except BaseException:
+                _close(smtp)
+                raise
+            self.idle.put((smtp, time.monotonic()))
+
+    def close(self) -> None:
+        while True:
+            try:
+                smtp, _ = self.idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                _close(smtp)
+
+
+def _close(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.close()
+    except OSError:
+        pass
+
+
+def _permanent(exc: BaseException) -> bool:
+    """A 5xx reply to MAIL (sender), RCPT (recipients) or DATA: this message
+    will never go through. Anything else may work on a later try."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return any(500 <= code < 600 for code, _ in exc.recipients.values())
+    if isinstance(exc, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        return 500 <= exc.smtp_code < 600
+    return False
+
+
+def send_message(pool: SmtpPool, msg: EmailMessage, retries: int = SEND_RETRIES) -> None:
+    """Send on a pooled connection, retrying transient failures with backoff.
+
+    SmtpUnavailable (no connection could be opened) is raised as is.
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            with pool.connection() as smtp:
+                smtp.send_message(msg)
+            return
+        except SmtpUnavailable:
+            raise
+        except Exception as exc:
+            if _permanent(exc):
+                raise DeliveryError(error_text(exc), permanent=True) from exc
+            if attempt == retries:
+                raise DeliveryError(error_text(exc)) from exc
+            time.sleep(RETRY_DELAY_S * 2 ** (attempt - 1))
+
+
+# ── Messages ────────────────────────────────────────────────────────────────
+@dataclass
+class Outgoing:
+    intake_id: str
+    message:   EmailMessage
+
+
+def compose(row: Dict[str, Any], pdf: bytes, filename: str, settings: SmtpSettings) -> EmailMessage:
+    """The client email for one intake, with its proposal attached."""
+    msg = EmailMessage()
+    msg["From"] = settings.sender
+    msg["To"] = row["email"]
+    if settings.bcc:
+        msg["Bcc"] = settings.bcc
+    msg["Subject"] = f"Your D&C Builders proposal — {row['street_address']}"
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid(domain=settings.sender.rpartition("@")[2].strip("> ") or None)
+    msg.set_content(
+        f"Hi {row['first_name']},\n\n"
+        f"Thank you for meeting with us. Attached is our proposal for {row['street_address']}, "
+        f"{row['city']}.\n\n"
+        f"Please take your time reviewing it, and reply to this email or call us with any "
+        f"questions.\n\n"
+        f"D&C Builders\n")
+    msg.add_attachment(pdf, maintype="application", subtype="pdf", filename=filename)
+    return msg
+
+
+def attachment(conn, row: Dict[str, Any], output_dir: str) -> Tuple[bytes, str]:
+    """(PDF, file name) for a claimed intake: the PDF on disk when it is
+    current, else a fresh render, sent straight from memory."""
+    cfg = load_template(row["template"]).ProposalConfig.from_dict(row["rendered_config"])
+    output = row["pdf_path"] or os.path.join(output_dir, os.path.basename(cfg.resolve_output()))
+    if is_current(row, cfg, row["template"], output):
+        with open(output, "rb") as f:
+            return f.read(), os.path.basename(output)
+    output = os.path.join(output_dir, os.path.basename(cfg.resolve_output()))
+    started = time.perf_counter()
+    pdf, pages = render_document(cfg, row["template"], output)
+    record_render(conn, row["id"], cfg, row["template"], output,
+                  round((time.perf_counter() - started) * 1000), pages)
+    return pdf, os.path.basename(output)
+
+
+# ── Delivery ────────────────────────────────────────────────────────────────
+def claim(conn, limit: int = CLAIM_BATCH, max_attempts: int = MAX_SEND_ATTEMPTS) -> List[Dict[str, Any]]:
+    with conn.transaction():
+        return conn.execute(_CLAIM, {"lease": LEASE_S, "max": max_attempts,
+                                     "limit": limit}).fetchall()
+
+
+class StatusWriter:
+    """Writes outcomes back: sent at once (every message marked late is one
+    a crash would send twice), failures STATUS_BATCH at a time. Keeps the
+    lease on claimed intakes that have no outcome yet."""
+
+    def __init__(self, conn, max_attempts: int = MAX_SEND_ATTEMPTS, batch: int = STATUS_BATCH):
+        self.conn, self.max_attempts, self.batch = conn, max_attempts, batch
+        self.sent: List[Tuple[str, str]] = []
+        self.failed: List[Tuple[str, str, bool]] = []
+        self.open: Set[str] = set()
+        self.renewed = time.monotonic()
+
+    def claimed(self, ids: Iterable[str]) -> None:
+        self.open.update(ids)
+        self.renewed = time.monotonic()
+
+    def renew(self) -> None:
+        """Extend the lease on open intakes, once half of it has passed."""
+        if not self.open or time.monotonic() - self.renewed < LEASE_S / 2:
+            return
+        with self.conn.transaction():
+            self.conn.execute(_RENEW, {"ids": list(self.open), "lease": LEASE_S})
+        self.renewed = time.monotonic()
+
+    def release(self, error: str) -> None:
+        """Hand back every claimed intake without an outcome, attempts as before."""
+        if not self.open:
+            return
+        with self.conn.transaction():
+            self.conn.execute(_RELEASE, {"ids": list(self.open), "error": error})
+        self.open.clear()
+
+    def add_sent(self, intake_id: str, message_id: str) -> None:
+        self.open.discard(intake_id)
+        self.sent.append((intake_id, message_id))
+        self.flush()
+
+    def add_failed(self, intake_id: str, error: str, permanent: bool) -> None:
+        self.open.discard(intake_id)
+        self.failed.append((intake_id, error, permanent))
+        if len(self.sent) + len(self.failed) >= self.batch:
+            self.flush()
+
+    def flush(self) -> None:
+        self.renew()
+        if not self.sent and not self.failed:
+            return
+        with self.conn.transaction():
+            if self.sent:
+                ids, message_ids = zip(*self.sent)
+                self.conn.execute(_MARK_SENT, {"ids": list(ids), "message_ids": list(message_ids)})
+            if self.failed:
+                ids, errors, permanent = zip(*self.failed)
+                self.conn.execute(_MARK_FAILED, {
+                    "ids": list(ids), "errors": list(errors), "permanent": list(permanent),
+                    "max": self.max_attempts, "base": BACKOFF_BASE_S, "cap": BACKOFF_CAP_S})
+        self.sent, self.failed = [], []
+
+
+def send_all(pool: SmtpPool, messages: Iterable[Outgoing], concurrency: int = CONCURRENCY,
+             on_sent=None, on_failed=None) -> Dict[str, int]:
+    """Send `messages` with at most `concurrency` in flight (and at most
+    that many built ahead, so attachments don't pile up in memory).
+
+    on_sent(intake_id, message_id) / on_failed(intake_id, error, permanent)
+    are called from this thread. Returns counts: sent, failed. When the
+    server can't be reached, stops taking messages, waits for those in
+    flight and raises SmtpUnavailable; messages without an outcome by then
+    got neither callback.
+    """
+    counts = {"sent": 0, "failed": 0}
+    pending: Dict[Future, Outgoing] = {}
+    unavailable: List[SmtpUnavailable] = []
+
+    def collect(done) -> None:
+        for future in done:
+            out = pending.pop(future)
+            try:
+                future.result()
+            except SmtpUnavailable as exc:
+                unavailable.append(exc)
+                continue
+            except DeliveryError as exc:
+                counts["failed"] += 1
+                print(f"  FAILED {out.intake_id} → {out.message['To']}: {exc}")
+                if on_failed:
+                    on_failed(out.intake_id, str(exc), exc.permanent)
+                continue
+            counts["sent"] += 1
+            print(f"  sent   {out.intake_id} → {out.message['To']}")
+            if on_sent:
+                on_sent(out.intake_id, out.message["Message-ID"])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for out in messages:
+            while len(pending) >= concurrency and not unavailable:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            if unavailable:
+                break
+            pending[executor.submit(send_message, pool, out.message)] = out
+        while pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED).done)
+    if unavailable:
+        raise unavailable[0]
+    return counts
+
+
+def deliver(settings: SmtpSettings, output_dir: str = BASE, concurrency: int = CONCURRENCY,
+            max_attempts: int = MAX_SEND_ATTEMPTS, limit: Optional[int] = None) -> Dict[str, int]:
+    """Send every approved, due proposal (up to `limit`). Returns counts:
+    sent, failed (send errors) and unsendable (no address, render failed).
+
+    Raises SmtpUnavailable, after handing back what it hadn't sent, when no
+    connection to the server could be opened.
+    """
+    if not settings.host or not settings.sender:
+        raise ValueError("Set SMTP_HOST and MAIL_FROM (or pass --smtp and --sender)")
+    pool = SmtpPool(settings, concurrency)
+    counts = {"sent": 0, "failed": 0, "unsendable": 0}
+    with connect() as conn:
+        status = StatusWriter(conn, max_attempts)
+
+        def outgoing() -> Iterator[Outgoing]:
+            taken = 0
+            while limit is None or taken < limit:
+                rows = claim(conn, min(CLAIM_BATCH, limit - taken) if limit else CLAIM_BATCH,
+                             max_attempts)
+                if not rows:
+                    return
+                status.claimed(str(row["id"]) for row in rows)
+                for row in rows:
+                    status.renew()  # in-line renders can outlast the lease
+                    taken += 1
+                    error, permanent = None, True
+                    if not row["email"]:
+                        error = "No email address on the intake"
+                    elif not row["rendered_config"] or not row["template"]:
+                        error = "No stored config to attach"
+                    else:
+                        try:
+                            pdf, filename = attachment(conn, row, output_dir)
+                        except Exception as exc:
+                            error, permanent = error_text(exc), isinstance(exc, ConfigRejected)
+                    if error:
+                        counts["unsendable"] += 1
+                        print(f"  skip   {row['id']}: {error}")
+                        status.add_failed(str(row["id"]), error, permanent)
+                        continue
+                    yield Outgoing(str(row["id"]), compose(row, pdf, filename, settings))
+
+        try:
+            sent = send_all(pool, outgoing(), concurrency, status.add_sent, status.add_failed)
+        except SmtpUnavailable as exc:
+            status.flush()
+            status.release(f"Not sent, SMTP unavailable: {exc}")
+            raise
+        finally:
+            status.flush()
+            pool.close()
+    counts.update(sent)
+    counts["connections"] = pool.opened
+    return counts
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Email generated proposals to clients.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    a = sub.add_parser("approve", help="Approve generated proposals for sending")
+    a.add_argument("ids", nargs="*", metavar="ID", help="client_intakes ids")
+    a.add_argument("--all", action="store_true", help="Every generated proposal not yet approved")
+
+    sub.add_parser("outbox", help="Approved proposals waiting to be sent")
+
+    s = sub.add_parser("send", help="Send the outbox")
+    s.add_argument("--smtp", metavar="HOST[:PORT]", help="SMTP server (default: SMTP_HOST/SMTP_PORT)")
+    s.add_argument("--tls", choices=("starttls", "ssl", "none"), help="Default: SMTP_TLS or starttls")
+    s.add_argument("--sender", metavar="ADDRESS", help="From address (default: MAIL_FROM)")
+    s.add_argument("--concurrency", type=int, default=CONCURRENCY,
+                   help=f"Messages in flight and SMTP connections (default {CONCURRENCY})")
+    s.add_argument("--limit", type=int, help="Send at most this many")
+    s.add_argument("--output-dir", metavar="DIR", default=BASE,
+                   help="Where PDFs rendered for sending are written")
+    s.add_argument("--max-attempts", type=int, default=MAX_SEND_ATTEMPTS,
+                   help=f"Runs that may try one intake (default {MAX_SEND_ATTEMPTS})")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.command == "approve":
+        if not args.ids and not args.all:
+            sys.exit("Pass intake ids or --all")
+        only, params = "AND send_requested_at IS NULL", {}
+        if args.ids:
+            only, params = "AND id = ANY(%(ids)s::uuid[])", {"ids": args.ids}
+        with connect() as conn, conn.transaction():
+            ids = conn.execute(_APPROVE.format(only=only), params).fetchall()
+        print(f"Approved {len(ids)} proposal(s) for sending")
+
+    elif args.command == "outbox":
+        with connect() as conn:
+            rows = conn.execute(_OUTBOX).fetchall()
+        for row in rows:
+            error = (row["email_error"] or "").splitlines()[0:1] or [""]
+            print(f"{row['id']}  {row['client_name']:<28} {row['email'] or '(no email)':<32} "
+                  f"{row['email_attempts']:>2} attempts  {error[0][:60]}")
+        print(f"{len(rows)} proposal(s) waiting")
+
+    elif args.command == "send":
+        try:
+            settings = SmtpSettings.from_env()
+            if args.smtp:
+                host, _, port = args.smtp.partition(":")
+                settings = replace(settings, host=host, port=int(port or settings.port))
+            if args.tls:
+                settings = replace(settings, tls=args.tls)
+            if args.sender:
+                settings = replace(settings, sender=args.sender)
+            started = time.perf_counter()
+            counts = deliver(settings, args.output_dir, args.concurrency, args.max_attempts,
+                             args.limit)
+        except (ValueError, SmtpUnavailable) as exc:
+            sys.exit(str(exc))
+        print(f"Sent {counts['sent']}, failed {counts['failed']}, unsendable {counts['unsendable']} "
+              f"over {counts['connections']} SMTP connection(s) "
+              f"in {time.perf_counter() - started:.1f}s")
+        sys.exit(1 if counts["failed"] or counts["unsendable"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""D&C Builders — shared PDF rendering helpers
+
+Used by generate_proposal.py and generate_proposal_full_scope.py. A template
+hands over its document head plus a list of self-contained page groups
+(build_head / build_parts); this module lays them out with WeasyPrint.
+
+All layout goes through layout(), which shares one FontConfiguration and
+keeps fetched resources (the Google Fonts stylesheet and font files) in
+memory, so repeated renders in one process skip the network. Images are
+not kept; they come pre-sized from .cache/images/ (proposal_images.py).
+
+Serial mode renders the whole document in one pass (the default).
+Parallel mode (--parallel) lays out every page group as its own sub-document
+in a process pool and stitches the PDFs back together with pypdf. The pool
+lives as long as the process: its workers import WeasyPrint and fetch the
+fonts and stylesheets once, when they start, not per render. A process
+that renders many proposals (batch_render.py, intake re-renders) pays that
+start-up once; a one-off CLI render pays it every time, so measure before
+relying on it there (bench/bench_render.py times both modes, cold and warm):
+
+    pip3 install pypdf
+"""
+import atexit
+import dataclasses
+import hashlib
+import importlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+import render_metrics
+from proposal_sections import number_toc
+
+# CSS px (WeasyPrint layout units) → PDF points
+PX_TO_PT = 0.75
+
+# Template name → module (imported lazily; the modules import this one)
+TEMPLATES = {
+    "standard":   "generate_proposal",
+    "full_scope": "generate_proposal_full_scope",
+}
+
+# Typical page count per template — the render queue's cost estimate
+TEMPLATE_PAGES = {
+    "standard":   9,
+    "full_scope": 12,
+}
+
+
+FULL_SCOPE_KEYWORDS = ("2nd story", "adu", "roofing")
+
+
+def load_template(name: str) -> ModuleType:
+    if name not in TEMPLATES:
+        raise ValueError(f"Unknown template {name!r} (expected one of {', '.join(TEMPLATES)})")
+    return importlib.import_module(TEMPLATES[name])
+
+
+def pick_template(data: Dict[str, Any]) -> str:
+    """Template for a client JSON: its "template" key, else the README rule
+    (4+ scope items, 2nd story, ADU or roofing → full scope). Library
+    project_types count like scope items."""
+    if data.get("template"):
+        return data["template"]
+    items = [str(item).lower().replace("_", " ")
+             for item in data.get("scope_items", []) + data.get("project_types", [])]
+    if len(items) >= 4 or any(k in item for item in items for k in FULL_SCOPE_KEYWORDS):
+        return "full_scope"
+    return "standard"
+
+
+# ── Versioning ──────────────────────────────────────────────────────────────
+# Modules whose source decides the HTML a config renders to
+_OUTPUT_MODULES = ("proposal_sections", "section_library")
+
+
+def config_dict(cfg) -> Dict[str, Any]:
+    """JSON-ready ProposalConfig, minus the machine-specific output path."""
+    data = dataclasses.asdict(cfg)
+    data.pop("output_path", None)
+    return data
+
+
+def config_hash(cfg) -> str:
+    canonical = json.dumps(config_dict(cfg), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def template_version(name: str) -> str:
+    """Short hash of the template's source and the modules it renders with.
+
+    Changes whenever a render of the same config could come out different.
+    """
+    h = hashlib.sha256()
+    for module in (load_template(name), *map(importlib.import_module, _OUTPUT_MODULES)):
+        with open(module.__file__, "rb") as f:
+            h.update(f.read().replace(b"\r\n", b"\n"))
+    return h.hexdigest()[:12]
+
+
+# ── HTML assembly ───────────────────────────────────────────────────────────
+def assemble_html(head: str, parts: List[str]) -> str:
+    """Join a document head and its page groups into one HTML document."""
+    body = "\n\n".join(parts)
+    return f"{head}\n<body>\n\n{body}\n\n</body>\n</html>"
+
+
+# ── Layout ──────────────────────────────────────────────────────────────────
+_fetched: Dict[str, Dict[str, Any]] = {}
+_font_config = None
+
+
+def fetch_url(url: str) -> Dict[str, Any]:
+    """WeasyPrint url_fetcher that remembers fonts and stylesheets for the
+    process. Images (proposal_images.py) differ per client and are read
+    from the local cache each time, so a long batch doesn't hoard them."""
+    from weasyprint import default_url_fetcher
+
+    if url in _fetched:
+        render_metrics.cache("resources", True)
+        return dict(_fetched[url])
+    render_metrics.cache("resources", False)
+    result = default_url_fetcher(url)
+    if "file_obj" in result:
+        with result.pop("file_obj") as f:
+            result["string"] = f.read()
+    if not str(result.get("mime_type", "")).startswith("image/"):
+        _fetched[url] = result
+    return dict(result)
+
+
+def layout(html: str):
+    """Lay out an HTML document; returns a weasyprint Document."""
+    global _font_config
+    from weasyprint import HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    if _font_config is None:
+        _font_config = FontConfiguration()
+    return HTML(string=html, base_url=".", url_fetcher=fetch_url).render(font_config=_font_config)
+
+
+# ── Output ──────────────────────────────────────────────────────────────────
+def write_atomic(path: str, data: bytes) -> None:
+    """Write `data` to a temp file beside `path`, fsync, then rename over it.
+
+    A crash mid-write leaves the previous file (or none), never a truncated one.
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ── Serial render ───────────────────────────────────────────────────────────
+def render_pdf(html: str, output: str) -> int:
+    """Lay out `html` in one pass and write it to `output`. Returns page count."""
+    pdf, pages = pdf_bytes(html)
+    write_atomic(output, pdf)
+    return pages
+
+
+def pdf_bytes(html: str) -> Tuple[bytes, int]:
+    """(PDF, page count) for `html`, laid out in one pass."""
+    with render_metrics.stage("layout"):
+        doc = layout(html)
+    with render_metrics.stage("write_pdf"):
+        return doc.write_pdf(), len(doc.pages)
+
+
+# ── Parallel render ─────────────────────────────────────────────────────────
+def _render_part(html: str) -> Tuple[bytes, List[tuple], List[tuple]]:
+    """Worker: lay out one sub-document.
+
+    Returns the PDF bytes, its anchors as (name, page, x, y) and its internal
+    links as (page, target, (x1, y1, x2, y2)), all in CSS px. Links whose
+    anchor lives in another sub-document are dropped by WeasyPrint, so the
+    parent re-creates them after merging.
+    """
+    doc = layout(html)
+    anchors, links = [], []
+    for i, page in enumerate(doc.pages):
+        for name, (x, y) in page.anchors.items():
+            anchors.append((name, i, x, y))
+        for link in page.links:
+            if link[0] == "internal":
+                links.append((i, link[1], tuple(link[2])))
+    pdf = doc.write_pdf()
+    render_metrics.registry().flush()  # pool processes exit without atexit
+    return pdf, anchors, links
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Tuple[int, int] = (0, 0)  # (owning pid, workers)
+
+
+def _warm_worker(head: str) -> None:
+    """Pool initializer: import WeasyPrint, load fonts and fetch the head's
+    stylesheets and font files once per worker. Best effort: a worker that
+    couldn't warm up fetches on its first render instead."""
+    try:
+        layout(assemble_html(head, []))
+    except Exception:
+        pass
+
+
+def layout_pool(head: str, workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """This process's layout pool, started on first use and kept for later
+    renders. `head` warms the workers; any template's head will do, the
+    fetched resources are shared."""
+    global _pool, _pool_key
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or _pool_key != (os.getpid(), workers):
+        if _pool is not None and _pool_key[0] == os.getpid():
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker,
+                                    initargs=(head,))
+        _pool_key = (os.getpid(), workers)
+        atexit.register(_pool.shutdown)
+    return _pool
+
+
+def render_parallel(head: str, parts: List[str], output: str,
+                    workers: Optional[int] = None) -> int:
+    """Parallel counterpart of render_pdf. Returns the total page count."""
+    pdf, pages = parallel_pdf_bytes(head, parts, workers)
+    write_atomic(output, pdf)
+    return pages
+
+
+def parallel_pdf_bytes(head: str, parts: List[str],
+                       workers: Optional[int] = None) -> Tuple[bytes, int]:
+    """Lay out each page group in its own process, then merge in order.
+
+    target-counter() cannot see anchors in other sub-documents, so TOC page
+    numbers are written in up front, and internal links (TOC rows → section
+    anchors) that cross page groups are re-added on the merged PDF.
+    Returns (PDF, total page count).
+    """
+    docs = [assemble_html(head, [part]) for part in number_toc(parts)]
+    with render_metrics.stage("layout"):
+        results = list(layout_pool(head, workers).map(_render_part, docs))
+
+    with render_metrics.stage("merge"):
+        return _merge_parts(results)
+
+
+def _merge_parts(results: List[Tuple[bytes, List[tuple], List[tuple]]]) -> Tuple[bytes, int]:
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.annotations import Link
+    from pypdf.generic import Fit
+
+    writer = PdfWriter()
+    offsets: List[int] = []
+    for pdf, _, _ in results:
+        offsets.append(len(writer.pages))
+        writer.append(PdfReader(io.BytesIO(pdf)))
+
+    # anchor name → (part index, absolute page, x, y)
+    anchors: Dict[str, Tuple[int, int, float, float]] = {}
+    for n, (_, part_anchors, _) in enumerate(results):
+        for name, page, x, y in part_anchors:
+            anchors.setdefault(name, (n, offsets[n] + page, x, y))
+
+    for n, (_, _, part_links) in enumerate(results):
+        for page, target, (x1, y1, x2, y2) in part_links:
+            if target not in anchors or anchors[target][0] == n:
+                continue  # unknown, or already resolved inside the sub-document
+            _, dest_page, dx, dy = anchors[target]
+            src_h = float(writer.pages[offsets[n] + page].mediabox.height)
+            dest_h = float(writer.pages[dest_page].mediabox.height)
+            writer.add_annotation(offsets[n] + page, Link(
+                rect=(x1 * PX_TO_PT, src_h - y2 * PX_TO_PT,
+                      x2 * PX_TO_PT, src_h - y1 * PX_TO_PT),
+                target_page_index=dest_page,
+                fit=Fit.xyz(left=dx * PX_TO_PT, top=dest_h - dy * PX_TO_PT),
+            ))
+
+    merged = io.BytesIO()
+    writer.write(merged)
+    return merged.getvalue(), len(writer.pages)
+
+
+# ── By template name ────────────────────────────────────────────────────────
+def render_config(cfg, template: str, output: str, parallel: bool = False) -> int:
+    """Render a ProposalConfig with the named template and add it to the
+    search index (proposal_search.py). Returns page count."""
+    return render_document(cfg, template, output, parallel)[1]
+
+
+def render_document(cfg, template: str, output: str,
+                    parallel: bool = False) -> Tuple[bytes, int]:
+    """render_config, also returning the PDF it wrote, for callers that pass
+    it on (proposal_mailer.py) without reading the file back. Timings,
+    sizes and failures go to render_metrics.py.
+
+    A config that breaks the writing guide's limits raises
+    lint_proposals.ConfigRejected before any layout.
+    """
+    from lint_proposals import check_config
+    from proposal_search import index_rendered
+
+    module = load_template(template)
+    with render_metrics.render(template, "parallel" if parallel else "serial") as done:
+        check_config(cfg, template)
+        if parallel:
+            with render_metrics.stage("html"):
+                head, parts = module.build_head(), module.build_parts(cfg)
+            pdf, pages = parallel_pdf_bytes(head, parts)
+        else:
+            with render_metrics.stage("html"):
+                html = module.build_html(cfg)
+            pdf, pages = pdf_bytes(html)
+        with render_metrics.stage("save"):
+            write_atomic(output, pdf)
+        with render_metrics.stage("index"):
+            index_rendered(cfg, template, output)
+        done(pages, len(pdf))
+    return pdf, pages
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""D&C Builders — full-text search over generated proposals
+
+Every proposal rendered through proposal_render.render_config (batch runs,
+the render queue, intake re-renders) and the template CLIs is added to a
+SQLite FTS5 index at .cache/proposal_search.sqlite, keyed by its PDF path:
+client, address, scope items, materials, milestones, total, and the text
+of its scope sections. A proposal whose config hash hasn't changed
+since it was indexed is skipped, so re-renders cost one lookup.
+
+Queries are plain words ("2nd story huntington beach concrete tile roof"):
+filler words are dropped, the rest are stemmed (tile/tiles) and ranked
+with BM25, client and address hits weighing most. Results must have every
+word; only when nothing does (and without --all) are proposals with some
+of them shown. Anything with quotes, * or AND/OR/NOT/NEAR is passed to
+FTS5 as written.
+
+Run:
+    python3 proposal_search.py index                       # (re)index every clients/*.json
+    python3 proposal_search.py index more/ --force
+    python3 proposal_search.py query huntington beach concrete tile
+    python3 proposal_search.py query '"tankless water heater" NOT adu' --min-total 300000
+    python3 proposal_search.py stats
+"""
+import argparse
+import dataclasses
+import glob
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from proposal_sections import CACHE_DIR, plain_text
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+SEARCH_DB = os.path.join(CACHE_DIR, "proposal_search.sqlite")
+
+# FTS columns, in order, and their BM25 weights
+COLUMNS = ("client", "address", "scope", "materials", "milestones", "total", "body")
+WEIGHTS = (10.0, 6.0, 4.0, 3.0, 1.0, 2.0, 1.0)
+
+# Sections every proposal carries in the same words: indexing their text
+# would only add matches for everything (milestones have their own column)
+BOILERPLATE = frozenset({"Design, Architectural & Engineering", "Payment Schedule", "General Notes"})
+
+STOPWORDS = frozenset("""
+a an and any at by for from in into is it job of on one or our proposal
+proposals that the their them this those to was we where which with
+""".split())
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS proposals (
+  id            INTEGER PRIMARY KEY,
+  output_path   TEXT    NOT NULL UNIQUE,
+  template      TEXT    NOT NULL,
+  config_hash   TEXT    NOT NULL,
+  client_name   TEXT    NOT NULL,
+  client_address TEXT,
+  project_total TEXT,
+  total         REAL,              -- dollars, for --min-total / --max-total
+  indexed_at    REAL    NOT NULL   -- epoch seconds
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS proposal_text USING fts5(
+  {", ".join(COLUMNS)},
+  tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+_OPERATOR = re.compile(r'["*()]|\b(AND|OR|NOT|NEAR)\b')
+_WORD     = re.compile(r"\w+")
+
+
+# ── Index ───────────────────────────────────────────────────────────────────
+def open_index(path: str = SEARCH_DB) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)  # render workers share it
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+_conn: Dict[str, Tuple[int, sqlite3.Connection]] = {}
+
+
+def _shared(path: str) -> sqlite3.Connection:
+    """One connection per process (and per worker after a fork)."""
+    pid, conn = _conn.get(path, (0, None))
+    if pid != os.getpid() or conn is None:
+        conn = open_index(path)
+        _conn[path] = (os.getpid(), conn)
+    return conn
+
+
+def _dollars(amount: Any) -> Optional[float]:
+    try:
+        return float(str(amount).replace("$", "").replace(",", "").strip())
+    except ValueError:
+        return None
+
+
+def document(cfg, template: str) -> Dict[str, str]:
+    """Searchable text of one config, by FTS column."""
+    from proposal_render import load_template
+
+    module = load_template(template)
+    # Section text without the galleries: indexing shouldn't prepare images
+    bare = dataclasses.replace(cfg, mood_board=[], project_photos=[])
+    sections = module.build_sections(bare)
+    images = [item if isinstance(item, str) else " ".join(map(str, item))
+              for item in [*cfg.mood_board, *cfg.project_photos]]
+
+    total = str(cfg.project_total)
+    digits = "".join(c for c in total if c.isdigit())
+    return {
+        "client":     cfg.client_name,
+        "address":    cfg.client_address,
+        "scope":      " · ".join([*cfg.scope_items, *(t.replace("_", " ") for t in cfg.project_types),
+                                  *(plain_text(s.title) for s in sections)]),
+        "materials":  " · ".join(f"{kind} {value}" for kind, value in sorted(cfg.materials.items())
+                                 if value),
+        "milestones": " · ".join(f"{desc} {amount}" for desc, amount in cfg.payments),
+        "total":      f"{total} {digits}",
+        "body":       " ".join([*(plain_text(s.body) for s in sections
+                                  if plain_text(s.title) not in BOILERPLATE), *images]),
+    }
+
+
+def index_proposal(cfg, template: str, output: str, conn: Optional[sqlite3.Connection] = None,
+                   force: bool = False) -> bool:
+    """Add or refresh one proposal. Returns False when it was already current."""
+    from proposal_render import config_hash
+
+    conn = conn or _shared(SEARCH_DB)
+    output = os.path.abspath(output)
+    digest = config_hash(cfg)
+    row = conn.execute("SELECT id, template, config_hash FROM proposals WHERE output_path = ?",
+                       (output,)).fetchone()
+    if row and not force and row["config_hash"] == digest and row["template"] == template:
+        return False
+
+    doc = document(cfg, template)
+    with conn:
+        conn.execute(
+            "INSERT INTO proposals (output_path, template, config_hash, client_name, client_address,"
+            " project_total, total, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (output_path) DO UPDATE SET template = excluded.template,"
+            " config_hash = excluded.config_hash, client_name = excluded.client_name,"
+            " client_address = excluded.client_address, project_total = excluded.project_total,"
+            " total = excluded.total, indexed_at = excluded.indexed_at",
+            (output, template, digest, cfg.client_name, cfg.client_address, cfg.project_total,
+             _dollars(cfg.project_total), time.time()))
+        rowid = conn.execute("SELECT id FROM proposals WHERE output_path = ?", (output,)).fetchone()[0]
+        conn.execute("DELETE FROM proposal_text WHERE rowid = ?", (rowid,))
+        conn.execute(f"INSERT INTO proposal_text (rowid, {', '.join(COLUMNS)}) "
+                     f"VALUES (?, {', '.join('?' * len(COLUMNS))})",
+                     (rowid, *(doc[c] for c in COLUMNS)))
+    return True
+
+
+def index_rendered(cfg, template: str, output: str) -> None:
+    """After a successful render: index it, without ever failing the render."""
+    try:
+        index_proposal(cfg, template, output)
+    except Exception as exc:
+        print(f"  search index not updated for {output}: {type(exc).__name__}: {exc}")
+
+
+def index_files(paths: List[str], force: bool = False,
+                db: str = SEARCH_DB) -> Tuple[int, int, List[str]]:
+    """Index client JSON configs. Returns (indexed, unchanged, errors)."""
+    from proposal_render import load_template, pick_template
+
+    conn = open_index(db)
+    indexed = unchanged = 0
+    errors: List[str] = []
+    try:
+        for path in paths:
+            try:
+                with open(path) as f:
+                    template = pick_template(json.load(f))
+                cfg = load_template(template).ProposalConfig.from_json(path)
+                if index_proposal(cfg, template, cfg.resolve_output(), conn, force):
+                    indexed += 1
+                else:
+                    unchanged += 1
+            except Exception as exc:
+                errors.append(f"{path}: {type(exc).__name__}: {exc}")
+    finally:
+        conn.close()
+    return indexed, unchanged, errors
+
+
+# ── Query ───────────────────────────────────────────────────────────────────
+def fts_query(text: str, match_all: bool = False) -> str:
+    """Plain words → an FTS5 query; FTS5 syntax is passed through."""
+    if _OPERATOR.search(text):
+        return text
+    words = [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+    return (" AND " if match_all else " OR ").join(f'"{w}"' for w in dict.fromkeys(words))
+
+
+def search(conn: sqlite3.Connection, text: str, limit: int = 10, match_all: bool = False,
+           template: Optional[str] = None, min_total: Optional[float] = None,
+           max_total: Optional[float] = None) -> List[sqlite3.Row]:
+    """Best matches for `text` with every word; if there are none (and not
+    match_all), with any of them."""
+    rows = _search(conn, fts_query(text, True), limit, template, min_total, max_total)
+    if not rows and not match_all and not _OPERATOR.search(text):
+        rows = _search(conn, fts_query(text), limit, template, min_total, max_total)
+    return rows
+
+
+def _search(conn: sqlite3.Connection, query: str, limit: int, template: Optional[str],
+            min_total: Optional[float], max_total: Optional[float]) -> List[sqlite3.Row]:
+    if not query:
+        return []
+    where, params = ["proposal_text MATCH ?"], [query]
+    if template:
+        where.append("p.template = ?")
+        params.append(template)
+    if min_total is not None:
+        where.append("p.total >= ?")
+        params.append(min_total)
+    if max_total is not None:
+        where.append("p.total <= ?")
+        params.append(max_total)
+    return conn.execute(
+        f"SELECT p.*, bm25(proposal_text, {', '.join(map(str, WEIGHTS))}) AS score,"
+        f" snippet(proposal_text, -1, '[', ']', '…', 12) AS snippet"
+        f" FROM proposal_text JOIN proposals p ON p.id = proposal_text.rowid"
+        f" WHERE {' AND '.join(where)} ORDER BY score LIMIT ?", (*params, limit)).fetchall()
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Full-text search over generated proposals.")
+    p.add_argument("--db", metavar="FILE", default=SEARCH_DB,
+                   help="Index file (default: .cache/proposal_search.sqlite)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    i = sub.add_parser("index", help="Index client JSON configs")
+    i.add_argument("paths", nargs="*", help="JSON files or directories (default: clients/)")
+    i.add_argument("--force", action="store_true", help="Re-index unchanged configs too")
+
+    q = sub.add_parser("query", help="Search the index")
+    q.add_argument("words", nargs="+", help="Words to look for, or an FTS5 query")
+    q.add_argument("--all", action="store_true", help="Only proposals with every word")
+    q.add_argument("--template", help="standard / full_scope")
+    q.add_argument("--min-total", type=float, metavar="DOLLARS")
+    q.add_argument("--max-total", type=float, metavar="DOLLARS")
+    q.add_argument("--limit", type=int, default=10, help="Results to show (default 10)")
+
+    sub.add_parser("stats", help="What the index holds")
+    return p.parse_args()
+
+
+def _collect(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path])
+    return files
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "index":
+        started = time.perf_counter()
+        indexed, unchanged, errors = index_files(
+            _collect(args.paths or [os.path.join(BASE, "clients")]), args.force, args.db)
+        for error in errors:
+            print(f"  {error}")
+        print(f"{indexed} indexed, {unchanged} unchanged, {len(errors)} failed "
+              f"in {time.perf_counter() - started:.1f}s")
+        sys.exit(1 if errors else 0)
+
+    conn = open_index(args.db)
+    if args.command == "stats":
+        n, newest = conn.execute("SELECT count(*), max(indexed_at) FROM proposals").fetchone()
+        print(f"{n} proposal(s) in {args.db}"
+              + (f", last indexed {time.strftime('%Y-%m-%d %H:%M', time.localtime(newest))}"
+                 if newest else ""))
+        for row in conn.execute("SELECT template, count(*) AS n FROM proposals GROUP BY template"):
+            print(f"  {row['template']:<12} {row['n']:>7}")
+        return
+
+    started = time.perf_counter()
+    rows = search(conn, " ".join(args.words), args.limit, args.all, args.template,
+                  args.min_total, args.max_total)
+    ms = (time.perf_counter() - started) * 1000
+    for row in rows:
+        print(f"{row['client_name']} — {row['client_address']}  {row['project_total']}  "
+              f"({row['template']})")
+        print(f"    {row['snippet']}")
+        print(f"    {os.path.relpath(row['output_path'], BASE)}")
+    print(f"{len(rows)} result(s) in {ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""D&C Builders — proposal section model
+
+Both templates describe their numbered content pages as an ordered list of
+Section objects. Section numbers, page markup and the table of contents are
+all derived from that list, so the TOC always matches what is emitted.
+
+Sections longer than one sheet are continued onto extra pages automatically.
+paginate() lays every uncached section out once on a tall measuring page,
+reads where each block (a heading with its list) starts from the WeasyPrint
+box tree, and packs blocks into 11in pages. Break points are cached on disk
+by section content hash, so a section is only ever measured once.
+
+TOC page numbers count content pages — the section pages, from the first
+one; the cover and the TOC itself are not numbered — so with one page per
+section they match the section numbers printed on the pages. They come
+from a CSS target-counter() on a `sheet` counter that only section pages
+(class exactly "page") increment. Where layout cannot see the whole
+document (parallel sub-documents, browser previews), number_toc() writes
+them in directly by the same rule: every `.page` is a fixed 11in sheet, so
+an anchor's number is the position of its section page.
+"""
+import hashlib
+import html as html_lib
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_PAGE_DIV = re.compile(r'<div class="page\b([^"]*)"(?: id="([\w-]+)")?')
+_TOC_LINK = re.compile(r'class="toc-row" href="#([\w-]+)"')
+_TAG      = re.compile(r"<[^>]+>")
+_BLANK    = re.compile(r"\n[ \t]*\n")
+_FIRST    = re.compile(r"^(\s*<\w+)")
+
+PAGE_HEIGHT_PX = 11 * 96  # .page height in CSS px
+CACHE_DIR      = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+BREAKS_CACHE   = os.path.join(CACHE_DIR, "pagination.json")
+
+# Measuring layout: one tall sheet per section, nothing clipped
+_MEASURE_CSS = """<style>
+@page { size: 8.5in 200in; }
+.page, .content { height: auto !important; overflow: visible !important; }
+</style>
+"""
+
+
+@dataclass
+class Section:
+    """One numbered content section (one or more pages).
+
+    title, toc_title and body are HTML (dynamic text already escaped).
+    Blank lines in body separate blocks — a heading with its list — which
+    are the units pagination moves between pages.
+    """
+
+    title:      str
+    body:       str
+    toc_title:  str  = ""     # TOC label (default: title on one line)
+    dense:      bool = False  # compact spacing for long pages
+    full_width: bool = False  # title may run under the section number
+
+
+def section_id(num: int) -> str:
+    return f"sec-{num:02d}"
+
+
+def section_blocks(body: str) -> List[str]:
+    return [block for block in _BLANK.split(body) if block.strip()]
+
+
+def plain_text(fragment: str) -> str:
+    """Flatten an HTML fragment to one line of plain text."""
+    return " ".join(html_lib.unescape(_TAG.sub(" ", fragment)).split())
+
+
+# ── Markup ──────────────────────────────────────────────────────────────────
+def toc_html(sections: List[Section]) -> str:
+    rows = []
+    for num, sec in enumerate(sections, 1):
+        label = sec.toc_title or sec.title.replace("<br>", " ")
+        rows.append(
+            f'<a class="toc-row" href="#{section_id(num)}"><span>{label}</span></a>'
+        )
+    return "\n  ".join(rows)
+
+
+def _page_html(num: int, sec: Section, body: str, content_class: str,
+               first: bool = True) -> str:
+    content = content_class + (" dense" if sec.dense else "")
+    title   = "sec-title full-width" if sec.full_width else "sec-title"
+    anchor  = f' id="{section_id(num)}"' if first else ""
+    label   = plain_text(sec.title) + ("" if first else " (continued)")
+    return f"""<!-- ============================================================
+     SECTION {num:02d}: {label}
+     ============================================================ -->
+<div class="page"{anchor}>
+  <div class="{content}">
+    <div class="sec-num">{num:02d}</div>
+    <div class="{title}">{sec.title}</div>
+{body}
+  </div>
+</div>"""
+
+
+def section_parts(sections: List[Section], content_class: str = "content",
+                  breaks: Optional[List[List[int]]] = None) -> List[str]:
+    """Page markup, one part per section.
+
+    breaks[i] lists the block indices of section i that start a new page
+    (see paginate); continuation pages repeat the section number and title.
+    """
+    parts: List[str] = []
+    for num, sec in enumerate(sections, 1):
+        cuts = breaks[num - 1] if breaks else []
+        if not cuts:
+            parts.append(_page_html(num, sec, sec.body, content_class))
+            continue
+        blocks = section_blocks(sec.body)
+        bounds = [0, *cuts, len(blocks)]
+        parts.append("\n\n".join(
+            _page_html(num, sec, "\n" + "\n\n".join(blocks[a:b]), content_class, a == 0)
+            for a, b in zip(bounds, bounds[1:])
+        ))
+    return parts
+
+
+# ── Pagination ──────────────────────────────────────────────────────────────
+_breaks_cache: Optional[Dict[str, List[int]]] = None
+
+
+def _load_breaks() -> Dict[str, List[int]]:
+    global _breaks_cache
+    if _breaks_cache is None:
+        try:
+            with open(BREAKS_CACHE) as f:
+                _breaks_cache = json.load(f)
+        except (OSError, ValueError):
+            _breaks_cache = {}
+    return _breaks_cache
+
+
+def _save_breaks() -> None:
+    """Merge this process's breaks into the file other renders share.
+
+    Batch and queue workers save concurrently: under the lock each re-reads
+    the file, adds what it measured and replaces it, so no one's entries
+    are dropped.
+    """
+    from proposal_render import write_atomic
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None  # Windows: last writer wins, the file is never torn
+    with open(BREAKS_CACHE + ".lock", "w") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            with open(BREAKS_CACHE) as f:
+                merged = json.load(f)
+        except (OSError, ValueError):
+            merged = {}
+        merged.update(_load_breaks())
+        _load_breaks().update(merged)
+        write_atomic(BREAKS_CACHE, json.dumps(merged).encode())
+
+
+def section_key(head: str, content_class: str, sec: Section) -> str:
+    """Content hash of everything that affects how a section lays out."""
+    h = hashlib.sha256()
+    for piece in (head, content_class, sec.title, sec.body, str(sec.dense), str(sec.full_width)):
+        h.update(piece.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _walk(box) -> Iterator:
+    yield box
+    for child in getattr(box, "children", ()):
+        yield from _walk(child)
+
+
+def _measure(head: str, content_class: str,
+             sections: List[Section]) -> List[Tuple[List[float], float]]:
+    """Lay sections out unclipped; return (block start ys + end y, bottom padding)."""
+    from proposal_render import layout
+
+    pages = []
+    for num, sec in enumerate(sections, 1):
+        blocks = [_FIRST.sub(rf'\1 data-block="{i}"', block, count=1)
+                  for i, block in enumerate(section_blocks(sec.body))]
+        body = "\n" + "\n\n".join(blocks) + f'\n    <div data-block="{len(blocks)}"></div>'
+        pages.append(_page_html(num, sec, body, content_class))
+    html = (head.replace("</head>", _MEASURE_CSS + "</head>")
+            + "\n<body>\n" + "\n\n".join(pages) + "\n</body>\n</html>")
+    doc = layout(html)
+
+    results = []
+    for page in doc.pages[:len(sections)]:
+        starts: Dict[int, float] = {}
+        bottom = 0.0
+        for box in _walk(page._page_box):
+            element = getattr(box, "element", None)
+            if element is None:
+                continue
+            idx = element.get("data-block")
+            if idx is not None:
+                starts.setdefault(int(idx), box.position_y)
+            elif not bottom and "content" in (element.get("class") or "").split():
+                bottom = box.padding_bottom
+        results.append(([starts[i] for i in sorted(starts)], bottom))
+    return results
+
+
+def _pack(starts: List[float], bottom: float) -> List[int]:
+    """Greedy page breaks: block indices that must start a new page.
+
+    starts[-1] is the end of the last block. A block too tall for a page
+    on its own stays where it is (and is clipped) rather than looping.
+    """
+    limit = PAGE_HEIGHT_PX - bottom
+    top   = starts[0]  # first block sits right under the title
+    breaks: List[int] = []
+    first, offset = 0, 0.0
+    for end in range(1, len(starts)):
+        if starts[end] - offset <= limit or end - 1 == first:
+            continue
+        first  = end - 1
+        offset = starts[first] - top
+        breaks.append(first)
+    return breaks
+
+
+def paginate(head: str, sections: List[Section], content_class: str = "content",
+             measure: bool = True) -> List[List[int]]:
+    """Page breaks per section, from the cache or one measuring layout.
+
+    With measure=False uncached sections are left on a single page, which
+    keeps HTML-only callers free of any layout cost.
+    """
+    cache = _load_breaks()
+    keys  = [section_key(head, content_class, sec) for sec in sections]
+    todo  = [i for i, key in enumerate(keys) if key not in cache]
+    if todo and measure:
+        measured = _measure(head, content_class, [sections[i] for i in todo])
+        for i, (starts, bottom) in zip(todo, measured):
+            cache[keys[i]] = _pack(starts, bottom)
+        _save_breaks()
+    return [cache.get(key, []) for key in keys]
+
+
+def number_toc(parts: List[str]) -> List[str]:
+    """Write literal page numbers into TOC rows as data-page attributes.
+
+    Counts section pages only, like the templates' `sheet` counter.
+    """
+    pages: Dict[str, int] = {}
+    sections = (m for m in _PAGE_DIV.finditer("".join(parts)) if not m.group(1).strip())
+    for n, m in enumerate(sections, 1):
+        if m.group(2):
+            pages[m.group(2)] = n
+
+    def sub(m: "re.Match[str]") -> str:
+        num = pages.get(m.group(1))
+        return m.group(0) if num is None else f'{m.group(0)} data-page="{num:02d}"'
+
+    return [_TOC_LINK.sub(sub, part) for part in parts]
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""D&C Builders — similar past proposals
+
+Most new jobs look like an earlier one: another 2nd-story addition in
+stucco, another garage ADU with a mini-split. Given a new intake, this finds
+the closest past proposals so their scope, sections and payment curve can
+seed the draft instead of writing it from scratch.
+
+Each proposal (client JSON configs, and with --intakes the client_intakes
+rows in Supabase) becomes a bag of features:
+
+  - type=adu, type=kitchen ...   project types (library types or the form's)
+  - scope words and word pairs   "2nd story", "garage conversion", ...
+  - flooring=LVP / SPC ...       materials, spelled as the materials book does
+  - !wall_removal ...            construction toggles switched off
+  - area~10, total~19            size and price, in powers of two
+
+weighted TF-IDF (sublinear term frequency, smoothed IDF) and normalized to
+unit length. The index is one float32 matrix (proposals × terms, at most
+MAX_TERMS columns) saved with its vocabulary to .cache/similar.npz, so a
+query is one matrix-vector product: milliseconds for thousands of
+proposals.
+
+`seed` writes a draft JSON for the new intake: the nearest proposal's
+template, scope items, project types, materials, toggles and custom
+sections, under the intake's own client fields, with the neighbour's
+payment curve (each milestone's share of its total) scaled to the intake's
+project_total when it has one and no payments of its own.
+
+    pip3 install numpy
+
+Run:
+    python3 proposal_similar.py build                        # index clients/*.json
+    python3 proposal_similar.py build clients/ archive/ --intakes
+    python3 proposal_similar.py query intake.json -k 5
+    python3 proposal_similar.py seed intake.json clients/newClient.json
+"""
+import argparse
+import glob
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+from estimator import DOWN_PAYMENT, ROUND_TO, money
+from material_book import load_materials, normalize
+from proposal_sections import CACHE_DIR
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+INDEX     = os.path.join(CACHE_DIR, "similar.npz")
+MAX_TERMS = 1024    # most frequent features kept; bounds the matrix width
+TOP_K     = 5
+
+# Fields a draft takes from its nearest neighbour; everything else (client,
+# address, date, total) comes from the intake
+REUSED = ("template", "scope_items", "project_types", "materials", "construction_toggles",
+          "custom_sections", "design_toggles", "area_sf")
+
+STOPWORDS = frozenset("a an and for in of on the to with sf new full complete".split())
+
+_DIGITS = re.compile(r"\d")
+
+
+class SimilarError(ValueError):
+    """No index, or an intake with nothing to compare."""
+
+
+# ── Features ────────────────────────────────────────────────────────────────
+def _number(value: Any) -> float:
+    try:
+        return float(str(value or 0).replace("$", "").replace(",", "").strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def _types(data: Mapping[str, Any]) -> List[str]:
+    types = list(data.get("project_types") or [])
+    if data.get("project_type"):  # intake form: one type
+        types.append(data["project_type"])
+    return [normalize(t).replace(" ", "_") for t in types if normalize(t)]
+
+
+def features(data: Mapping[str, Any]) -> Counter:
+    """Feature counts for a client config or an intake row."""
+    counts: Counter = Counter(f"type={t}" for t in _types(data))
+    for item in data.get("scope_items") or []:
+        words = [w for w in normalize(item).split()
+                 if w not in STOPWORDS and not _DIGITS.search(w)]
+        counts.update(words)
+        counts.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    materials = data.get("materials") or {}
+    for kind, name in sorted(load_materials().canonical(materials).items()):
+        if normalize(name) not in ("", "tbd"):
+            counts[f"{kind}={name}"] += 1
+    for toggle, on in (data.get("construction_toggles") or {}).items():
+        if not on:
+            counts[f"!{toggle}"] += 1
+    for name, value in (("area", data.get("area_sf")), ("total", data.get("project_total"))):
+        amount = _number(value)
+        if amount >= 1:
+            counts[f"{name}~{round(math.log2(amount))}"] += 1
+    return counts
+
+
+def _weights(counts: Counter, vocab: Mapping[str, int], idf) -> Any:
+    import numpy as np
+
+    vec = np.zeros(len(vocab), dtype=np.float32)
+    for term, n in counts.items():
+        j = vocab.get(term)
+        if j is not None:
+            vec[j] = (1 + math.log(n)) * idf[j]
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+# ── Index ───────────────────────────────────────────────────────────────────
+@dataclass
+class SimilarIndex:
+    """Unit-length TF-IDF rows; row i describes keys[i]."""
+    matrix:    Any                # (proposals × terms) float32
+    idf:       Any                # (terms,) float32
+    terms:     List[str]
+    keys:      List[str]          # config path (relative to BASE) or "intake:<id>"
+    names:     List[str]
+    templates: List[str]
+    totals:    List[str]
+
+    @property
+    def vocab(self) -> Dict[str, int]:
+        return _vocab(tuple(self.terms))
+
+    def nearest(self, data: Mapping[str, Any], k: int = TOP_K,
+                exclude: Sequence[str] = ()) -> List[Tuple[float, int]]:
+        """(cosine similarity, row) of the k closest proposals, best first."""
+        import numpy as np
+
+        query = _weights(features(data), self.vocab, self.idf)
+        if not query.any():
+            raise SimilarError("The intake shares no features with the index — "
+                               "add project types, scope items or materials")
+        scores = self.matrix @ query
+        for key in exclude:
+            if key in self.keys:
+                scores[self.keys.index(key)] = -1.0
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), int(i)) for i in top if scores[i] > 0]
+
+
+@lru_cache(maxsize=4)
+def _vocab(terms: Tuple[str, ...]) -> Dict[str, int]:
+    return {term: j for j, term in enumerate(terms)}
+
+
+def build(documents: Sequence[Tuple[str, Mapping[str, Any]]], max_terms: int = MAX_TERMS) -> SimilarIndex:
+    """Index (key, config or intake row) pairs."""
+    import numpy as np
+
+    counts = [features(data) for _, data in documents]
+    df: Counter = Counter(term for c in counts for term in c)
+    terms = sorted(df, key=lambda t: (-df[t], t))[:max_terms]
+    n = len(documents)
+    idf = np.array([math.log((1 + n) / (1 + df[t])) + 1 for t in terms], dtype=np.float32)
+    vocab = _vocab(tuple(terms))
+    matrix = np.zeros((n, len(terms)), dtype=np.float32)
+    for i, c in enumerate(counts):
+        matrix[i] = _weights(c, vocab, idf)
+    return SimilarIndex(matrix, idf, terms, [key for key, _ in documents],
+                        [_client(data) for _, data in documents],
+                        [str(data.get("template") or "") for _, data in documents],
+                        [str(data.get("project_total") or "") for _, data in documents])
+
+
+def save(index: SimilarIndex, path: str = INDEX) -> None:
+    import numpy as np
+
+    from proposal_render import write_atomic
+
+    buf = io.BytesIO()
+    np.savez(buf, matrix=index.matrix, idf=index.idf, terms=np.array(index.terms),
+             keys=np.array(index.keys), names=np.array(index.names),
+             templates=np.array(index.templates), totals=np.array(index.totals))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_atomic(path, buf.getvalue())
+
+
+def load(path: str = INDEX) -> SimilarIndex:
+    """The saved index, read once per process until the file changes."""
+    if not os.path.exists(path):
+        raise SimilarError(f"No index at {path} — run: python3 proposal_similar.py build")
+    st = os.stat(path)
+    return _load(path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=2)
+def _load(path: str, mtime_ns: int, size: int) -> SimilarIndex:
+    import numpy as np
+
+    with np.load(path, allow_pickle=False) as z:
+        return SimilarIndex(z["matrix"], z["idf"], z["terms"].tolist(), z["keys"].tolist(),
+                            z["names"].tolist(), z["templates"].tolist(), z["totals"].tolist())
+
+
+# ── Sources ─────────────────────────────────────────────────────────────────
+_INTAKES = """
+SELECT id, first_name || ' & ' || last_name AS client_name, project_total, project_type,
+       area_sf, scope_items, materials, construction_toggles, rendered_config, template
+FROM client_intakes
+WHERE status IN ('generated', 'sent')
+ORDER BY created_at, id
+"""
+
+
+def _client(data: Mapping[str, Any]) -> str:
+    if data.get("client_name"):
+        return str(data["client_name"])
+    return " & ".join(str(data[k]) for k in ("first_name", "last_name") if data.get(k))
+
+
+def _key(path: str) -> str:
+    path = os.path.abspath(path)
+    return os.path.relpath(path, BASE) if path.startswith(BASE + os.sep) else path
+
+
+def config_documents(paths: Sequence[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """(key, config) for every JSON file under `paths`; the template is filled in."""
+    from proposal_render import pick_template
+
+    documents = []
+    for path in paths:
+        files = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+        for file in files:
+            with open(file) as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or not (data.get("scope_items") or data.get("project_types")):
+                continue  # not a client config
+            documents.append((_key(file), {**data, "template": pick_template(data)}))
+    return documents
+
+
+def intake_documents() -> List[Tuple[str, Dict[str, Any]]]:
+    """(intake:<id>, config) for generated and sent intakes: the stored
+    rendered_config when there is one, else the form columns."""
+    from intake_db import connect
+
+    documents = []
+    with connect() as conn:
+        for row in conn.execute(_INTAKES):
+            data = dict(row["rendered_config"] or row)
+            data.setdefault("client_name", row["client_name"])
+            data.setdefault("area_sf", row["area_sf"])
+            data["template"] = row["template"] or data.get("template") or ""
+            documents.append((f"intake:{row['id']}", data))
+    return documents
+
+
+def neighbour_config(key: str) -> Dict[str, Any]:
+    """The config an index key names."""
+    if key.startswith("intake:"):
+        from intake_db import connect, render_state
+
+        with connect() as conn:
+            state = render_state(conn, key.split(":", 1)[1])
+        if not state["rendered_config"]:
+            raise SimilarError(f"{key} has no stored config to seed from")
+        return {**state["rendered_config"], "template": state["template"]}
+    from proposal_render import pick_template
+
+    with open(key if os.path.isabs(key) else os.path.join(BASE, key)) as f:
+        data = json.load(f)
+    return {**data, "template": pick_template(data)}
+
+
+# ── Seeding a draft ─────────────────────────────────────────────────────────
+def payment_curve(payments: Sequence[Sequence[str]]) -> List[Tuple[str, float]]:
+    """(milestone, share of the total) for a payment list."""
+    amounts = [_number(amount) for _, amount in payments]
+    total = sum(amounts)
+    return [(desc, amount / total if total else 0.0) for (desc, _), amount in zip(payments, amounts)]
+
+
+def scale_payments(curve: Sequence[Tuple[str, float]], total: float) -> List[Tuple[str, str]]:
+    """The curve applied to `total`: a fixed down payment, the rest rounded to
+    ROUND_TO with the remainder on the largest milestone, so it sums exactly."""
+    if not curve:
+        return []
+    down = curve[0][0].lower().startswith("down")
+    body = curve[1:] if down else curve
+    rest = total - (DOWN_PAYMENT if down else 0)
+    share = sum(s for _, s in body) or 1.0
+    amounts = [round(rest * s / share / ROUND_TO) * ROUND_TO for _, s in body]
+    if amounts:
+        amounts[amounts.index(max(amounts))] += rest - sum(amounts)
+    rows = [(desc, money(amount)) for (desc, _), amount in zip(body, amounts)]
+    return ([(curve[0][0], money(DOWN_PAYMENT))] if down else []) + rows
+
+
+def seed(intake: Mapping[str, Any], neighbour: Mapping[str, Any]) -> Dict[str, Any]:
+    """A draft config for `intake` built on `neighbour`."""
+    address = intake.get("client_address") or ", ".join(filter(None, [
+        intake.get("street_address"), intake.get("city"),
+        " ".join(filter(None, [intake.get("state"), intake.get("zip")]))]))
+    draft: Dict[str, Any] = {"client_name": _client(intake), "client_address": address}
+    for key in ("proposal_date", "project_total"):
+        if intake.get(key):
+            draft[key] = intake[key]
+    for key in REUSED:
+        if intake.get(key):
+            draft[key] = intake[key]
+        elif neighbour.get(key):
+            draft[key] = neighbour[key]
+    if intake.get("payments"):
+        draft["payments"] = intake["payments"]
+    elif neighbour.get("payments"):
+        total = _number(intake.get("project_total")) or _number(neighbour.get("project_total"))
+        draft["payments"] = [list(p) for p in scale_payments(payment_curve(neighbour["payments"]), total)]
+        draft["project_total"] = money(total)
+    return draft
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Find past proposals like a new intake.")
+    p.add_argument("--index", metavar="FILE", default=INDEX,
+                   help="Index file (default: .cache/similar.npz)")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    b = sub.add_parser("build", help="Index past proposals")
+    b.add_argument("paths", nargs="*", help="JSON files or directories (default: clients/)")
+    b.add_argument("--intakes", action="store_true",
+                   help="Also index generated and sent client_intakes rows (Supabase)")
+
+    q = sub.add_parser("query", help="Closest past proposals to an intake")
+    q.add_argument("intake", help="Intake or client JSON")
+    q.add_argument("-k", type=int, default=TOP_K, help=f"Results (default {TOP_K})")
+
+    s = sub.add_parser("seed", help="Draft a config from the closest past proposal")
+    s.add_argument("intake", help="Intake or client JSON")
+    s.add_argument("output", help="Draft JSON to write")
+    s.add_argument("--force", action="store_true", help="Overwrite an existing output")
+    return p.parse_args()
+
+
+def main() -> None:
+    from brief_parser import to_json
+    from proposal_render import write_atomic
+
+    args = parse_args()
+    try:
+        if args.command == "build":
+            started = time.perf_counter()
+            documents = config_documents(args.paths or [os.path.join(BASE, "clients")])
+            if args.intakes:
+                documents += intake_documents()
+            if not documents:
+                sys.exit("No client configs to index")
+            index = build(documents)
+            save(index, args.index)
+            print(f"{len(index.keys)} proposal(s) × {len(index.terms)} terms "
+                  f"({index.matrix.nbytes / 1024:.0f} KB) in {time.perf_counter() - started:.2f}s "
+                  f"→ {_key(args.index)}")
+            return
+
+        with open(args.intake) as f:
+            intake = json.load(f)
+        index = load(args.index)
+        started = time.perf_counter()
+        hits = index.nearest(intake, args.k if args.command == "query" else 1,
+                             exclude=[_key(args.intake)])
+        ms = (time.perf_counter() - started) * 1000
+        if not hits:
+            sys.exit("No similar proposals")
+        if args.command == "query":
+            for score, i in hits:
+                print(f"  {score:.3f}  {index.names[i]:<32} {index.totals[i]:>10}  "
+                      f"{index.templates[i]:<10}  {index.keys[i]}")
+            print(f"{len(hits)} result(s) in {ms:.1f} ms")
+            return
+
+        if os.path.exists(args.output) and not args.force:
+            sys.exit(f"{args.output} exists (--force to overwrite)")
+        score, i = hits[0]
+        draft = seed(intake, neighbour_config(index.keys[i]))
+        write_atomic(args.output, to_json(draft).encode())
+        print(f"{args.output}: seeded from {index.names[i]} ({index.keys[i]}, similarity {score:.2f})")
+    except SimilarError as exc:
+        sys.exit(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""D&C Builders — render job queue
+
+Renders queued intakes straight from their stored config (intake_db.py).
+An intake is queued once it has a rendered_config and is 'pending' or
+'failed'; `enqueue` stores a client JSON on its row for that.
+
+Each claim counts an attempt and pushes next_attempt_at out by the lease
+and the backoff, so a render that crashes the worker outright is retried
+later rather than picked straight back up. A failed render records its
+error and backs off exponentially; after MAX_ATTEMPTS the intake goes to
+'dead' and stays there until `redrive`. Jobs are claimed with
+FOR UPDATE SKIP LOCKED, so several drains can run side by side.
+
+Claim order (migrations/005):
+  1. priority class — interactive (a rep waiting with the client), then
+     normal, then bulk (re-brand batches). Bulk only runs when nothing more
+     urgent is due, so it fills idle cores without holding anyone up.
+  2. fairness — within a class, each job is ranked by its rep's running
+     page total up to and including it, so reps take turns by pages
+     rendered (a job weighs its expected page count: the last render's,
+     else TEMPLATE_PAGES — 9 standard, 12 full scope). One rep's batch of
+     300 interleaves with everyone else's renders instead of blocking them.
+  3. cost, then age — at equal share the cheaper render goes first.
+
+A running bulk render can't be interrupted, so for low interactive tail
+latency keep a worker free for them: `drain --workers 4 --reserve 1` runs
+four drains, one of which only ever takes interactive renders.
+
+Drains render in worker processes (render_worker.py) that are replaced
+after --max-jobs-per-worker renders or once their RSS passes --max-rss, so
+WeasyPrint's caches can't grow without bound on a box that drains all
+night. --job-memory fails a single runaway render cleanly instead.
+
+Needs migrations/004_render_retries.sql and 005_render_priority.sql.
+
+Run:
+    python3 render_jobs.py enqueue <id> clients/myClient.json --priority interactive --rep "Dana"
+    python3 render_jobs.py drain                    # until the queue is empty
+    python3 render_jobs.py drain --follow --workers 4 --reserve 1
+    python3 render_jobs.py drain --follow --max-rss 800M --job-memory 1.5G --tracemalloc
+    python3 render_jobs.py queue                    # due jobs per class and rep
+    python3 render_jobs.py dead                     # dead-lettered intakes and why
+    python3 render_jobs.py redrive --all            # or: redrive <id> <id> ...
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from intake_db import (BACKOFF_BASE_S, BACKOFF_CAP_S, MAX_ATTEMPTS, PRIORITIES, connect,
+                       error_text, record_failure, record_render, store_config)
+from lint_proposals import ConfigRejected
+from proposal_render import TEMPLATE_PAGES, load_template, pick_template, render_config
+from render_worker import Limits, Reporter, add_limit_args, limits_from, memory_ceiling, supervise
+
+BASE      = os.path.dirname(os.path.abspath(__file__))
+LEASE_S   = 600  # a claimed job is left alone this long before a crash counts
+POLL_S    = 5.0
+
+# Expected pages: the last render's count, else the template's typical one
+_PAGES = "coalesce(page_count, (%(pages)s::jsonb ->> template)::int, %(fallback)s)"
+
+_CLAIM = """
+WITH due AS (
+  SELECT id, priority, coalesce(requested_by, '') AS rep,
+         coalesce(next_attempt_at, created_at) AS due_at,
+         {pages} AS pages
+  FROM client_intakes
+  WHERE status IN ('pending', 'failed') AND rendered_config IS NOT NULL
+    AND priority = ANY(%(classes)s)
+    AND coalesce(next_attempt_at, created_at) <= now()
+    AND attempts < %(max)s
+), ranked AS (
+  SELECT id, array_position(%(classes)s, priority) AS class, due_at, pages,
+         sum(pages) OVER (PARTITION BY priority, rep ORDER BY due_at, id) AS share
+  FROM due
+)
+UPDATE client_intakes
+SET attempts        = attempts + 1,
+    next_attempt_at = now() + make_interval(secs =>
+                        greatest(%(lease)s, least(%(cap)s, %(base)s * power(2, attempts))))
+WHERE id = (
+  SELECT c.id FROM client_intakes c JOIN ranked r ON r.id = c.id
+  ORDER BY r.class, r.share, r.pages, r.due_at, c.id
+  LIMIT 1
+  FOR UPDATE OF c SKIP LOCKED
+)
+RETURNING id, rendered_config, template, attempts, priority, requested_by
+""".format(pages=_PAGES)
+
+# Claimed, then never reported back (worker killed) on its last attempt
+_BURY = """
+UPDATE client_intakes
+SET status = 'dead',
+    last_error = coalesce(last_error, 'Render never finished (worker lost)')
+WHERE status IN ('pending', 'failed') AND rendered_config IS NOT NULL
+  AND coalesce(next_attempt_at, created_at) <= now()
+  AND attempts >= %(max)s
+"""
+
+_REDRIVE = """
+UPDATE client_intakes
+SET status = 'pending', attempts = 0, next_attempt_at = NULL
+WHERE status = 'dead' {only}
+RETURNING id
+"""
+
+_QUEUE = """
+SELECT priority, coalesce(requested_by, '-') AS rep, count(*) AS jobs,
+       sum({pages}) AS pages,
+       min(coalesce(next_attempt_at, created_at)) AS oldest
+FROM client_intakes
+WHERE status IN ('pending', 'failed') AND rendered_config IS NOT NULL
+  AND coalesce(next_attempt_at, created_at) <= now()
+GROUP BY 1, 2
+ORDER BY array_position(%(classes)s, priority), pages DESC
+""".format(pages=_PAGES)
+
+_DEAD = """
+SELECT id, first_name || ' & ' || last_name AS client_name, attempts, last_error, next_attempt_at
+FROM client_intakes
+WHERE status = 'dead'
+ORDER BY next_attempt_at DESC NULLS LAST
+"""
+
+
+# ── Queue operations ────────────────────────────────────────────────────────
+def _cost_params(classes: Sequence[str] = PRIORITIES) -> Dict[str, Any]:
+    from psycopg.types.json import Jsonb
+
+    unknown = set(classes) - set(PRIORITIES)
+    if unknown:
+        raise ValueError(f"Unknown priority {', '.join(sorted(unknown))} "
+                         f"(expected one of {', '.join(PRIORITIES)})")
+    return {
+        "pages":    Jsonb(TEMPLATE_PAGES),
+        "fallback": max(TEMPLATE_PAGES.values()),
+        "classes":  [c for c in PRIORITIES if c in classes],  # most urgent first
+    }
+
+
+def claim(conn, max_attempts: int = MAX_ATTEMPTS,
+          classes: Sequence[str] = PRIORITIES) -> Optional[Dict[str, Any]]:
+    """Take the next due job from `classes`, or None when nothing is due."""
+    with conn.transaction():
+        return conn.execute(_CLAIM, {
+            "lease": LEASE_S, "base": BACKOFF_BASE_S, "cap": BACKOFF_CAP_S, "max": max_attempts,
+            **_cost_params(classes),
+        }).fetchone()
+
+
+def bury_exhausted(conn, max_attempts: int = MAX_ATTEMPTS) -> int:
+    with conn.transaction():
+        return conn.execute(_BURY, {"max": max_attempts}).rowcount
+
+
+def redrive(conn, ids: Optional[List[str]] = None) -> List[str]:
+    """Move dead intakes (all, or just `ids`) back to pending with fresh attempts."""
+    only, params = "", {}
+    if ids:
+        only, params = "AND id = ANY(%(ids)s::uuid[])", {"ids": ids}
+    with conn.transaction():
+        return [row["id"] for row in conn.execute(_REDRIVE.format(only=only), params).fetchall()]
+
+
+def run_job(conn, job: Dict[str, Any], output_dir: str, max_attempts: int = MAX_ATTEMPTS,
+            job_memory: Optional[int] = None) -> Optional[Exception]:
+    """Render one claimed job and record the outcome. Returns the error, or None."""
+    started = time.perf_counter()
+    try:
+        module = load_template(job["template"])
+        cfg = module.ProposalConfig.from_dict(job["rendered_config"])
+        output = os.path.join(output_dir, os.path.basename(cfg.resolve_output()))
+        with memory_ceiling(job_memory):
+            pages = render_config(cfg, job["template"], output)
+    except Exception as exc:
+        # A rejected config fails the same way every time: dead-letter it now
+        state = record_failure(conn, job["id"], error_text(exc), claimed=True,
+                               max_attempts=1 if isinstance(exc, ConfigRejected) else max_attempts)
+        print(f"  FAILED {job['id']} (attempt {state['attempts']}/{max_attempts}, "
+              f"now {state['status']}): {error_text(exc)}")
+        return exc
+    elapsed = round((time.perf_counter() - started) * 1000)
+    record_render(conn, job["id"], cfg, job["template"], output, elapsed, pages)
+    print(f"  done   {job['id']} [{job['priority']}] → {output} ({pages} pages, {elapsed} ms)")
+    return None
+
+
+def work(reporter: Reporter, output_dir: str, max_jobs: Optional[int], follow: bool,
+         max_attempts: int, classes: Sequence[str], limits: Limits) -> bool:
+    """One worker process (render_worker.supervise): render due jobs from
+    `classes`. Returns True when it retired on a limit, False when done."""
+    jobs = 0
+    with connect() as conn:
+        while max_jobs is None or jobs < max_jobs:
+            reporter.count("buried", bury_exhausted(conn, max_attempts))
+            job = claim(conn, max_attempts, classes)
+            if job is None:
+                if not follow:
+                    return False
+                time.sleep(POLL_S)
+                continue
+            reporter.started(str(job["id"]))
+            error = run_job(conn, job, output_dir, max_attempts, limits.job_memory)
+            reporter.finished("failed" if error else "done")
+            jobs += 1
+            reason = limits.retire(jobs, error)
+            if reason:
+                print(f"  worker {os.getpid()} retiring after {reason}")
+                return True
+    return False
+
+
+def drain(output_dir: str = BASE, max_jobs: Optional[int] = None, follow: bool = False,
+          max_attempts: int = MAX_ATTEMPTS, workers: int = 1, reserve: int = 0,
+          limits: Limits = Limits()) -> Dict[str, int]:
+    """Render due jobs with `workers` worker processes until none are due
+    (or forever with follow); `reserve` of them take interactive renders only.
+
+    max_jobs caps each worker slot, across the processes that replace each
+    other in it. Returns counts: done, failed, buried, lost, recycled.
+    """
+    if not 0 <= reserve < workers:
+        raise ValueError("--reserve must leave at least one worker for the other classes")
+    plans = [("interactive",)] * reserve + [PRIORITIES] * (workers - reserve)
+
+    def slot_args(slot: int, done: int):
+        if max_jobs is not None and done >= max_jobs:
+            return None
+        remaining = None if max_jobs is None else max_jobs - done
+        return (output_dir, remaining, follow, max_attempts, plans[slot], limits)
+
+    def lost(intake_id: str, reason: str) -> None:
+        with connect() as conn:
+            record_failure(conn, intake_id, reason, claimed=True, max_attempts=max_attempts)
+
+    counts = {"done": 0, "failed": 0, "buried": 0}
+    counts.update(supervise(work, slot_args, len(plans), limits, lost))
+    return counts
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Queue, drain and re-drive proposal renders.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    q = sub.add_parser("enqueue", help="Store a client JSON on its intake and queue the render")
+    q.add_argument("intake", metavar="ID", help="client_intakes id")
+    q.add_argument("json", metavar="FILE", help="Client JSON config")
+    q.add_argument("--template", help="standard / full_scope (default: picked from the JSON)")
+    q.add_argument("--priority", choices=PRIORITIES, default="normal",
+                   help="interactive: a rep is waiting; bulk: batch re-renders (default normal)")
+    q.add_argument("--rep", help="Who asked for the render (queue fairness is per rep)")
+
+    d = sub.add_parser("drain", help="Render queued intakes")
+    d.add_argument("--output-dir", metavar="DIR", default=BASE, help="Where PDFs are written")
+    d.add_argument("--max-jobs", type=int, help="Stop each worker slot after this many renders")
+    d.add_argument("--workers", type=int, default=1, help="Drains to run side by side (default 1)")
+    d.add_argument("--reserve", type=int, default=0,
+                   help="Of the workers, how many take interactive renders only (default 0)")
+    d.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS,
+                   help=f"Attempts before an intake is dead-lettered (default {MAX_ATTEMPTS})")
+    d.add_argument("--follow", action="store_true", help="Keep polling when the queue is empty")
+    add_limit_args(d)
+
+    sub.add_parser("queue", help="Due renders per priority class and rep")
+    sub.add_parser("dead", help="List dead-lettered intakes")
+
+    r = sub.add_parser("redrive", help="Re-queue dead-lettered intakes")
+    r.add_argument("ids", nargs="*", metavar="ID", help="Intakes to re-queue")
+    r.add_argument("--all", action="store_true", help="Re-queue every dead intake")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.command == "enqueue":
+        with open(args.json) as f:
+            template = args.template or pick_template(json.load(f))
+        cfg = load_template(template).ProposalConfig.from_json(args.json)
+        with connect() as conn:
+            queued = store_config(conn, args.intake, cfg, template, args.priority, args.rep)
+        print(f"Queued {args.intake} ({template}, {args.priority})" if queued
+              else f"Not queued: {args.intake} is missing or already generated/sent")
+
+    elif args.command == "drain":
+        try:
+            counts = drain(args.output_dir, args.max_jobs, args.follow, args.max_attempts,
+                           args.workers, args.reserve, limits_from(args))
+        except ValueError as exc:
+            raise SystemExit(str(exc))
+        print(f"Rendered {counts['done']}, failed {counts['failed']}, "
+              f"lost {counts['lost']} to dead workers, dead-lettered {counts['buried']}; "
+              f"{counts['recycled']} worker(s) recycled")
+
+    elif args.command == "queue":
+        with connect() as conn:
+            rows = conn.execute(_QUEUE, _cost_params()).fetchall()
+        for row in rows:
+            print(f"{row['priority']:<12} {row['rep']:<20} {row['jobs']:>5} job(s) "
+                  f"{row['pages']:>6} pages  oldest {row['oldest']:%Y-%m-%d %H:%M}")
+        print(f"{sum(row['jobs'] for row in rows)} due render(s)")
+
+    elif args.command == "dead":
+        with connect() as conn:
+            rows = conn.execute(_DEAD).fetchall()
+        for row in rows:
+            error = (row["last_error"] or "").splitlines()[0:1] or [""]
+            print(f"{row['id']}  {row['client_name']:<28} {row['attempts']:>2} attempts  {error[0][:80]}")
+        print(f"{len(rows)} dead intake(s)")
+
+    elif args.command == "redrive":
+        if not args.ids and not args.all:
+            raise SystemExit("Pass intake ids or --all")
+        with connect() as conn:
+            ids = redrive(conn, None if args.all else args.ids)
+        print(f"Re-queued {len(ids)} intake(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""D&C Builders — render metrics for Prometheus
+
+Every render that goes through proposal_render.render_document (the
+template CLIs, batch_render.py, render_jobs.py, intake re-renders, the
+mailer) records, labelled by template:
+
+  dcb_renders_total{template,mode}               renders finished (mode: serial / parallel)
+  dcb_render_failures_total{template,error}      renders that raised, by exception type
+  dcb_render_seconds{template}                   histogram, whole render
+  dcb_render_stage_seconds{template,stage}       histogram per stage: html (section
+                                                 markup, incl. image preparation), layout,
+                                                 write_pdf (serial), merge (parallel),
+                                                 save, index
+  dcb_render_pages{template}                     histogram, pages per PDF
+  dcb_pdf_bytes{template}                        histogram, PDF size
+  dcb_cache_requests_total{cache,result}         result: hit / miss, for the fetched
+                                                 fonts and stylesheets ("resources") and
+                                                 prepared images ("images")
+
+and, read at scrape time with --queue (Supabase):
+
+  dcb_queue_depth{queue="render",priority}       due renders per priority class
+  dcb_queue_depth{queue="email"}                 approved proposals not yet sent
+  dcb_queue_up                                   0 when the database couldn't be read
+
+Renders run in many processes (worker processes, parallel layout pools,
+one-off CLIs), so each process keeps its own counts in memory and writes
+them to .cache/metrics/<pid>-<start>.json after every render. Collecting
+adds up every file; files of processes that have exited are folded into
+one archive file, so counters keep rising across worker recycling and a
+scrape reads a handful of small files.
+
+Expose them over HTTP for Prometheus, or write a file for node_exporter's
+textfile collector (e.g. from cron every minute):
+
+Run:
+    python3 render_metrics.py serve                         # http://127.0.0.1:9464/metrics
+    python3 render_metrics.py serve --port 9464 --queue
+    python3 render_metrics.py textfile /var/lib/node_exporter/textfile/dcb.prom --queue
+    python3 render_metrics.py show
+"""
+import argparse
+import atexit
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from proposal_sections import CACHE_DIR
+
+METRICS_DIR = os.path.join(CACHE_DIR, "metrics")
+ARCHIVE     = os.path.join(METRICS_DIR, "archive.json")
+PORT        = 9464
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+PAGE_BUCKETS    = (2, 4, 6, 8, 9, 10, 12, 14, 16, 20, 30)
+BYTE_BUCKETS    = (100e3, 250e3, 500e3, 1e6, 2e6, 4e6, 8e6, 16e6, 32e6)
+
+# name → (type, help, histogram buckets)
+METRICS = {
+    "dcb_renders_total":         ("counter", "Renders finished.", None),
+    "dcb_render_failures_total": ("counter", "Renders that raised, by exception type.", None),
+    "dcb_render_seconds":        ("histogram", "Whole render, seconds.", SECONDS_BUCKETS),
+    "dcb_render_stage_seconds":  ("histogram", "Render stage, seconds.", SECONDS_BUCKETS),
+    "dcb_render_pages":          ("histogram", "Pages per rendered PDF.", PAGE_BUCKETS),
+    "dcb_pdf_bytes":             ("histogram", "Rendered PDF size, bytes.", BYTE_BUCKETS),
+    "dcb_cache_requests_total":  ("counter", "Cache lookups by result.", None),
+}
+QUEUE_METRICS = {
+    "dcb_queue_depth": ("gauge", "Due renders / unsent approved proposals.", None),
+    "dcb_queue_up":    ("gauge", "1 when the queue depth could be read.", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Key = Tuple[str, Labels]
+
+_template: ContextVar[Optional[str]] = ContextVar("template", default=None)
+
+
+# ── Recording ───────────────────────────────────────────────────────────────
+class Registry:
+    """One process's counters and histograms (histogram: bucket counts, sum, count)."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.file = os.path.join(METRICS_DIR, f"{self.pid}-{time.time_ns()}.json")
+        self.counters: Dict[Key, float] = {}
+        self.histograms: Dict[Key, List[float]] = {}
+        self.lock = threading.Lock()
+
+    def inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        with self.lock:
+            self.counters[name, labels] = self.counters.get((name, labels), 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        buckets = METRICS[name][2]
+        with self.lock:
+            h = self.histograms.setdefault((name, labels), [0.0] * (len(buckets) + 2))
+            i = bisect_left(buckets, value)
+            if i < len(buckets):
+                h[i] += 1
+            h[-2] += value
+            h[-1] += 1
+
+    def dump(self) -> dict:
+        with self.lock:
+            return _listed({"counters": self.counters, "histograms": self.histograms})
+
+    def flush(self) -> None:
+        """Write this process's file (best effort: metrics never fail a render)."""
+        from proposal_render import write_atomic
+
+        if not self.counters and not self.histograms:
+            return
+        try:
+            os.makedirs(METRICS_DIR, exist_ok=True)
+            write_atomic(self.file, json.dumps(self.dump()).encode())
+        except OSError:
+            pass
+
+
+_registry: Optional[Registry] = None
+
+
+def registry() -> Registry:
+    """This process's registry; a forked child starts from zero."""
+    global _registry
+    if _registry is None or _registry.pid != os.getpid():
+        _registry = Registry()
+        atexit.register(_registry.flush)
+    return _registry
+
+
+def cache(name: str, hit: bool) -> None:
+    registry().inc("dcb_cache_requests_total", (("cache", name), ("result", "hit" if hit else "miss")))
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage of the render in progress (a no-op outside one)."""
+    template = _template.get()
+    if template is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry().observe("dcb_render_stage_seconds", (("template", template), ("stage", name)),
+                           time.perf_counter() - started)
+
+
+@contextmanager
+def render(template: str, mode: str) -> Iterator:
+    """Around one render; the block calls the yielded done(pages, pdf_bytes)."""
+    reg = registry()
+    result: List[int] = []
+    token = _template.set(template)
+    started = time.perf_counter()
+    try:
+        yield lambda pages, size: result.extend((pages, size))
+    except Exception as exc:
+        reg.inc("dcb_render_failures_total", (("template", template), ("error", type(exc).__name__)))
+        raise
+    finally:
+        _template.reset(token)
+        if result:
+            labels = (("template", template),)
+            reg.inc("dcb_renders_total", (("template", template), ("mode", mode)))
+            reg.observe("dcb_render_seconds", labels, time.perf_counter() - started)
+            reg.observe("dcb_render_pages", labels, result[0])
+            reg.observe("dcb_pdf_bytes", labels, result[1])
+        reg.flush()
+
+
+# ── Collecting ──────────────────────────────────────────────────────────────
+def _merge(into: dict, data: dict) -> None:
+    for name, labels, value in data.get("counters", []):
+        key = (name, tuple(map(tuple, labels)))
+        into["counters"][key] = into["counters"].get(key, 0) + value
+    for name, labels, h in data.get("histograms", []):
+        key = (name, tuple(map(tuple, labels)))
+        if name in METRICS and len(h) == len(METRICS[name][2]) + 2:
+            old = into["histograms"].get(key)
+            into["histograms"][key] = [a + b for a, b in zip(old, h)] if old else list(h)
+
+
+def _read(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _alive(path: str) -> bool:
+    try:
+        os.kill(int(os.path.basename(path).split("-")[0]), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError, OSError):
+        return True
+    return True
+
+
+def compact() -> None:
+    """Fold the files of exited processes into the archive."""
+    from proposal_render import write_atomic
+
+    try:
+        import fcntl
+    except ImportError:
+        return  # Windows: leave the files, collect() still adds them up
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    with open(os.path.join(METRICS_DIR, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = [p for p in glob.glob(os.path.join(METRICS_DIR, "*-*.json")) if not _alive(p)]
+        if not dead:
+            return
+        total = {"counters": {}, "histograms": {}}
+        for path in [ARCHIVE, *dead]:
+            _merge(total, _read(path))
+        write_atomic(ARCHIVE, json.dumps(_listed(total)).encode())
+        for path in dead:
+            os.remove(path)
+
+
+def _listed(total: dict) -> dict:
+    return {"counters": [[n, list(map(list, l)), v] for (n, l), v in total["counters"].items()],
+            "histograms": [[n, list(map(list, l)), h] for (n, l), h in total["histograms"].items()]}
+
+
+def collect() -> dict:
+    """Every process's metrics added up: {"counters": {key: v}, "histograms": {key: [...]}}."""
+    compact()
+    total = {"counters": {}, "histograms": {}}
+    for path in [ARCHIVE, *glob.glob(os.path.join(METRICS_DIR, "*-*.json"))]:
+        _merge(total, _read(path))
+    return total
+
+
+def queue_depth() -> Dict[Key, float]:
+    """dcb_queue_depth / dcb_queue_up gauges from Supabase."""
+    try:
+        from intake_db import connect
+        from proposal_mailer import _OUTBOX
+        from render_jobs import _QUEUE, _cost_params
+
+        with connect() as conn:
+            rows = conn.execute(_QUEUE, _cost_params()).fetchall()
+            outbox = conn.execute(f"SELECT count(*) AS n FROM ({_OUTBOX}) AS o").fetchone()["n"]
+    except Exception as exc:
+        print(f"  queue depth unavailable: {type(exc).__name__}: {exc}", file=sys.stderr)
+        return {("dcb_queue_up", ()): 0}
+    gauges: Dict[Key, float] = {("dcb_queue_up", ()): 1}
+    for priority in ("interactive", "normal", "bulk"):
+        key = ("dcb_queue_depth", (("queue", "render"), ("priority", priority)))
+        gauges[key] = sum(row["jobs"] for row in rows if row["priority"] == priority)
+    gauges[("dcb_queue_depth", (("queue", "email"),))] = outbox
+    return gauges
+
+
+# ── Exposition ──────────────────────────────────────────────────────────────
+def _labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def exposition(total: dict, gauges: Optional[Dict[Key, float]] = None) -> str:
+    """Prometheus text format (0.0.4)."""
+    lines: List[str] = []
+    values = {**total["counters"], **(gauges or {})}
+    for name, (kind, help_text, buckets) in {**METRICS, **(QUEUE_METRICS if gauges else {})}.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "histogram":
+            for (n, labels), h in sorted(total["histograms"].items()):
+                if n != name:
+                    continue
+                running = 0.0
+                for bound, count in zip(buckets, h):
+                    running += count
+                    lines.append(f"{name}_bucket{_labels(labels, (('le', _number(bound)),))} "
+                                 f"{_number(running)}")
+                lines.append(f"{name}_bucket{_labels(labels, (('le', '+Inf'),))} {_number(h[-1])}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(h[-2])}")
+                lines.append(f"{name}_count{_labels(labels)} {_number(h[-1])}")
+        else:
+            for (n, labels), value in sorted(values.items()):
+                if n == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    with_queue = False
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = exposition(collect(), queue_depth() if self.with_queue else None).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt: str, *args) -> None:
+        pass  # scraped every few seconds
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Expose render metrics in Prometheus format.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("serve", help="HTTP /metrics endpoint")
+    s.add_argument("--host", default="127.0.0.1", help="Address to bind (default 127.0.0.1)")
+    s.add_argument("--port", type=int, default=PORT, help=f"Port (default {PORT})")
+    s.add_argument("--queue", action="store_true", help="Include queue depth from Supabase")
+
+    t = sub.add_parser("textfile", help="Write a file for node_exporter's textfile collector")
+    t.add_argument("path", help="Output file (must end in .prom)")
+    t.add_argument("--queue", action="store_true", help="Include queue depth from Supabase")
+
+    w = sub.add_parser("show", help="Print the metrics")
+    w.add_argument("--queue", action="store_true", help="Include queue depth from Supabase")
+    return p.parse_args()
+
+
+def main() -> None:
+    from proposal_render import write_atomic
+
+    args = parse_args()
+    if args.command == "serve":
+        MetricsHandler.with_queue = args.queue
+        server = ThreadingHTTPServer((args.host, args.port), MetricsHandler)
+        print(f"Serving http://{args.host}:{args.port}/metrics  (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    text = exposition(collect(), queue_depth() if args.queue else None)
+    if args.command == "show":
+        print(text, end="")
+    else:
+        if not args.path.endswith(".prom"):
+            raise SystemExit("The textfile collector only reads *.prom files")
+        write_atomic(args.path, text.encode())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""D&C Builders — supervised render worker processes
+
+WeasyPrint, Pango and fontconfig keep caches that grow a process's RSS over
+thousands of renders. Long-running renderers (render_jobs.py drain,
+batch_render.py) therefore render in child processes that this module
+supervises:
+
+  - a worker retires after `max_jobs` renders, or once its RSS passes
+    `max_rss`, and a fresh process takes its place
+  - each render runs under an address-space ceiling of `job_memory` bytes
+    beyond what the worker already uses (Linux; RLIMIT_AS). A runaway render
+    fails with JobMemoryError, which is recorded as that job's failure, and
+    the worker retires rather than carry on with a fragmented heap
+  - a worker that dies outright (OOM killer, segfault) is reported against
+    the job it was running, and replaced
+  - `kill -USR1 <supervisor pid>` makes every worker dump a tracemalloc
+    snapshot to .cache/tracemalloc/ and print its top allocation sites
+    (workers trace allocations only when started with tracemalloc=True)
+
+A worker target is a module-level function `target(reporter, *args) -> bool`
+that pulls its own work, calls reporter.started(key) / reporter.finished(
+outcome) around each job, and returns True when it retired (Limits.retire)
+or False when it ran out of work.
+"""
+import argparse
+import os
+import signal
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from proposal_sections import CACHE_DIR
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "tracemalloc")
+RETIRED_EXIT = 75   # worker hit a limit and wants replacing (EX_TEMPFAIL)
+SNAPSHOT_TOP = 15   # allocation sites printed per snapshot
+
+# Defaults for overnight runs: recycle well before caches matter
+DEFAULT_MAX_JOBS = 200
+DEFAULT_MAX_RSS  = 1 << 30
+
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+# ── Sizes ───────────────────────────────────────────────────────────────────
+def parse_size(text: str) -> int:
+    """'1.5G', '800M', '500000' → bytes."""
+    text = text.strip().upper().removesuffix("B")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    try:
+        return int(float(text[:len(text) - len(unit)]) * _UNITS[unit])
+    except ValueError:
+        raise ValueError(f"Bad size {text!r} (expected e.g. 800M or 1.5G)") from None
+
+
+def format_size(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def _statm(field: int) -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[field]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rss_bytes() -> int:
+    """Current resident set size. Outside Linux, the peak (getrusage); 0 if unknown."""
+    rss = _statm(1)
+    if rss is not None:
+        return rss
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# ── Limits ──────────────────────────────────────────────────────────────────
+class JobMemoryError(MemoryError):
+    """A render went past its per-job memory ceiling."""
+
+
+@dataclass(frozen=True)
+class Limits:
+    max_jobs:    Optional[int] = None   # renders per worker process
+    max_rss:     Optional[int] = None   # bytes; checked between jobs
+    job_memory:  Optional[int] = None   # bytes one render may add (Linux)
+    tracemalloc: bool = False
+
+    def retire(self, jobs: int, last_error: Optional[BaseException] = None) -> Optional[str]:
+        """Why this worker should stop after `jobs` renders, or None."""
+        if isinstance(last_error, MemoryError):
+            return "out of memory on its last job"
+        if self.max_jobs is not None and jobs >= self.max_jobs:
+            return f"{jobs} jobs"
+        if self.max_rss is not None:
+            rss = rss_bytes()
+            if rss >= self.max_rss:
+                return f"RSS {format_size(rss)}"
+        return None
+
+
+@contextmanager
+def memory_ceiling(limit: Optional[int]) -> Iterator[None]:
+    """Let the block grow the address space by at most `limit` bytes.
+
+    Allocations past it fail, surfacing as JobMemoryError. A no-op without
+    a limit, or where RLIMIT_AS isn't enforced (anything but Linux).
+    """
+    vm = _statm(0) if limit and sys.platform.startswith("linux") else None
+    if vm is None:
+        yield
+        return
+    import resource
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    ceiling = vm + limit if hard == resource.RLIM_INFINITY else min(vm + limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (ceiling, hard))
+    try:
+        yield
+    except MemoryError as exc:
+        raise JobMemoryError(f"Render needed more than the {format_size(limit)} "
+                             f"per-job memory limit") from exc
+    finally:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+# ── tracemalloc ─────────────────────────────────────────────────────────────
+def dump_snapshot(top: int = SNAPSHOT_TOP) -> Optional[str]:
+    """Write a tracemalloc snapshot and print the biggest allocation sites."""
+    if not tracemalloc.is_tracing():
+        print(f"  [worker {os.getpid()}] tracemalloc is off — start workers with --tracemalloc")
+        return None
+    snapshot = tracemalloc.take_snapshot()
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.snap")
+    snapshot.dump(path)
+    print(f"  [worker {os.getpid()}] RSS {format_size(rss_bytes())}, snapshot → {path}")
+    for stat in snapshot.statistics("lineno")[:top]:
+        print(f"    {format_size(stat.size):>9}  {stat.count:>7} blocks  {stat.traceback[0]}")
+    return path
+
+
+# ── Worker side ─────────────────────────────────────────────────────────────
+class Reporter:
+    """A worker's line back to the supervisor."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def started(self, key: str) -> None:
+        self._conn.send(("started", key))
+
+    def finished(self, outcome: str) -> None:
+        self._conn.send(("finished", outcome))
+
+    def count(self, key: str, n: int = 1) -> None:
+        if n:
+            self._conn.send(("count", (key, n)))
+
+
+def _child(target: Callable[..., bool], args: Tuple, conn, limits: Limits) -> None:
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: dump_snapshot())
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the supervisor handles Ctrl-C
+    if limits.tracemalloc:
+        tracemalloc.start(10)
+    retired = target(Reporter(conn), *args)
+    conn.close()
+    sys.exit(RETIRED_EXIT if retired else 0)
+
+
+# ── Supervisor side ─────────────────────────────────────────────────────────
+@dataclass
+class _Worker:
+    slot: int
+    process: Any
+    conn: Any
+    current: Optional[str] = None
+    jobs: int = 0
+
+
+def _exit_reason(code: int) -> str:
+    if code < 0:
+        name = signal.Signals(-code).name
+        return f"killed by {name}" + (" (out of memory?)" if name == "SIGKILL" else "")
+    return f"exited with status {code}"
+
+
+def supervise(target: Callable[..., bool], slot_args: Callable[[int, int], Optional[Tuple]],
+              workers: int, limits: Limits = Limits(),
+              on_lost: Optional[Callable[[str, str], None]] = None) -> Dict[str, int]:
+    """Keep `workers` processes running `target` until each runs out of work.
+
+    slot_args(slot, jobs_done_in_slot) gives a replacement worker's args, or
+    None to leave the slot empty. on_lost(key, reason) is called for a job
+    whose worker died mid-render. Returns counts by outcome, plus 'lost'
+    and 'recycled'.
+    """
+    ctx = get_context()
+    counts: Dict[str, int] = {"lost": 0, "recycled": 0}
+    done_in_slot = [0] * workers
+    live: Dict[Any, _Worker] = {}
+
+    def start(slot: int) -> None:
+        args = slot_args(slot, done_in_slot[slot])
+        if args is None:
+            return
+        recv, send = ctx.Pipe(duplex=False)
+        # Not daemonic: a worker may start its own pool (parallel layout)
+        process = ctx.Process(target=_child, args=(target, args, send, limits))
+        process.start()
+        send.close()
+        worker = _Worker(slot, process, recv)
+        live[process.sentinel] = live[recv] = worker
+
+    def handle(worker: _Worker, message: Tuple[str, Any]) -> None:
+        kind, value = message
+        if kind == "started":
+            worker.current = value
+        elif kind == "finished":
+            worker.current = None
+            worker.jobs += 1
+            done_in_slot[worker.slot] += 1
+            counts[value] = counts.get(value, 0) + 1
+        else:
+            key, n = value
+            counts[key] = counts.get(key, 0) + n
+
+    def forward(signum, _frame) -> None:
+        for worker in {id(w): w for w in live.values()}.values():
+            if worker.process.is_alive():
+                os.kill(worker.process.pid, signum)
+
+    previous = None
+    if hasattr(signal, "SIGUSR1"):
+        previous = signal.signal(signal.SIGUSR1, forward)
+    try:
+        for slot in range(workers):
+            start(slot)
+        while live:
+            for ready in wait(list(live)):
+                worker = live.get(ready)
+                if worker is None:
+                    continue
+                if ready is worker.conn:
+                    try:
+                        handle(worker, worker.conn.recv())
+                    except EOFError:
+                        del live[ready]
+                    continue
+
+                # The process exited: take its last messages, then replace it if needed
+                del live[ready]
+                worker.process.join()
+                while live.get(worker.conn) is worker and worker.conn.poll():
+                    try:
+                        handle(worker, worker.conn.recv())
+                    except EOFError:
+                        break
+                live.pop(worker.conn, None)
+                code = worker.process.exitcode
+                if code == RETIRED_EXIT:
+                    counts["recycled"] += 1
+                    start(worker.slot)
+                elif code != 0:
+                    reason = f"Render worker {_exit_reason(code)}"
+                    print(f"  worker {worker.process.pid} {_exit_reason(code)}"
+                          + (f" while rendering {worker.current}" if worker.current else ""))
+                    if worker.current is not None:
+                        counts["lost"] += 1
+                        if on_lost:
+                            on_lost(worker.current, reason)
+                    if worker.jobs or worker.current is not None:
+                        start(worker.slot)  # a worker that fails on startup isn't retried
+    except KeyboardInterrupt:
+        for worker in {id(w): w for w in live.values()}.values():
+            worker.process.terminate()
+        raise
+    finally:
+        if previous is not None:
+            signal.signal(signal.SIGUSR1, previous)
+    return counts
+
+
+# ── CLI options ─────────────────────────────────────────────────────────────
+def add_limit_args(p: argparse.ArgumentParser) -> None:
+    g = p.add_argument_group("worker limits")
+    g.add_argument("--max-jobs-per-worker", type=int, default=DEFAULT_MAX_JOBS, metavar="N",
+                   help=f"Replace a worker after N renders (default {DEFAULT_MAX_JOBS})")
+    g.add_argument("--max-rss", type=parse_size, default=DEFAULT_MAX_RSS, metavar="SIZE",
+                   help=f"Replace a worker once its RSS passes SIZE (default {format_size(DEFAULT_MAX_RSS)})")
+    g.add_argument("--job-memory", type=parse_size, metavar="SIZE",
+                   help="Fail a render that needs more than SIZE of extra memory (Linux)")
+    g.add_argument("--tracemalloc", action="store_true",
+                   help="Trace allocations so `kill -USR1 <pid>` can dump snapshots")
+
+
+def limits_from(args: argparse.Namespace) -> Limits:
+    return Limits(args.max_jobs_per_worker, args.max_rss, args.job_memory, args.tracemalloc)
@@ -0,0 +1,443 @@
+"""D&C Builders — scope section content library
+
+Standard scope pages (Kitchen, Master Bath, ADU, Roofing) follow the same
+bullet structure in every proposal (see PROPOSAL_WRITING_GUIDE.md), so their
+text lives here once instead of being rewritten per client. A config selects
+pages with `project_types` and tailors them with two intake fields:
+
+  materials             — {"cabinets": "Flat Panel", "countertop": "Granite", ...}
+                          (values from the intake form's Materials tab, matched
+                          through material_book.py, so "quartz" reads as
+                          "Quartz (Prefab)")
+  construction_toggles  — {"plumb_finish": false, "hvac": false, ...}
+                          (a block or bullet tied to a toggle that is off is dropped;
+                          missing toggles count as on)
+
+Anything the library does not cover comes from `custom_sections`, keyed by
+project type: {"pool": {"title": "Pool &amp; Spa", "body": "<h3>…"}}. An entry
+for a library key overrides just the fields it gives (title, toc_title, body).
+
+The payment page's Allowances list is generated the same way (ALLOWANCES):
+each line is tied to project types and toggles, and takes its rate and
+wording from the materials book (pricing/materials.csv), so changing an
+allowance is a CSV edit. With the intake's `area_sf`, flooring and window
+lines also carry an estimated total.
+
+Rendered sections are memoized per (project type, materials, toggles).
+Stored renders need no version bump when fragment text changes: this file
+is part of proposal_render.template_version.
+"""
+import html as html_lib
+import math
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from material_book import load_materials
+from proposal_sections import Section
+
+
+# ── Fragments ───────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Block:
+    """One heading with its bullet list.
+
+    Text is HTML with {material[field]} placeholders (see TERMS). `when`
+    conditions must all hold: "toggle", "!toggle", "material=Value" or
+    "!material=Value". Items are plain strings or (text, *conditions).
+    """
+
+    heading: str
+    items:   Tuple[Any, ...]
+    when:    Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Entry:
+    title:     str
+    blocks:    Tuple[Block, ...]
+    toc_title: str  = ""
+    dense:     bool = False
+
+
+# Material label → wording. The "" row is used when the intake left the
+# material blank; unknown labels are used as typed.
+TERMS: Dict[str, Dict[str, Dict[str, str]]] = {
+    "cabinets": {
+        "":              {"name": "Custom Shaker",       "phrase": "custom shaker-style"},
+        "Custom Shaker": {"name": "Custom Shaker",       "phrase": "custom shaker-style"},
+        "Flat Panel":    {"name": "Custom Flat Panel",   "phrase": "custom flat-panel"},
+        "Raised Panel":  {"name": "Custom Raised Panel", "phrase": "custom raised-panel"},
+        "TBD":           {"name": "Custom",              "phrase": "custom"},
+    },
+    "countertop": {
+        "":                {"name": "Quartz",   "phrase": "prefabricated quartz"},
+        "Quartz (Prefab)": {"name": "Quartz",   "phrase": "prefabricated quartz"},
+        "Quartz (Custom)": {"name": "Quartz",   "phrase": "custom-fabricated quartz"},
+        "Granite":         {"name": "Granite",  "phrase": "granite"},
+        "Marble":          {"name": "Marble",   "phrase": "marble"},
+        "Laminate":        {"name": "Laminate", "phrase": "laminate"},
+        "TBD":             {"name": "",         "phrase": "client-selected"},
+    },
+    "roofing": {
+        "":                     {"phrase": "concrete tile or clay tile", "short": "concrete or clay tile", "noun": "tile"},
+        "Concrete Tile":        {"phrase": "concrete tile",              "short": "concrete tile",         "noun": "tile"},
+        "Clay Tile":            {"phrase": "clay tile",                  "short": "clay tile",             "noun": "tile"},
+        "Composition Shingles": {"phrase": "composition shingle",        "short": "composition shingle",   "noun": "shingle"},
+        "TBD":                  {"phrase": "concrete tile or clay tile", "short": "concrete or clay tile", "noun": "tile"},
+    },
+    "flooring": {
+        "":                    {"phrase": "LVP or engineered hardwood"},
+        "Engineered Hardwood": {"phrase": "engineered hardwood"},
+        "LVP / SPC":           {"phrase": "LVP/SPC"},
+        "Hardwood":            {"phrase": "hardwood"},
+        "Tile":                {"phrase": "porcelain tile"},
+        "Carpet":              {"phrase": "carpet"},
+        "TBD":                 {"phrase": "LVP or engineered hardwood"},
+    },
+    "windows": {
+        "":                {"phrase": "vinyl dual-pane"},
+        "Vinyl Dual-Pane": {"phrase": "vinyl dual-pane"},
+        "Aluminum":        {"phrase": "aluminum dual-pane"},
+        "Fiberglass":      {"phrase": "fiberglass dual-pane"},
+        "TBD":             {"phrase": "dual-pane"},
+    },
+    "exterior": {
+        "":                       {"phrase": "stucco"},
+        "Stucco (Santa Barbara)": {"phrase": "Santa Barbara stucco"},
+        "Stucco (Smooth)":        {"phrase": "smooth stucco"},
+        "Siding":                 {"phrase": "siding"},
+        "TBD":                    {"phrase": "stucco"},
+    },
+}
+
+SHINGLES = "roofing=Composition Shingles"
+
+LIBRARY: Dict[str, Entry] = {
+    "kitchen": Entry("Complete Kitchen Remodel", (
+        Block("Kitchen 3D Design", (
+            "Company will provide a full 3D kitchen design prior to starting any work — client has up to 3 revisions included.",
+            "Design will confirm cabinet layout, island dimensions, appliance placement, and traffic flow.",
+            "Company will provide in-person material samples for cabinets, countertops, and backsplash before finalizing selections.",
+        )),
+        Block("Demo &amp; Preparation", (
+            "Demo and remove existing cabinets, countertops, backsplash tile, and flooring in kitchen area.",
+            "Patch and repair walls, ceiling, and subfloor as needed in preparation for new work.",
+            "Relocate plumbing and electrical as required per new kitchen layout and plans.",
+        )),
+        Block("{cabinets[name]} Cabinet Installation", (
+            "Supply and install {cabinets[phrase]} cabinets — upper, lower, and island — per approved 3D layout.",
+            "Install all fillers, panels, and crown molding as specified.",
+            "Install all soft-close hinges, drawer slides, and customer-selected hardware throughout.",
+        ), when=("cabinetry",)),
+        Block("{countertop[name]} Countertop Fabrication &amp; Installation", (
+            "Fabricate and install {countertop[phrase]} countertops throughout kitchen including island — customer selects slab from company options.",
+            "Fabricate and install under-mount kitchen sink cutout and up to 5 additional cutouts (cooktop, faucet, etc.).",
+            "All edge profiles, seams, and polish included. Natural stone upcharge applies if customer selects outside company slab options.",
+        )),
+        Block("Backsplash", (
+            "Prepare walls and install cement board backer as needed in backsplash areas.",
+            "Install standard tile backsplash per client selection (customer to provide tile). Full slab backsplash is an additional cost.",
+            "Grout, seal, and complete all tile work to a finish-ready condition.",
+        )),
+        Block("Plumbing &amp; Electrical Finishing", (
+            ("Install new kitchen sink, faucet, disposal hookup, and dishwasher connection (customer to provide fixtures and appliances).", "plumb_finish"),
+            ("Install recessed LED lighting, under-cabinet lighting rough-in, and all kitchen outlets and switches per plans.", "elec_finish"),
+        )),
+        Block("Paint", (
+            "Apply one coat primer and two coats paint on all kitchen walls and ceiling (customer selects from company options).",
+        )),
+    )),
+
+    "master_bath": Entry("Master Bathroom Remodel", (
+        Block("3D Design", (
+            "Company will provide a 3D design of the master bathroom layout prior to starting work — up to 2 revisions included.",
+            "Design will confirm shower size, tub placement, vanity layout, tile patterns, and fixture locations.",
+        )),
+        Block("Demo &amp; Preparation", (
+            "Full demo of existing master bathroom — remove tile, fixtures, vanity, tub, shower enclosure, and flooring.",
+            "Remove and replace any water-damaged drywall or subfloor found during demo at no additional cost up to 10 SF; beyond that priced separately.",
+            ("Rough-in new plumbing supply and drain lines per new layout including shower, tub, dual vanity sinks, and toilet.", "plumb_rough"),
+            ("Rough-in new electrical — lighting circuits, exhaust fan, GFCI outlets, and heated floor circuit if specified.", "elec_rough"),
+        )),
+        Block("Shower Enclosure", (
+            "Frame and waterproof new shower enclosure using RedGard or equivalent waterproofing membrane on all shower walls and pan.",
+            "Install porcelain tile on shower walls floor-to-ceiling per client selection (customer to provide tile).",
+            "Install mosaic or small-format non-slip tile on shower pan to allow proper slope — customer to provide.",
+            "Install new shower niche(s) per plan. Install frameless glass enclosure or shower door per allowance.",
+            "Install customer-provided shower fixtures — valve, trim, hand shower, and rain head.",
+        )),
+        Block("Soaking Tub", (
+            "Set and connect freestanding or alcove soaking tub per plans (customer to provide tub and filler fixture).",
+            "Install tile surround or deck as specified. Waterproof all surrounding areas per code.",
+        ), when=("soaking_tub",)),
+        Block("Porcelain Tile — Floors &amp; Accent Walls", (
+            "Install large-format porcelain tile on master bathroom floor — customer to provide tile.",
+            "Install tile on any accent feature walls per design plan — customer to provide tile.",
+            "Apply grout and sealant throughout all tiled surfaces.",
+        )),
+        Block("Vanity, Mirrors &amp; Fixtures", (
+            "Install customer-provided dual vanity cabinet, mirrors, and all plumbing fixtures (faucets, sinks, toilet).",
+            "Install vanity lighting and all electrical fixtures per plan.",
+            "Install exhaust fan vented to exterior per code.",
+        )),
+        Block("Paint &amp; Finish", (
+            "Apply moisture-resistant primer and two coats of paint on all non-tiled walls and ceiling.",
+            "Install MDF baseboard and door casing to match rest of home.",
+        )),
+    )),
+
+    "adu": Entry("Garage Conversion to ADU", (
+        Block("Plans &amp; Permits", (
+            "Architectural drawings for ADU conversion per California ADU law and local city requirements.",
+            "Submit plans and obtain all required permits — building, mechanical, electrical, plumbing.",
+            "Coordinate with city for any utility upgrades (separate meter, subpanel) required by code.",
+        )),
+        Block("Demo &amp; Structural Modifications", (
+            "Remove existing garage door, hardware, and opener. Frame and infill garage door opening with new wall, window, and/or entry door per plans.",
+            "Remove any interior garage components, cabinetry, and finishes as needed.",
+            "Patch, level, and prepare existing concrete slab floor for new ADU use.",
+        )),
+        Block("Insulation, Drywall &amp; Ceilings", (
+            ("Install batt insulation in all exterior walls and ceiling per Title 24 requirements for habitable ADU space.", "insulation"),
+            ("Hang, tape, and finish drywall on all walls and ceilings to Level 4.", "drywall"),
+            "Install recessed LED lighting and all electrical per plans.",
+        )),
+        Block("Kitchenette", (
+            "Install compact kitchenette cabinetry — upper and lower units — per ADU layout plan.",
+            "Install quartz or laminate countertop per allowance (customer selects from options).",
+            "Run new plumbing supply and drain for kitchenette sink. Install customer-provided sink and faucet.",
+            "Install outlet circuits for refrigerator, microwave, and small appliances per code.",
+        ), when=("kitchenette",)),
+        Block("ADU Bathroom", (
+            "Frame, plumb, and tile new ADU bathroom — shower/tub combo, toilet, and vanity per plans.",
+            "Waterproof shower area and install customer-provided tile. Install customer-provided fixtures.",
+            "Install exhaust fan vented to exterior per code.",
+        ), when=("bathroom",)),
+        Block("Flooring", (
+            "Install {flooring[phrase]} flooring throughout ADU living areas per allowance.",
+            "Install tile in ADU bathroom and kitchenette wet areas — customer to provide tile.",
+        ), when=("flooring",)),
+        Block("Windows, Doors &amp; Exterior", (
+            ("Install new {windows[phrase]} windows per Title 24 and plans (see allowance section).", "windows"),
+            "Install new exterior entry door with hardware and weather stripping.",
+            ("Match exterior {exterior[phrase]} and paint finish to main house.", "exterior"),
+        )),
+        Block("HVAC &amp; Utilities", (
+            ("Install new mini-split HVAC system for ADU per energy compliance requirements (customer to select unit from company options).", "hvac"),
+            "Install subpanel or dedicated circuits as required by city for ADU electrical independence.",
+        )),
+    )),
+
+    "roofing": Entry("Roofing — Full Replacement", (
+        Block("Scope &amp; Material", (
+            "Full tear-off and replacement of existing roof covering on main house, new 2nd story addition, and ADU/garage roof as applicable per plans.",
+            "New roof system: {roofing[phrase]} roofing per client selection from company options.",
+        )),
+        Block("Tear-Off &amp; Deck Inspection", (
+            "Remove all existing roofing material down to structural sheathing — tear-off, felt, flashings, and any existing tile or shingles.",
+            "Inspect all roof decking (plywood or OSB) for damage, rot, or delamination.",
+            "Replace damaged or deteriorated sheathing panels as identified — priced per sheet at cost + labor if beyond standard allowance.",
+            "Re-nail all existing roof sheathing to current code where required by inspection.",
+        )),
+        Block("Underlayment &amp; Waterproofing", (
+            "Install self-adhering ice and water shield membrane in all valleys, eaves, and high-risk areas per code.",
+            "Install 30 lb. or synthetic felt underlayment over remaining roof deck areas per manufacturer and code specifications.",
+            "Install new drip edge flashing along all eaves and rake edges.",
+        )),
+        Block("Tile Roof Installation", (
+            "Install new tile battens (1x2 or 1x3) per tile manufacturer specifications and local code requirements.",
+            "Install new {roofing[short]} roofing throughout entire roof per client-selected profile and color from company options.",
+            "Install ridge caps, hip caps, and rake tiles with mortar set at all ridges, hips, and rakes.",
+            "Cut and fit all tile at valleys, dormers, skylights, and roof penetrations with precision.",
+        ), when=("!" + SHINGLES,)),
+        Block("Shingle Roof Installation", (
+            "Install new composition shingle roofing throughout entire roof per manufacturer specifications and client-selected color from company options.",
+            "Install starter strip along all eaves and rakes, and matching hip and ridge cap shingles at all hips and ridges.",
+            "Cut and fit all shingles at valleys, dormers, skylights, and roof penetrations with precision.",
+        ), when=(SHINGLES,)),
+        Block("Flashings &amp; Penetrations", (
+            "Install new galvanized or aluminum step flashing at all wall-to-roof intersections, chimneys, and parapet walls.",
+            "Install new lead or copper pipe boots on all plumbing vent penetrations.",
+            "Replace all roof vent flashings and ensure all penetrations are fully sealed and waterproof.",
+            "Install new pre-finished aluminum gutters and downspouts as needed per plans (size and color to be confirmed with client).",
+        )),
+        Block("Cool Roof Compliance", (
+            "All new {roofing[noun]} selections will meet California Title 24 cool roof requirements — aged solar reflectance and thermal emittance values to comply.",
+            "Provide documentation of compliance for building department as required.",
+        )),
+        Block("Clean-Up", (
+            "Daily cleanup and haul-away of all roofing debris and old materials throughout the roofing phase.",
+            "Final magnetic sweep of all ground areas around the home for nails and debris upon completion.",
+        )),
+    )),
+}
+
+
+# ── Allowances ──────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Allowance:
+    """One allowance line, priced from the materials book.
+
+    `text` follows "Company will provide allowance for " and may use {spec},
+    {rate} and {estimate}. The line is shown when the project has one of
+    `types` (any, if empty) and all `when` conditions hold, for the intake's
+    choice of `kind` — or for `material`, when given.
+    """
+
+    kind:     str
+    text:     str
+    types:    Tuple[str, ...] = ()
+    when:     Tuple[str, ...] = ()
+    material: str = ""
+    per_sf:   float = 0.0    # units per sf of area_sf, for {estimate}
+    estimate: str = ""       # with {qty} and {amount}
+
+
+ALLOWANCES: Tuple[Allowance, ...] = (
+    Allowance("flooring", "{spec} up to {rate} (material only{estimate}).", types=("addition", "adu"),
+              when=("flooring",), per_sf=0.85, estimate="; about {qty:,.0f} sqft, {amount}"),
+    Allowance("flooring", "{spec} in ADU up to {rate} (material only).", types=("adu",),
+              when=("flooring", "!flooring=LVP / SPC"), material="LVP / SPC"),
+    Allowance("windows", "{spec} up to {rate} per window{estimate}.", types=("addition", "adu"),
+              when=("windows",), per_sf=0.008, estimate=" (about {qty:,.0f} windows, {amount})"),
+    Allowance("tile_install", "{spec} up to {rate} (labor only — customer provides tile).",
+              types=("kitchen", "master_bath")),
+    Allowance("countertop", "{spec} up to {rate} (from company options).", types=("kitchen",),
+              when=("cabinetry",)),
+    Allowance("water_heater", "{spec} up to {rate} (equipment only).",
+              types=("addition", "master_bath", "adu"), when=("plumb_finish",)),
+    Allowance("hvac", "ADU {spec} up to {rate} (equipment only).", types=("adu",), when=("hvac",),
+              material="Mini-Split"),
+)
+
+ALLOWANCE_INTRO = "Company will provide allowance for "
+
+
+def _rate(amount: float, unit: str) -> str:
+    text = f"${amount:,.2f}".removesuffix(".00")
+    return f"{text}/sqft" if unit == "sf" else text
+
+
+# ── Rendering ───────────────────────────────────────────────────────────────
+Frozen = Tuple[Tuple[str, Any], ...]
+
+
+def _freeze(mapping: Optional[Mapping[str, Any]]) -> Frozen:
+    return tuple(sorted((mapping or {}).items()))
+
+
+def _terms(kind: str, value: str) -> Dict[str, str]:
+    table = TERMS[kind]
+    if value in table:
+        terms = table[value]
+    else:  # free text from the intake: use it as written
+        terms = {f: (value if f == "name" else value.lower()) for f in table[""]}
+    return {f: html_lib.escape(text) for f, text in terms.items()}
+
+
+def _holds(cond: str, materials: Dict[str, Any], toggles: Dict[str, Any]) -> bool:
+    negate = cond.startswith("!")
+    cond = cond.lstrip("!")
+    if "=" in cond:
+        kind, value = cond.split("=", 1)
+        ok = materials.get(kind, "") == value
+    else:
+        ok = bool(toggles.get(cond, True))
+    return ok != negate
+
+
+def _fill(text: str, values: Dict[str, Dict[str, str]]) -> str:
+    return " ".join(text.format_map(values).split())
+
+
+@lru_cache(maxsize=512)
+def render_entry(key: str, materials: Frozen = (), toggles: Frozen = ()) -> Section:
+    """Library section `key` for one set of materials/toggles (memoized)."""
+    entry = LIBRARY[key]
+    mats, tgls = load_materials().canonical(dict(materials)), dict(toggles)
+    values = {kind: _terms(kind, str(mats.get(kind) or "")) for kind in TERMS}
+
+    blocks = []
+    for block in entry.blocks:
+        if not all(_holds(c, mats, tgls) for c in block.when):
+            continue
+        items = []
+        for item in block.items:
+            text, *conds = (item,) if isinstance(item, str) else item
+            if all(_holds(c, mats, tgls) for c in conds):
+                items.append(f"      <li>{_fill(text, values)}</li>")
+        if items:
+            blocks.append(f'    <h3>{_fill(block.heading, values)}</h3>\n'
+                          f'    <ul class="bl">\n' + "\n".join(items) + "\n    </ul>")
+
+    return Section(entry.title, "\n" + "\n\n".join(blocks),
+                   toc_title=entry.toc_title, dense=entry.dense)
+
+
+def library_sections(project_types: List[str],
+                     materials: Optional[Mapping[str, Any]] = None,
+                     toggles: Optional[Mapping[str, Any]] = None,
+                     custom: Optional[Mapping[str, Mapping[str, Any]]] = None) -> List[Section]:
+    """Scope sections for `project_types`, in order.
+
+    Library keys render from LIBRARY; any other key must have a
+    custom_sections entry with at least a body.
+    """
+    custom = custom or {}
+    known = [f.name for f in fields(Section)]
+    sections: List[Section] = []
+    for key in project_types:
+        override = dict(custom.get(key) or {})
+        unknown = sorted(set(override) - set(known))
+        if unknown:
+            raise ValueError(f"custom_sections[{key!r}]: unknown field(s) {', '.join(map(repr, unknown))} "
+                             f"(expected {', '.join(known)})")
+        if key in LIBRARY:
+            sec = replace(render_entry(key, _freeze(materials), _freeze(toggles)), **override)
+        elif "body" in override:
+            override.setdefault("title", html_lib.escape(key.replace("_", " ").title()))
+            sec = Section(**override)
+        else:
+            raise ValueError(f"No library section or custom_sections text for project type {key!r} "
+                             f"(library: {', '.join(LIBRARY)})")
+        sections.append(sec)
+    return sections
+
+
+@lru_cache(maxsize=512)
+def render_allowances(project_types: Tuple[str, ...], materials: Frozen = (),
+                      toggles: Frozen = (), area_sf: float = 0.0) -> str:
+    """The Allowances label and list (memoized); "" when none apply."""
+    book = load_materials()
+    mats, tgls = book.canonical(dict(materials)), dict(toggles)
+    items = []
+    for rule in ALLOWANCES:
+        if rule.types and not set(rule.types) & set(project_types):
+            continue
+        if not all(_holds(c, mats, tgls) for c in rule.when):
+            continue
+        found = book.resolve(rule.kind, rule.material or mats.get(rule.kind))
+        if found is None or not found.allowance:
+            continue  # a choice the book doesn't know, or one without an allowance
+        estimate = ""
+        if rule.estimate and area_sf:
+            qty = math.ceil(area_sf * rule.per_sf) if found.unit == "each" else round(area_sf * rule.per_sf)
+            estimate = rule.estimate.format(qty=qty, amount=f"${qty * found.allowance:,.0f}")
+        text = rule.text.format(spec=found.spec, rate=_rate(found.allowance, found.unit),
+                                estimate=estimate)
+        items.append(f"      <li>{html_lib.escape(ALLOWANCE_INTRO + text)}</li>")
+    if not items:
+        return ""
+    return ('\n    <div class="allow-label">Allowances:</div>\n    <ul class="allow">\n'
+            + "\n".join(items) + "\n    </ul>")
+
+
+def allowances_html(project_types: List[str], materials: Optional[Mapping[str, Any]] = None,
+                    toggles: Optional[Mapping[str, Any]] = None, area_sf: Any = None) -> str:
+    """Allowances for the payment page, from the project's scope and materials."""
+    try:
+        area = float(str(area_sf or 0).replace(",", "").strip() or 0)
+    except ValueError:
+        area = 0.0  # "TBD", "approx." — no estimates
+    return render_allowances(tuple(project_types), _freeze(materials), _freeze(toggles), area)
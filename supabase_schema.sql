@@ -1,5 +1,7 @@
 -- DCB Proposal Generator — Supabase Schema
 -- Run this in your Supabase SQL Editor to set up the database.
+-- Then apply migrations/*.sql in order (each one is safe to re-run); the
+-- columns, statuses and tables they add are not repeated here.
 -- Reflects all fields from the Base44 intake form.
 
 CREATE TABLE IF NOT EXISTS client_intakes (
@@ -0,0 +1,52 @@
+"""payment_schedule: every dollar scheduled, no milestone over the cap."""
+import os
+import signal
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from estimator import payment_schedule  # noqa: E402
+from lint_proposals import MAX_MILESTONE_SHARE, MAX_MILESTONES  # noqa: E402
+
+
+def _amounts(schedule):
+    return [float(amount.replace("$", "").replace(",", "")) for _, amount in schedule]
+
+
+@pytest.fixture(autouse=True)
+def _no_hang():
+    # The cap spill used to loop forever; fail instead of hanging the run
+    signal.signal(signal.SIGALRM, lambda *_: pytest.fail("payment_schedule hung"))
+    signal.alarm(5)
+    yield
+    signal.alarm(0)
+
+
+@pytest.mark.parametrize("total, phases", [
+    (300_000, {"design": 1, "kitchen": 5}),   # used to swing back and forth forever
+    (95_000, {"roofing": 3, "design": 1}),
+    (250_000, {"roofing": 3, "design": 1}),
+    (120_000, {"kitchen": 1}),                # one phase: used to return a ~53% milestone
+    (9_000, {"kitchen": 1}),
+    (1_850_000, {"mep": 1, "framing": 1, "foundation": 1, "kitchen": 1, "finishes": 1}),
+])
+def test_schedule_sums_to_total_under_cap(total, phases):
+    schedule = payment_schedule(total, phases)
+    amounts = _amounts(schedule)
+    assert sum(amounts) == total
+    assert len(schedule) <= MAX_MILESTONES
+    assert all(a > 0 for a in amounts)
+    assert all(a <= total * MAX_MILESTONE_SHARE for a in amounts[1:])
+
+
+def test_small_phase_count_is_paid_in_parts():
+    names = [name for name, _ in payment_schedule(120_000, {"kitchen": 1})]
+    assert "Upon Start Kitchen Cabinet Installation (1/5)" in names
+    assert names[0] == "Down payment" and names[-1] == "Upon Completion & Final Punch List"
+
+
+def test_total_too_small_for_the_cap():
+    with pytest.raises(ValueError, match="12%"):
+        payment_schedule(4_000, {"kitchen": 1})
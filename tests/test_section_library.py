@@ -0,0 +1,21 @@
+"""Allowances: lines follow the project's scope."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from section_library import allowances_html  # noqa: E402
+
+
+@pytest.mark.parametrize("types", [["roofing"], ["kitchen"], ["master_bath"]])
+def test_no_flooring_allowance_without_new_flooring(types):
+    html = allowances_html(types, {"flooring": "Engineered Hardwood"}, {}, "2000")
+    assert "flooring" not in html
+
+
+@pytest.mark.parametrize("types", [["addition"], ["adu"]])
+def test_flooring_allowance_with_new_flooring(types):
+    html = allowances_html(types, {"flooring": "Engineered Hardwood"}, {}, "2000")
+    assert "engineered hardwood flooring up to $6/sqft" in html
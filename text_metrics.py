@@ -0,0 +1,153 @@
+"""D&C Builders — Raleway text measurement
+
+Answers "does this string fit on one line?" without a WeasyPrint layout.
+Raleway's advance widths are read once per weight (fontTools, static TTFs in
+fonts/ or $DCB_FONT_DIR) into per-character tables; a string's width is then
+the sum of its advances, scaled to the style's font size. Kerning is ignored,
+which errs slightly on the wide side.
+
+STYLES mirrors the font sizes and line widths in each template's build_head()
+— keep the two in sync when the CSS changes.
+
+    pip3 install fonttools
+    # static Raleway TTFs from https://fonts.google.com/specimen/Raleway → fonts/
+"""
+import os
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
+
+BASE     = os.path.dirname(os.path.abspath(__file__))
+FONT_DIR = os.environ.get("DCB_FONT_DIR", os.path.join(BASE, "fonts"))
+
+FONT_FILES = {
+    200: "Raleway-ExtraLight.ttf",
+    300: "Raleway-Light.ttf",
+    400: "Raleway-Regular.ttf",
+    600: "Raleway-SemiBold.ttf",
+    700: "Raleway-Bold.ttf",
+    800: "Raleway-ExtraBold.ttf",
+}
+
+# What an "average character" is: mean advance over lowercase text and spaces
+REFERENCE_CHARS = string.ascii_lowercase + " "
+
+PAGE_WIDTH_PT = 8.5 * 72
+
+
+class FontMetricsError(RuntimeError):
+    """Raleway metrics could not be loaded (fontTools or TTF missing)."""
+
+
+@dataclass(frozen=True)
+class TextStyle:
+    """Font settings of one kind of line, plus the width it has to fit in."""
+
+    size:           float            # pt
+    weight:         int   = 400
+    width:          float = 0.0      # available line width, pt
+    letter_spacing: float = 0.0      # pt
+
+
+def _styles(pay_size: float, pay_num_em: float) -> Dict[str, TextStyle]:
+    cover = PAGE_WIDTH_PT - 2 * 0.65 * 72  # .cover-body side padding
+    body  = PAGE_WIDTH_PT - 2 * 0.55 * 72  # .content side padding
+    return {
+        "cover-client":  TextStyle(13.5, 700, cover),
+        "cover-address": TextStyle(10.5, 400, cover),
+        "cover-item":    TextStyle(10.5, 400, cover - 1.25 * 10.5),  # list margin-left
+        "cover-total":   TextStyle(19, 700, cover),
+        "sec-title":     TextStyle(15.5, 700, body - 0.75 * 72),     # clears .sec-num
+        "bullet":        TextStyle(10, 400, body),
+        "pay-item":      TextStyle(pay_size, 400, body - pay_num_em * pay_size - 3),
+        "allow-item":    TextStyle(9.5, 400, body),
+    }
+
+
+# Template name → style name → TextStyle
+STYLES: Dict[str, Dict[str, TextStyle]] = {
+    "standard":   _styles(pay_size=10.5, pay_num_em=1.4),
+    "full_scope": _styles(pay_size=10.0, pay_num_em=1.6),
+}
+
+
+# ── Glyph tables ────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def advances(weight: int = 400) -> Dict[str, float]:
+    """Advance width in em per character for one Raleway weight (loaded once).
+
+    The "" key holds the .notdef advance, used for unmapped characters.
+    """
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError:
+        raise FontMetricsError("fontTools not installed. Run: pip3 install fonttools") from None
+
+    if weight not in FONT_FILES:
+        raise FontMetricsError(f"No Raleway file for weight {weight} "
+                               f"(expected one of {', '.join(map(str, FONT_FILES))})")
+    path = os.path.join(FONT_DIR, FONT_FILES[weight])
+    if not os.path.exists(path):
+        raise FontMetricsError(f"Raleway metrics not found: {path}\n"
+                               f"Copy static/{FONT_FILES[weight]} from the Google Fonts "
+                               f"download there (or point DCB_FONT_DIR at it).")
+    font = TTFont(path, lazy=True)
+    upem = font["head"].unitsPerEm
+    hmtx = font["hmtx"].metrics
+    table = {chr(code): hmtx[glyph][0] / upem for code, glyph in font.getBestCmap().items()}
+    table[""] = hmtx[".notdef"][0] / upem
+    return table
+
+
+@lru_cache(maxsize=None)
+def average_advance(weight: int = 400) -> float:
+    """Width of an average character in em."""
+    table = advances(weight)
+    return sum(table[ch] for ch in REFERENCE_CHARS) / len(REFERENCE_CHARS)
+
+
+# ── Measuring ───────────────────────────────────────────────────────────────
+@lru_cache(maxsize=8192)
+def text_width(text: str, style: TextStyle) -> float:
+    """Rendered width of `text` in pt."""
+    table = advances(style.weight)
+    notdef = table[""]
+    em = sum(table.get(ch, notdef) for ch in text)
+    return em * style.size + style.letter_spacing * len(text)
+
+
+def char_width(text: str, weight: int = 400) -> float:
+    """Width of `text` in average Raleway characters (size-independent)."""
+    table = advances(weight)
+    notdef = table[""]
+    return sum(table.get(ch, notdef) for ch in text) / average_advance(weight)
+
+
+def style(name: str, template: str = "standard") -> TextStyle:
+    if template not in STYLES:
+        raise ValueError(f"Unknown template {template!r} (expected one of {', '.join(STYLES)})")
+    if name not in STYLES[template]:
+        raise ValueError(f"Unknown text style {name!r} (expected one of {', '.join(STYLES[template])})")
+    return STYLES[template][name]
+
+
+def fits(text: str, name: str, template: str = "standard", width: float = 0.0) -> bool:
+    """Does `text` fit on one line of style `name` (or in `width` pt)?"""
+    st = style(name, template)
+    return text_width(text, st) <= (width or st.width)
+
+
+def line_count(text: str, name: str, template: str = "standard", width: float = 0.0) -> int:
+    """Lines `text` wraps to at word boundaries (greedy, like the browser)."""
+    st = style(name, template)
+    limit = width or st.width
+    space = text_width(" ", st)
+    lines, used = 1, 0.0
+    for word in text.split():
+        w = text_width(word, st)
+        if used and used + space + w > limit:
+            lines, used = lines + 1, w
+        else:
+            used += (space if used else 0.0) + w
+    return lines